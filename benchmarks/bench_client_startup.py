@@ -0,0 +1,127 @@
+"""
+Compares the cold start cost of building the zeep client for the Five9
+admin webservice from the network, from the bundled WSDL file and from the
+parsed schema cache.
+
+Every sample runs in a fresh interpreter so nothing is shared in memory
+between runs, which is what a short-lived cron script sees.
+
+The network samples fetch the bundled WSDL from a local HTTP server by
+default (pass --latency to simulate a remote host), or from a live Five9
+host with --url.
+
+    python benchmarks/bench_client_startup.py --samples 5 --latency 0.25
+"""
+import argparse
+import functools
+import http.server
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from five9.utils import wsdl_cache  # noqa: E402
+
+
+SAMPLE_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {repo_root!r})
+import zeep
+from five9.utils import wsdl_cache
+start = time.perf_counter()
+transport = wsdl_cache.Five9Transport()
+mode = {mode!r}
+if mode == "network":
+    client = zeep.Client({url!r}, transport=transport)
+elif mode == "file":
+    client = zeep.Client(wsdl_cache.BUNDLED_WSDL_PATH, transport=transport)
+else:
+    document = wsdl_cache.load_wsdl_document(
+        wsdl_cache.BUNDLED_WSDL_PATH, transport, cache_dir={cache_dir!r}
+    )
+    client = zeep.Client(document, transport=transport)
+client.service.getSkills
+print(json.dumps(time.perf_counter() - start))
+"""
+
+
+class SlowHandler(http.server.SimpleHTTPRequestHandler):
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_static_resources(latency):
+    SlowHandler.latency = latency
+    handler = functools.partial(SlowHandler, directory=wsdl_cache.STATIC_RESOURCES_PATH)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_sample(mode, url, cache_dir):
+    script = SAMPLE_SCRIPT.format(
+        repo_root=REPO_ROOT, mode=mode, url=url, cache_dir=cache_dir
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to each HTTP GET of the local server")
+    parser.add_argument("--url", type=str, default=None, help="WSDL url to use for the network samples")
+    parser.add_argument("--output", type=str, default=None, help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server = serve_static_resources(args.latency)
+        url = f"http://127.0.0.1:{server.server_port}/{os.path.basename(wsdl_cache.BUNDLED_WSDL_PATH)}"
+
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # warm the parsed schema cache once
+        run_sample("cached", url, cache_dir)
+        for mode in ["network", "file", "cached"]:
+            timings = [run_sample(mode, url, cache_dir) for _ in range(args.samples)]
+            results[mode] = {
+                "median_seconds": statistics.median(timings),
+                "min_seconds": min(timings),
+                "max_seconds": max(timings),
+            }
+
+    if server is not None:
+        server.shutdown()
+
+    baseline = results["network"]["median_seconds"]
+    for mode, result in results.items():
+        print(
+            f"{mode: <8} median {result['median_seconds']:.3f}s "
+            f"(min {result['min_seconds']:.3f}s, max {result['max_seconds']:.3f}s) "
+            f"{result['median_seconds'] / baseline:.0%} of network"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=4, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
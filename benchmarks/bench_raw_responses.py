@@ -0,0 +1,179 @@
+"""
+Compares reading a large getUsersInfo response through zeep (objects, then
+serialize_object as domain_capture does) with the streaming raw path
+(Five9Client.raw_call, lxml iterparse to plain dicts).
+
+A synthetic response with --users users is served from a local HTTP
+server.  Every sample runs in a fresh interpreter and reports the elapsed
+time and how far the call raised the peak RSS of the process.
+
+    python benchmarks/bench_raw_responses.py --users 10000 --samples 3
+"""
+import argparse
+import http.server
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+SAMPLE_SCRIPT = """
+import json, resource, sys, time
+sys.path.insert(0, {repo_root!r})
+import zeep
+from five9 import five9_session
+client = five9_session.Five9Client(
+    five9username="bench", five9password="bench", wsdl_source="bundled",
+    rate_limit=False, collect_metrics=False, logging_level="WARNING",
+)
+client.service._binding_options["address"] = {url!r}
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+if {mode!r} == "zeep":
+    users = zeep.helpers.serialize_object(client.service.getUsersInfo())
+    count = len(users)
+else:
+    count = sum(1 for user in client.raw_call("getUsersInfo", list_fields=("skills",)))
+elapsed = time.perf_counter() - start
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "seconds": elapsed, "peak_rss_kb": rss_after, "peak_rss_increase_kb": rss_after - rss_before, "count": count,
+}}))
+"""
+
+NS = "http://service.admin.ws.five9.com/"
+
+
+def user_xml(index):
+    skills = "".join(
+        f"<skills><id>{skill}</id><level>1</level><skillName>Skill {skill}</skillName>"
+        f"<userName>user{index}@example.com</userName></skills>"
+        for skill in range(5)
+    )
+    media_types = "".join(
+        f"<mediaTypes><enabled>true</enabled><intlligentRouting>false</intlligentRouting>"
+        f"<maxAlowed>1</maxAlowed><type>{media_type}</type></mediaTypes>"
+        for media_type in ["VOICE", "CHAT", "EMAIL", "SOCIAL", "CASE"]
+    )
+    permissions = "".join(
+        f"<permissions><type>{permission}</type><value>true</value></permissions>"
+        for permission in [
+            "ReceiveTransfer", "MakeRecordings", "SendMessages", "CreateChatSessions",
+            "TrainingMode", "CanSelectDisplayLanguage", "CanViewMissedCalls",
+            "CanConfigureAutoAnswer", "MakeTransferToAgents", "MakeTransferToSkills",
+        ]
+    )
+    return (
+        "<return>"
+        "<agentGroups>Group A</agentGroups><agentGroups>Group B</agentGroups>"
+        "<generalInfo>"
+        "<active>true</active><canChangePassword>true</canChangePassword>"
+        f"<EMail>user{index}@example.com</EMail><extension>{1000 + index}</extension>"
+        f"<federationId>fed{index}</federationId><firstName>First{index}</firstName>"
+        f"<fullName>First{index} Last{index}</fullName><IEXScheduled>false</IEXScheduled>"
+        f"<id>{300000 + index}</id><lastName>Last{index}</lastName><locale>en-US</locale>"
+        f"<mediaTypeConfig>{media_types}</mediaTypeConfig>"
+        "<mustChangePassword>false</mustChangePassword><osLogin></osLogin>"
+        "<phoneNumber>5551234567</phoneNumber><startDate>2020-01-01T00:00:00.000-08:00</startDate>"
+        f"<userName>user{index}@example.com</userName><userProfileName>Agents</userProfileName>"
+        "</generalInfo>"
+        f"<roles><agent><alwaysRecorded>false</alwaysRecorded><attachVmToEmail>false</attachVmToEmail>"
+        f"{permissions}<sendEmailOnVm>false</sendEmailOnVm></agent></roles>"
+        f"{skills}"
+        "</return>"
+    )
+
+
+def write_users_response(target_path, users):
+    with open(target_path, "w", encoding="utf-8") as target_file:
+        target_file.write(
+            '<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/"><env:Body>'
+            f'<ns2:getUsersInfoResponse xmlns:ns2="{NS}">'
+        )
+        for index in range(users):
+            target_file.write(user_xml(index))
+        target_file.write("</ns2:getUsersInfoResponse></env:Body></env:Envelope>")
+
+
+class ResponseHandler(http.server.BaseHTTPRequestHandler):
+    response_path = None
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.send_header("Content-Length", str(os.path.getsize(self.response_path)))
+        self.end_headers()
+        with open(self.response_path, "rb") as response_file:
+            while True:
+                chunk = response_file.read(1 << 16)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_sample(mode, url):
+    script = SAMPLE_SCRIPT.format(repo_root=REPO_ROOT, mode=mode, url=url)
+    output = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--output", type=str, default=None, help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ResponseHandler.response_path = os.path.join(temp_dir, "getUsersInfoResponse.xml")
+        write_users_response(ResponseHandler.response_path, args.users)
+        response_mb = os.path.getsize(ResponseHandler.response_path) / 1e6
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ResponseHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/wsadmin/v13/AdminWebService"
+
+        for mode in ["zeep", "raw"]:
+            samples = [run_sample(mode, url) for _ in range(args.samples)]
+            assert all(sample["count"] == args.users for sample in samples)
+            results[mode] = {
+                "median_seconds": statistics.median(s["seconds"] for s in samples),
+                "median_peak_rss_mb": statistics.median(s["peak_rss_kb"] for s in samples) / 1024,
+                "median_peak_rss_increase_mb": statistics.median(
+                    s["peak_rss_increase_kb"] for s in samples
+                ) / 1024,
+            }
+        server.shutdown()
+
+    print(f"{args.users} users, {response_mb:.1f} MB response")
+    baseline = results["zeep"]
+    for mode, result in results.items():
+        print(
+            f"{mode: <5} median {result['median_seconds']:.3f}s "
+            f"({result['median_seconds'] / baseline['median_seconds']:.0%} of zeep), "
+            f"peak RSS {result['median_peak_rss_mb']:.1f} MB "
+            f"(+{result['median_peak_rss_increase_mb']:.1f} MB during the call)"
+        )
+
+    if args.output:
+        results["users"] = args.users
+        results["response_mb"] = response_mb
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=4, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Offline benchmark suite for the client and the analysis utilities, run
+against synthetic fixtures (see fixtures.py) so it needs no Five9 domain.
+
+Every benchmark runs once to warm up and is then timed over --samples runs.
+The median, min and max are printed and --output writes them, with the
+versions and commit they were measured on, to a JSON file.  Keep the file
+of a release and compare later runs with it to catch regressions:
+
+    python benchmarks/bench_suite.py --output benchmarks/results.json
+    python benchmarks/bench_suite.py --compare benchmarks/results.json --threshold 0.2
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import lxml  # noqa: E402
+import zeep  # noqa: E402
+
+import fixtures  # noqa: E402
+from five9 import five9_session  # noqa: E402
+from five9.utils import snapshot_json, wsdl_cache  # noqa: E402
+from five9.utils.campaign_profile_comprehension import (  # noqa: E402
+    demystify_filter,
+    remystify_filter,
+)
+from five9.utils.domain_capture import Five9DomainConfig  # noqa: E402
+from five9.utils.general import datatype_conversion  # noqa: E402
+from five9.utils.ivr_utils import (  # noqa: E402
+    extract_jsfunctions_from_ivr,
+    ivr_variable_usage,
+)
+
+# name -> setup(context) returning the function to time, in run order
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def new_client(cache_dir):
+    return five9_session.Five9Client(
+        five9username="bench",
+        five9password="bench",
+        wsdl_source="bundled",
+        wsdl_cache_dir=cache_dir,
+        logging_level="WARNING",
+    )
+
+
+@benchmark("client_construction_parse")
+def bench_client_construction_parse(context):
+    # a new cache folder every time, the WSDL is parsed and the schema cache written
+    def run():
+        wsdl_cache._DOCUMENT_CACHE.clear()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            new_client(cache_dir)
+
+    return run
+
+
+@benchmark("client_construction_cached")
+def bench_client_construction_cached(context):
+    def run():
+        wsdl_cache._DOCUMENT_CACHE.clear()
+        new_client(context["cache_dir"])
+
+    return run
+
+
+@benchmark("serialize_object_users")
+def bench_serialize_object(context):
+    users = context["users"]
+    return lambda: zeep.helpers.serialize_object(users, dict)
+
+
+@benchmark("write_object_to_target_path")
+def bench_write_object_to_target_path(context):
+    # only writes files, an offline instance of an empty snapshot folder needs no client
+    domain_path = os.path.join(context["temp_dir"], "domain_snapshots", "Bench Domain")
+    target_dir = os.path.join(domain_path, "users")
+    os.makedirs(target_dir, exist_ok=True)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        domain_config = Five9DomainConfig.from_snapshot(domain_path)
+    users = zeep.helpers.serialize_object(context["users"], dict)
+
+    def run():
+        for user in users:
+            domain_config.write_object_to_target_path(
+                os.path.join(target_dir, user["generalInfo"]["userName"]), user
+            )
+
+    return run
+
+
+@benchmark("snapshot_json_domain")
+def bench_snapshot_json_domain(context):
+    # every file of a captured domain, with orjson when it is installed
+    domain_objects = context["domain_objects"]
+    return lambda: [snapshot_json.dumps(domain_object) for domain_object in domain_objects]
+
+
+@benchmark("snapshot_json_domain_stdlib")
+def bench_snapshot_json_domain_stdlib(context):
+    domain_objects = context["domain_objects"]
+
+    def run():
+        orjson, snapshot_json.orjson = snapshot_json.orjson, None
+        try:
+            return [snapshot_json.dumps(domain_object) for domain_object in domain_objects]
+        finally:
+            snapshot_json.orjson = orjson
+
+    return run
+
+
+@benchmark("demystify_filter")
+def bench_demystify_filter(context):
+    profile_filters = context["profile_filters"]
+    return lambda: [demystify_filter(profile_filter) for profile_filter in profile_filters]
+
+
+@benchmark("remystify_filter")
+def bench_remystify_filter(context):
+    nice_filters = [demystify_filter(profile_filter) for profile_filter in context["profile_filters"]]
+
+    def run():
+        # remystify_filter prints every condition
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            return [remystify_filter(nice_filter) for nice_filter in nice_filters]
+
+    return run
+
+
+@benchmark("ivr_variable_usage")
+def bench_ivr_variable_usage(context):
+    ivrs = context["ivrs"]
+    return lambda: ivr_variable_usage(ivrs)
+
+
+@benchmark("extract_jsfunctions_from_ivr")
+def bench_extract_jsfunctions_from_ivr(context):
+    ivrs = context["ivrs"]
+    return lambda: [extract_jsfunctions_from_ivr(ivr.xmlDefinition) for ivr in ivrs]
+
+
+@benchmark("datatype_conversion")
+def bench_datatype_conversion(context):
+    values = context["values"]
+    return lambda: [datatype_conversion(datatype, value) for datatype, value in values]
+
+
+def time_benchmark(run, samples):
+    run()
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "max_seconds": max(timings),
+        "samples": samples,
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints every benchmark against the baseline run and returns the names of
+    those more than threshold (a fraction) slower.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median_seconds"] / baseline[name]["median_seconds"]
+        regressed = ratio > 1 + threshold
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name: <32} {baseline[name]['median_seconds']:.4f}s -> {result['median_seconds']:.4f}s "
+            f"({ratio:.0%}){'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--users", type=int, default=2000, help="users in the getUsersInfo fixture")
+    parser.add_argument("--ivrs", type=int, default=200, help="IVR scripts in the IVR fixture")
+    parser.add_argument(
+        "--campaigns", type=int, default=200, help="campaigns in the captured domain (with --users and --ivrs)"
+    )
+    parser.add_argument("--filters", type=int, default=200, help="campaign profile filters to (de)mystify")
+    parser.add_argument("--values", type=int, default=100000, help="values for datatype_conversion")
+    parser.add_argument("--only", type=str, nargs="*", default=None, help="run only these benchmarks")
+    parser.add_argument("--output", type=str, default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", type=str, default=None, help="JSON file of an earlier run to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="slowdown reported as a regression, 0.1 is 10%%"
+    )
+    args = parser.parse_args()
+
+    names = args.only or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks {sorted(unknown)}, expected some of {list(BENCHMARKS)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_dir = os.path.join(temp_dir, "wsdl_cache")
+        client = new_client(cache_dir)
+        context = {
+            "temp_dir": temp_dir,
+            "cache_dir": cache_dir,
+            "users": fixtures.users_response(client, args.users),
+            "domain_objects": fixtures.captured_domain(client, args.users, args.campaigns, args.ivrs),
+            "ivrs": fixtures.ivr_scripts(args.ivrs),
+            "profile_filters": [fixtures.campaign_profile_filter(index) for index in range(args.filters)],
+            "values": fixtures.datatype_values(args.values),
+        }
+        for name in names:
+            results[name] = time_benchmark(BENCHMARKS[name](context), args.samples)
+            print(
+                f"{name: <32} median {results[name]['median_seconds']:.4f}s "
+                f"(min {results[name]['min_seconds']:.4f}s, max {results[name]['max_seconds']:.4f}s)"
+            )
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"\nCompared with {args.compare} ({baseline['metadata'].get('commit')})")
+        regressions = compare(results, baseline["benchmarks"], args.threshold)
+
+    if args.output:
+        output = {
+            "metadata": {
+                "commit": current_commit(),
+                "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "zeep": zeep.__version__,
+                "lxml": lxml.__version__,
+                "orjson": snapshot_json.orjson.__version__ if snapshot_json.orjson else None,
+                "fixtures": {
+                    "users": args.users,
+                    "ivrs": args.ivrs,
+                    "campaigns": args.campaigns,
+                    "filters": args.filters,
+                    "values": args.values,
+                },
+            },
+            "benchmarks": results,
+        }
+        with open(args.output, "w") as output_file:
+            json.dump(output, output_file, indent=4, sort_keys=True)
+
+    if regressions:
+        sys.exit(f"{len(regressions)} benchmarks regressed: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Synthetic inputs for the offline benchmarks, shaped like the responses of a
+Five9 domain.  Responses are built from the stand-in server's domain and
+deserialized with the bundled WSDL, so they are the same zeep objects a live
+call returns.
+"""
+import os
+import sys
+import types
+
+import zeep
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from five9.utils import standin_server  # noqa: E402
+
+COMPARE_OPERATORS = ["Equals", "NotEqual", "Like", "Less", "LessOrEqual", "Greater", "GreaterOrEqual"]
+
+
+def zeep_response(client, method_name, value):
+    """
+    Returns value (plain python, as returned by the stand-in domain) as the
+    zeep objects client.service.<method_name> would return for it.
+    """
+    operation = client.service._binding._operations[method_name]
+    envelope = operation.output.serialize(**{"return": value}).content
+    return operation.process_reply(envelope)
+
+
+def users_response(client, users):
+    """getUsersInfo for a domain of users users, as zeep objects."""
+    domain = standin_server.StandInDomain(users=users)
+    return zeep_response(client, "getUsersInfo", domain.getUsersInfo())
+
+
+def captured_domain(client, users, campaigns, ivr_scripts):
+    """
+    The serialized objects a domain capture writes to files, one per user,
+    skill, campaign (with its details), campaign profile and IVR script.
+    """
+    domain = standin_server.StandInDomain(
+        users=users, skills=users // 10, campaigns=campaigns, campaign_profiles=campaigns // 2,
+        ivr_scripts=ivr_scripts,
+    )
+    responses = [
+        zeep_response(client, method_name, getattr(domain, method_name)())
+        for method_name in ["getUsersInfo", "getSkills", "getCampaignProfiles", "getIVRScripts"]
+    ]
+    detail_methods = {"INBOUND": "getInboundCampaign", "OUTBOUND": "getOutboundCampaign"}
+    for campaign in domain.getCampaigns():
+        method_name = detail_methods.get(campaign["type"])
+        if method_name:
+            responses.append(
+                [zeep_response(client, method_name, getattr(domain, method_name)(campaign["name"]))]
+            )
+    return [zeep.helpers.serialize_object(item, dict) for response in responses for item in response]
+
+
+def ivr_scripts(count, variables=20, functions=5):
+    """IVR scripts with the attributes ivr_utils reads (name, xmlDefinition)."""
+    return [
+        types.SimpleNamespace(
+            name=f"IVR {index:05}",
+            xmlDefinition=standin_server.synthetic_ivr_xml(index, variables, functions),
+        )
+        for index in range(count)
+    ]
+
+
+def campaign_profile_filter(index, criteria=12):
+    """A getCampaignProfileFilter response (serialized) with a Custom grouping of criteria conditions."""
+    crm_criteria = [
+        {
+            "compareOperator": COMPARE_OPERATORS[(index + number) % len(COMPARE_OPERATORS)],
+            "leftValue": f"field_{number}",
+            "rightValue": None if number % 5 == 4 else f"value_{index}_{number}",
+        }
+        for number in range(criteria)
+    ]
+    # ((1 AND 2) OR (3 AND 4)) AND ((5 AND 6) OR (7 AND 8)) ...
+    pairs = [
+        f"({number + 1} AND {number + 2})" if number + 1 < criteria else f"{number + 1}"
+        for number in range(0, criteria, 2)
+    ]
+    groups = [
+        f"({' OR '.join(pairs[start:start + 2])})" for start in range(0, len(pairs), 2)
+    ]
+    return {
+        "crmCriteria": crm_criteria,
+        "grouping": {"expression": " AND ".join(groups), "type": "Custom"},
+        "orderByFields": [],
+        "profileName": f"Profile {index:05}",
+    }
+
+
+def datatype_values(count):
+    """(datatype, value) pairs in the mix the bulk user scripts convert from CSV columns."""
+    samples = [
+        (str, "user@example.com"),
+        (int, "1042"),
+        (float, "12.5"),
+        (bool, "true"),
+        (bool, "N"),
+        (type(None), ""),
+    ]
+    return [samples[index % len(samples)] for index in range(count)]
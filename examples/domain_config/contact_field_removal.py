@@ -54,7 +54,6 @@ if __name__ == "__main__":
             for campaign in originally_running_campaigns:
                 try:
                     client.service.stopCampaign(campaign.name)
-                    time.sleep(0.3)
                 except Exception as e:
                     print(f"\nFAILED to stop campaign '{campaign.name}': {e}\n")
                 finally:
@@ -111,7 +110,6 @@ if __name__ == "__main__":
             for campaign in originally_running_campaigns:
                 try:
                     client.service.startCampaign(campaign.name)
-                    time.sleep(0.3)
                 except Exception as e:
                     print(f"\nFAILED to start campaign '{campaign.name}': {e}\n")
                 finally:
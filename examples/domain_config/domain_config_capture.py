@@ -39,6 +39,51 @@ if __name__ == "__main__":
         help="Five9 host alias (us, ca, eu, frk, in)",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=domain_capture.DEFAULT_MAX_WORKERS,
+        help="Number of concurrent detail calls, within the domain's API limits",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rewrite the files of the previous snapshot whose content changed",
+    )
+
+    parser.add_argument(
+        "--changed-details-only",
+        action="store_true",
+        help="Only read the details of objects whose list record changed since the previous capture",
+    )
+
+    parser.add_argument(
+        "--refresh-period",
+        type=int,
+        default=domain_capture.DEFAULT_DETAIL_REFRESH_PERIOD,
+        help="With --changed-details-only, read every unchanged detail at least once in this many captures",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last capture that was interrupted or had failed methods, where it stopped",
+    )
+
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Release each object once written, domain_objects reads them back from the snapshot",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=domain_capture.SNAPSHOT_FORMATS,
+        default="files",
+        help="A file per object in a git repository, or a single archive file per capture",
+    )
+
     args = parser.parse_args()
 
     password = args.password
@@ -51,6 +96,13 @@ if __name__ == "__main__":
         password=password,
         account=args.account_alias,
         api_hostname_alias=args.hostalias,
+        max_workers=args.workers,
+        incremental=args.incremental,
+        snapshot_format=args.format,
+        changed_details_only=args.changed_details_only,
+        detail_refresh_period=args.refresh_period,
+        resume=args.resume,
+        streaming=args.streaming,
     )
 
     domain.get_domain_objects()
@@ -0,0 +1,98 @@
+import argparse
+
+from five9.utils import domain_capture, fleet_capture
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Captures the domains of the accounts in private/credentials.py at the same time"
+    )
+
+    parser.add_argument(
+        "--aliases",
+        metavar="Stored credential alias",
+        type=str,
+        nargs="+",
+        required=False,
+        help="Aliases of stored credential objects in private/credentials.py, defaults to all of them",
+    )
+
+    parser.add_argument(
+        "--hostalias",
+        type=str,
+        default="us",
+        help="Five9 host alias (us, ca, eu, frk, in)",
+    )
+
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Number of domains captured at the same time, defaults to all of them",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=domain_capture.DEFAULT_MAX_WORKERS,
+        help="Number of concurrent detail calls per domain, within each domain's API limits",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rewrite the files of the previous snapshots whose content changed",
+    )
+
+    parser.add_argument(
+        "--changed-details-only",
+        action="store_true",
+        help="Only read the details of objects whose list record changed since the previous capture",
+    )
+
+    parser.add_argument(
+        "--refresh-period",
+        type=int,
+        default=domain_capture.DEFAULT_DETAIL_REFRESH_PERIOD,
+        help="With --changed-details-only, read every unchanged detail at least once in this many captures",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last capture that was interrupted or had failed methods, where it stopped",
+    )
+
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Release each object once written, domain_objects reads them back from the snapshot",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=domain_capture.SNAPSHOT_FORMATS,
+        default="files",
+        help="A file per object in a git repository, or a single archive file per capture",
+    )
+
+    args = parser.parse_args()
+
+    captures = fleet_capture.capture_fleet(
+        aliases=args.aliases,
+        max_processes=args.processes,
+        client_kwargs={"api_hostname_alias": args.hostalias},
+        max_workers=args.workers,
+        incremental=args.incremental,
+        snapshot_format=args.format,
+        changed_details_only=args.changed_details_only,
+        detail_refresh_period=args.refresh_period,
+        resume=args.resume,
+        streaming=args.streaming,
+    )
+
+    failed = [capture for capture in captures if capture.error]
+    print(f"\nCaptured {len(captures) - len(failed)} of {len(captures)} domains")
+    for capture in failed:
+        print(f"{capture.alias}: {capture.error}, see {capture.log_path}")
+    if failed:
+        raise SystemExit(1)
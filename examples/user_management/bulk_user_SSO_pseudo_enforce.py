@@ -202,7 +202,6 @@ def pseudo_enforce_SSO(
                     user.generalInfo.mustChangePassword = False
 
                     modified_user = client.service.modifyUser(user.generalInfo)
-                    time.sleep(0.15)
 
                     modified_user.generalInfo.EMail = original_email
                     modified_user = client.service.modifyUser(modified_user.generalInfo)
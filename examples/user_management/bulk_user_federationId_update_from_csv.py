@@ -1,5 +1,4 @@
 import csv
-import time
 import zeep
 from tqdm import tqdm
 from five9 import five9_session
@@ -72,7 +71,6 @@ def update_user_federation_ids(csv_path, client=None):
                     user.generalInfo.federationId = user_federationId
                     modified_user = client.service.modifyUser(user.generalInfo)
                     updated_users.append(modified_user)
-                    time.sleep(0.3)
             except zeep.exceptions.Fault as e:
                 error_users.append(user)
             finally:
@@ -1,11 +1,12 @@
-import time
 import zeep
 from tqdm import tqdm
 
 from five9 import five9_session
 
 
-def manage_user_skills(client, users_to_update, skills_to_add, skills_to_remove):
+def manage_user_skills(
+    client, users_to_update, skills_to_add, skills_to_remove, max_workers=4
+):
     """
     Manages skills for specified users in the Five9 domain.
 
@@ -13,7 +14,7 @@ def manage_user_skills(client, users_to_update, skills_to_add, skills_to_remove)
     based on provided lists. It uses the Five9 domain's service to make these updates.
 
     Parameters:
-    client: Zeep Client object
+    client: five9_session.Five9Client
         The client used to interact with the Five9 domain.
     users_to_update: list of str
         List of usernames for which skills will be managed.
@@ -21,15 +22,13 @@ def manage_user_skills(client, users_to_update, skills_to_add, skills_to_remove)
         Skill names to be added to the users.
     skills_to_remove: list of str
         Skill names to be removed from the users.
+    max_workers: int
+        Number of concurrent API calls.
 
     Returns:
     tuple: (updated_count, error_count)
         updated_count: The number of successful updates.
-        error_count: The number of errors encountered during updates.
-
-    Raises:
-    zeep.exceptions.Fault
-        If an error occurs during the skill management process.
+        error_count: The number of users with one or more failed updates.
     """
 
     skills_add_objs = []
@@ -47,40 +46,47 @@ def manage_user_skills(client, users_to_update, skills_to_add, skills_to_remove)
         except zeep.exceptions.Fault as e:
             print(f"Error retrieving skill '{skill_name}': {e}")
 
-    error_count = 0
-    updated_count = 0
+    def user_skill_payloads(skills):
+        return [
+            {
+                "userSkill": {
+                    "id": skill.id,
+                    "level": 1,  # Assuming the highest level
+                    "skillName": skill.name,
+                    "userName": user,
+                }
+            }
+            for user in users_to_update
+            for skill in skills
+        ]
+
+    skill_changes = [
+        ("userSkillAdd", user_skill_payloads(skills_add_objs)),
+        ("userSkillRemove", user_skill_payloads(skills_remove_objs)),
+    ]
 
+    # calls run concurrently, the client keeps them within the domain's rate limits
+    failed_users = set()
     with tqdm(
-        total=len(users_to_update), desc="Updating user skills", mininterval=1
+        total=sum(len(payloads) for _, payloads in skill_changes),
+        desc="Updating user skills",
+        mininterval=1,
     ) as pbar:
-        for user in users_to_update:
-            try:
-                for skill in skills_add_objs:
-                    user_skill = {
-                        "id": skill.id,
-                        "level": 1,  # Assuming the highest level
-                        "skillName": skill.name,
-                        "userName": user,
-                    }
-                    client.service.userSkillAdd(userSkill=user_skill)
-                    time.sleep(0.5)  # Delay to avoid rate limits
-
-                for skill in skills_remove_objs:
-                    user_skill = {
-                        "id": skill.id,
-                        "level": 1,
-                        "skillName": skill.name,
-                        "userName": user,
-                    }
-                    client.service.userSkillRemove(userSkill=user_skill)
-                    time.sleep(0.5)  # Delay to avoid rate limits
+        for method_name, payloads in skill_changes:
+            results = client.map(
+                method_name,
+                payloads,
+                max_workers=max_workers,
+                progress=lambda result: pbar.update(1),
+            )
+            for result in results:
+                if result.fault is not None:
+                    user = result.payload["userSkill"]["userName"]
+                    failed_users.add(user)
+                    print(f"Error updating skills for user '{user}': {result.fault}")
+            pbar.set_postfix({"Errors": len(failed_users)})
 
-                updated_count += 1
-            except zeep.exceptions.Fault as e:
-                error_count += 1
-                print(f"Error updating skills for user '{user}': {e}")
-            finally:
-                pbar.update(1)
-                pbar.set_postfix({"Updated": updated_count, "Errors": error_count})
+    error_count = len(failed_users)
+    updated_count = len(users_to_update) - error_count
 
     return updated_count, error_count
@@ -2,7 +2,6 @@ import argparse
 import csv
 from datetime import datetime
 import logging
-import time
 import os
 
 import tqdm
@@ -41,7 +40,6 @@ def capture_user_details(
             try:
                 user_info = client.service.getUserInfo(user)
                 users.append(user_info)
-                time.sleep(0.3)  # Delay between API calls to avoid rate limits
             except Exception as e:
                 logging.error(f"Error retrieving info for user {user}: {e}")
     else:
@@ -1,16 +1,42 @@
+import asyncio
 import base64
 import code
+import collections
+import concurrent.futures
+import itertools
+import threading
 
 import argparse
 import logging
-from lxml import etree
 
 from getpass import getpass
 
-# import os
+import os
 import requests
 import zeep
-from zeep.plugins import HistoryPlugin
+from lxml import etree
+from zeep.proxy import (
+    AsyncOperationProxy,
+    AsyncServiceProxy,
+    OperationProxy,
+    ServiceProxy,
+)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from five9.utils import (
+    cassette,
+    history,
+    metrics,
+    rate_limiting,
+    raw_xml,
+    response_cache,
+    single_flight,
+    wsdl_cache,
+)
 
 try:
     from private.credentials import ACCOUNTS
@@ -30,6 +56,10 @@ class Five9ClientCreationError(Exception):
     pass
 
 
+# Outcome of one call made by Five9Client.map, exactly one of result/fault is set
+BulkCallResult = collections.namedtuple("BulkCallResult", ["payload", "result", "fault"])
+
+
 class Five9Client(zeep.Client):
     """
     A wrapper class for the Zeep client that provides additional functionality for interacting with the Five9 API.
@@ -39,12 +69,58 @@ class Five9Client(zeep.Client):
         five9password: The password for the Five9 account. (optional)
         account: The alias for the account to use. If not provided, the default account will be used. (optional)
         sessiontype: The type of session to create. Can be 'admin' or 'statistics'. Default is 'admin'. (optional)
-        api_hostname: The hostname of the Five9 API. Default is 'api.five9.com'. (optional)
+        api_hostname: The hostname of the Five9 API. Default is 'api.five9.com'.  May include a scheme
+            and port, e.g. 'http://127.0.0.1:8080' for the local stand-in server
+            (five9.utils.standin_server). (optional)
         api_version: The version of the Five9 API to use. Default is 'v12'. (optional)
+        wsdl_source: Where the service definition is loaded from. 'remote' downloads the WSDL from
+            the API host, 'bundled' uses the WSDL in static_resources (admin sessions only) and
+            'cache' downloads the WSDL once per host/session type/version and re-uses the on-disk
+            copy afterwards.  'bundled' and 'cache' also re-use the parsed schema across processes.
+            Default is 'remote'. (optional)
+        wsdl_cache_dir: Directory for the cached WSDLs and parsed schemas. Default is
+            ~/.five9/wsdl_cache or the FIVE9_WSDL_CACHE_DIR environment variable. (optional)
+        lazy_bootstrap: When True (default) the call counters and the domain name/id are fetched
+            on first access instead of during construction, so creating a client makes no API
+            calls.  Set to False to fetch them up front and fail fast on bad credentials. (optional)
+        rate_limit: When True (default) calls of admin sessions are throttled with a sliding window per
+            operation type and limit window, sized from the limits returned by getCallCountersState, so bulk scripts
+            don't need fixed sleeps between calls. (optional)
+        rate_limit_resync_interval: Seconds after which the call counters are read again to re-align
+            the sliding windows with the usage Five9 reports.  Default is None (never). (optional)
+        history_size: The number of request/response exchanges kept in client.history, 0 turns the
+            history off. Default is 1. (optional)
+        history_sample_every: Only keep every n-th exchange in the history, e.g. 100 to sample
+            long running jobs. Default is 1 (every exchange). (optional)
+        collect_metrics: When True (default) call counts, faults, latencies and envelope sizes are
+            recorded per operation, see client.metrics(). (optional)
+        cache: When True the responses of get* methods are cached per method and arguments in
+            client.response_cache and successful create/modify/delete/add/remove calls drop the
+            cached responses of the same object type.  Default is False. (optional)
+        cache_ttl: Seconds a cached response stays valid. Default is 300. (optional)
+        cache_maxsize: The maximum number of cached responses, least recently used first out.
+            Default is 1024. (optional)
+        coalesce_reads: When True (default) concurrent identical get*/is*/check* calls from several
+            threads or tasks share one request and all receive its response. (optional)
+        cassette: Path of a cassette file that records the HTTP exchanges of the client, or replays
+            them without a network, see five9.utils.cassette. (optional)
+        cassette_mode: 'record', 'replay' or 'auto' (default), which replays when the cassette
+            exists and records otherwise. (optional)
+        cassette_latency: Latency added to every replayed exchange, in seconds or 'recorded' to
+            wait as long as the recorded exchange took. Default is None (no wait). (optional)
     
     """
-    call_counters = None
+    cassette = None
     history = None
+    metrics_plugin = None
+    rate_limiter = None
+    rate_limit_plugin = None
+    response_cache = None
+    single_flight = None
+    sessiontype = None
+    _pool_size = requests.adapters.DEFAULT_POOLSIZE
+    _call_counters = None
+    _vcc_configuration = None
 
     def __init__(self, *args, **kwargs):
 
@@ -61,6 +137,21 @@ class Five9Client(zeep.Client):
         api_hostname_alias = kwargs.get("api_hostname_alias", None)
         api_version = kwargs.get("api_version", None)
         logging_level = kwargs.get("logging_level", "INFO")
+        wsdl_source = kwargs.get("wsdl_source", None) or "remote"
+        wsdl_cache_dir = kwargs.get("wsdl_cache_dir", None)
+        lazy_bootstrap = kwargs.get("lazy_bootstrap", True)
+        rate_limit = kwargs.get("rate_limit", True)
+        rate_limit_resync_interval = kwargs.get("rate_limit_resync_interval", None)
+        self.history_size = kwargs.get("history_size", 1)
+        self.history_sample_every = kwargs.get("history_sample_every", 1)
+        collect_metrics = kwargs.get("collect_metrics", True)
+        cache = kwargs.get("cache", False)
+        cache_ttl = kwargs.get("cache_ttl", 300)
+        cache_maxsize = kwargs.get("cache_maxsize", 1024)
+        coalesce_reads = kwargs.get("coalesce_reads", True)
+        cassette_path = kwargs.get("cassette", None)
+        cassette_mode = kwargs.get("cassette_mode", "auto")
+        cassette_latency = kwargs.get("cassette_latency", None)
 
 
         # configure logging, use the logging level provided in the arguments and set default format to '%(asctime)s - %(levelname)s - %(message)s'
@@ -74,16 +165,57 @@ class Five9Client(zeep.Client):
             api_hostname = "api.five9.com"
         if api_version is None:
             api_version = "v13"
-            self.api_version = api_version
+        self.api_version = api_version
+        self.sessiontype = sessiontype
+
+        if wsdl_source not in wsdl_cache.WSDL_SOURCES:
+            raise Five9ClientCreationError(
+                f"Unknown wsdl_source '{wsdl_source}', expected one of {wsdl_cache.WSDL_SOURCES}"
+            )
+        if wsdl_source == "bundled" and sessiontype != "admin":
+            raise Five9ClientCreationError(
+                "The bundled WSDL only describes the admin webservice"
+            )
+        if cassette_mode not in cassette.CASSETTE_MODES:
+            raise Five9ClientCreationError(
+                f"Unknown cassette_mode '{cassette_mode}', expected one of {cassette.CASSETTE_MODES}"
+            )
 
         if api_hostname_alias:
             api_hostname = HOST_ALIAS.get(api_hostname_alias, "api.five9.com")
 
-        self.history = HistoryPlugin()
+        api_scheme = "https"
+        if "://" in api_hostname:
+            api_scheme, api_hostname = api_hostname.split("://", 1)
+
+        self.history = history.Five9HistoryPlugin(
+            maxlen=self.history_size, sample_every=self.history_sample_every
+        )
+        plugins = [self.history]
+
+        if rate_limit and sessiontype == "admin":
+            self.rate_limiter = rate_limiting.RateLimiter()
+            plugins.extend(self._rate_limit_plugins(rate_limit_resync_interval))
+
+        # after the rate limiter so the latency doesn't include the throttling wait
+        if collect_metrics:
+            self.metrics_plugin = metrics.MetricsPlugin()
+            plugins.append(self.metrics_plugin)
+
+        if cache:
+            self.response_cache = response_cache.ResponseCache(
+                ttl=cache_ttl, maxsize=cache_maxsize
+            )
+
+        if coalesce_reads:
+            self.single_flight = single_flight.SingleFlight()
 
         # url and user settings consolidated here for convenience to use later
         api_definition_base = (
-            "https://{api_hostname}/{sessiontype}/{api_version}/{sessiontype_path}?wsdl&user={five9username}"
+            "{api_scheme}://{api_hostname}/{sessiontype}/{api_version}/{sessiontype_path}?wsdl&user={five9username}"
+        )
+        service_address_base = (
+            "{api_scheme}://{api_hostname}/{sessiontype}/{api_version}/{sessiontype_path}"
         )
 
 
@@ -104,16 +236,21 @@ class Five9Client(zeep.Client):
                 five9username = api_account.get("username", None)
                 five9password = api_account.get("password", None)
 
-        self.domain_name = None
-        self.domain_id = None
-
         # prepare the session with BasicAuth headers
         self.transport_session = requests.Session()
         self.transport_session.auth = requests.auth.HTTPBasicAuth(
             five9username, five9password
         )
 
+        if cassette_path:
+            # mounted before the WSDL is loaded so a remote WSDL is recorded too
+            self.cassette = cassette.Cassette(
+                cassette_path, mode=cassette_mode, latency=cassette_latency
+            )
+            self._mount_adapter(self._pool_size)
+
         self.api_definition = api_definition_base.format(
+            api_scheme=api_scheme,
             api_hostname=api_hostname,
             sessiontype=sessiontype_details[sessiontype][0],
             sessiontype_path=sessiontype_details[sessiontype][1],
@@ -122,36 +259,54 @@ class Five9Client(zeep.Client):
         )
         logging.info(f"API Definition: {self.api_definition}")
 
-        # BREAKFIX - Get the directory of the current file and construct the WSDL file path
-        # current_dir = os.path.dirname(os.path.realpath(__file__))
-        # wsdl_file_path = os.path.join(current_dir, 'static_resources', 'config_webservices_v13.wsdl')
+        self.service_address = service_address_base.format(
+            api_scheme=api_scheme,
+            api_hostname=api_hostname,
+            sessiontype=sessiontype_details[sessiontype][0],
+            sessiontype_path=sessiontype_details[sessiontype][1],
+            api_version=api_version,
+        )
 
         try:
+            # the WSDL is always loaded synchronously, the client transport may differ
+            settings = zeep.Settings()
+            transport = wsdl_cache.Five9Transport(session=self.transport_session)
+
+            if wsdl_source == "remote":
+                wsdl = zeep.wsdl.Document(self.api_definition, transport, settings=settings)
+            else:
+                if wsdl_source == "bundled":
+                    wsdl_path = wsdl_cache.BUNDLED_WSDL_PATH
+                    if api_version != wsdl_cache.BUNDLED_WSDL_VERSION:
+                        logging.warning(
+                            f"Bundled WSDL is {wsdl_cache.BUNDLED_WSDL_VERSION}, requests will target {api_version}"
+                        )
+                else:
+                    wsdl_path = wsdl_cache.cached_wsdl_path(
+                        api_hostname,
+                        sessiontype_details[sessiontype][0],
+                        api_version,
+                        cache_dir=wsdl_cache_dir,
+                    )
+                    if not os.path.exists(wsdl_path):
+                        wsdl_cache.fetch_wsdl(
+                            self.api_definition, self.transport_session, wsdl_path
+                        )
+                logging.info(f"WSDL loaded from: {wsdl_path}")
+                wsdl = wsdl_cache.load_wsdl_document(
+                    wsdl_path, transport, cache_dir=wsdl_cache_dir
+                )
+                wsdl_cache.set_service_address(wsdl, self.service_address)
+
             super().__init__(
-                self.api_definition,
-                transport=zeep.Transport(session=self.transport_session),
-                plugins=[self.history],
+                wsdl,
+                transport=self._create_transport(transport),
+                plugins=plugins,
+                settings=settings,
             )
-            # super().__init__(
-            #     wsdl_file_path,
-            #     transport=zeep.Transport(session=self.transport_session),
-            #     plugins=[self.history],
-            # )
-            
-            # Fetching the current state of call counters if sessiontype is admin
-            if sessiontype == "admin":
-                self.call_counters = self.service.getCallCountersState()
-
-            if sessiontype != "statistics":
-                vcc_config = self.service.getVCCConfiguration()
-                logging.info(f"API VERSION: {api_version}")
-                if api_version != "v4":
-                    logging.debug("New version")
-                    self.domain_name = vcc_config["domainName"]
-                    self.domain_id = vcc_config["domainId"]
-                else:
-                    self.domain_name = "HARDCODED"
-                    self.domain_id = "HARDCODED"
+
+            if not lazy_bootstrap:
+                self.refresh()
 
             logging.info(f"Client ready for {five9username}")
 
@@ -164,6 +319,115 @@ class Five9Client(zeep.Client):
             # pass the error to the caller through the Five9ClientCreationError exception
             raise Five9ClientCreationError(e)
 
+    def _create_transport(self, wsdl_transport):
+        """
+        Returns the transport used for the API calls.  The sync client re-uses the transport
+        that loaded the WSDL.
+        """
+        return wsdl_transport
+
+    def bind(self, service_name=None, port_name=None):
+        if not self.wsdl.services:
+            return
+
+        service = self._get_service(service_name)
+        port = self._get_port(service, port_name)
+        return _Five9ServiceProxy(self, port.binding, **port.binding_options)
+
+    def _rate_limit_plugins(self, resync_interval):
+        """
+        Returns the zeep plugins that throttle the calls with self.rate_limiter.
+        """
+        self.rate_limit_plugin = rate_limiting.RateLimitPlugin(
+            self.rate_limiter,
+            self.refresh_call_counters,
+            resync_interval=resync_interval,
+        )
+        return [self.rate_limit_plugin]
+
+    def _after_call(self, method_name):
+        """
+        Tells the rate limiter that the call of method_name made on this thread has finished.
+        """
+        if self.rate_limit_plugin is not None:
+            self.rate_limit_plugin.release()
+
+    @property
+    def call_counters(self):
+        """
+        Returns the call counters state of the domain (getCallCountersState), fetched on first
+        access.  Always None for statistics sessions.
+        """
+        if self._call_counters is None and self.sessiontype == "admin":
+            self.refresh_call_counters()
+        return self._call_counters
+
+    @property
+    def domain_name(self):
+        """
+        Returns the name of the domain, fetched with getVCCConfiguration on first access.
+        Always None for statistics sessions.
+        """
+        if self.vcc_configuration is None:
+            return None
+        if self.api_version == "v4":
+            return "HARDCODED"
+        return self.vcc_configuration["domainName"]
+
+    @property
+    def domain_id(self):
+        """
+        Returns the id of the domain, fetched with getVCCConfiguration on first access.
+        Always None for statistics sessions.
+        """
+        if self.vcc_configuration is None:
+            return None
+        if self.api_version == "v4":
+            return "HARDCODED"
+        return self.vcc_configuration["domainId"]
+
+    @property
+    def vcc_configuration(self):
+        """
+        Returns the getVCCConfiguration response, fetched on first access.  Always None for
+        statistics sessions.
+        """
+        if self._vcc_configuration is None and self.sessiontype != "statistics":
+            self.refresh_vcc_configuration()
+        return self._vcc_configuration
+
+    def refresh_call_counters(self):
+        """
+        Fetches the current call counters state, replacing the memoized value.
+
+        Returns:
+            The getCallCountersState response, or None for statistics sessions.
+        """
+        if self.sessiontype == "admin":
+            self._call_counters = self.service.getCallCountersState()
+            if self.rate_limiter is not None:
+                self.rate_limiter.update_from_call_counters(self._call_counters)
+        return self._call_counters
+
+    def refresh_vcc_configuration(self):
+        """
+        Fetches the VCC configuration of the domain, replacing the memoized value.
+
+        Returns:
+            The getVCCConfiguration response, or None for statistics sessions.
+        """
+        if self.sessiontype != "statistics":
+            self._vcc_configuration = self.service.getVCCConfiguration()
+            logging.info(f"API VERSION: {self.api_version}")
+        return self._vcc_configuration
+
+    def refresh(self):
+        """
+        Fetches both the call counters and the VCC configuration, replacing the memoized values.
+        """
+        self.refresh_call_counters()
+        self.refresh_vcc_configuration()
+
     def __format_envelope(self, envelope):
         """
         Formats the SOAP envelope for printing.
@@ -174,7 +438,20 @@ class Five9Client(zeep.Client):
         Returns:
             A formatted string containing the SOAP envelope.
         """
-        return etree.tostring(envelope, encoding="unicode", pretty_print=True)
+        return history.format_envelope(envelope)
+
+    def _reset_history(self):
+        """
+        Replaces the history plugin, e.g. after client.history was overwritten by accident.
+        """
+        new_history = history.Five9HistoryPlugin(
+            maxlen=self.history_size, sample_every=self.history_sample_every
+        )
+        self.plugins = [
+            new_history if isinstance(plugin, history.Five9HistoryPlugin) else plugin
+            for plugin in self.plugins
+        ]
+        self.history = new_history
 
     @property
     def latest_envelopes(self):
@@ -188,10 +465,9 @@ class Five9Client(zeep.Client):
         envelopes = ""
         try:
             for hist in [self.history.last_sent, self.history.last_received]:
-                e = etree.tostring(
-                    hist["envelope"], encoding="unicode", pretty_print=True
-                )
-                envelopes += e + "\n\n"
+                if hist is None:
+                    continue
+                envelopes += self.__format_envelope(hist["envelope"]) + "\n\n"
             return envelopes
         except (AttributeError, IndexError, TypeError):
             # catch cases where the history object was altered to an invalid type
@@ -199,7 +475,7 @@ class Five9Client(zeep.Client):
             envelopes = (
                 "History object not found.  Re-initializing the history object.\n\n"
             )
-            self.history = HistoryPlugin()
+            self._reset_history()
 
             return envelopes
 
@@ -213,11 +489,14 @@ class Five9Client(zeep.Client):
             If no envelope is available, an empty string is returned.
         """
         try:
-            return self.__format_envelope(self.history.last_sent["envelope"])
+            hist = self.history.last_sent
+            if hist is None:
+                return ""
+            return self.__format_envelope(hist["envelope"])
         except (AttributeError, IndexError, TypeError):
             # catch cases where the history object was altered to an invalid type
             # re-initialize the history object
-            self.history = HistoryPlugin()
+            self._reset_history()
 
             return ""
 
@@ -231,24 +510,31 @@ class Five9Client(zeep.Client):
             If no envelope is available, an empty string is returned.
         """
         try:
-            return self.__format_envelope(self.history.last_received["envelope"])
+            hist = self.history.last_received
+            if hist is None:
+                return ""
+            return self.__format_envelope(hist["envelope"])
         except (AttributeError, IndexError, TypeError):
             # catch cases where the history object was altered to an invalid type
             # re-initialize the history object
-            self.history = HistoryPlugin()
+            self._reset_history()
 
             return ""
 
     @property
     def current_api_useage_formatted(self):
         # Fetching the current state of call counters
-        current_call_counters = self.service.getCallCountersState()
+        return self._format_call_counters(self.refresh_call_counters())
 
+    def _format_call_counters(self, current_call_counters):
+        """
+        Formats a getCallCountersState response as usage/limit per operation type and timeout.
+        """
         # Initialize an empty dictionary to store the results
         result = {}
 
         # Iterate over each object in the call counter state
-        for obj in current_call_counters:
+        for obj in current_call_counters or []:
             timeout = obj["timeout"]
 
             # Iterate over each state in the callCounterStates of the current object
@@ -313,8 +599,173 @@ class Five9Client(zeep.Client):
         else:
             return "No request found in history"
 
-    # TODO class method to obtain the domain rate limits to update a class property
-    # that helps bake in a delay between requests if needed
+    def metrics(self, output_format="dict"):
+        """
+        Returns the per operation metrics recorded since the client was created: calls, faults,
+        request/response envelope bytes and the latency distribution (p50/p95/p99 and histogram).
+
+        Args:
+            output_format (str, optional): 'dict', 'json' or 'prometheus'. Defaults to 'dict'.
+
+        Returns:
+            dict or str: The metrics keyed by operation name, or the formatted metrics.
+        """
+        snapshot = self.metrics_plugin.snapshot() if self.metrics_plugin else {}
+        if output_format == "json":
+            return metrics.format_json(snapshot)
+        if output_format == "prometheus":
+            return metrics.format_prometheus(snapshot)
+        return snapshot
+
+    def raw_call(
+        self,
+        method_name,
+        *args,
+        record_path=("return",),
+        list_fields=(),
+        as_tuples=False,
+        **kwargs,
+    ):
+        """
+        Calls method_name and streams the records of the response as plain dicts, parsed with
+        lxml.iterparse straight from the socket instead of being built into zeep objects first.
+        Meant for huge reads (getUsersInfo, getIVRScripts, getContactRecords) where the zeep
+        objects and their serialize_object copies don't fit comfortably in memory.
+
+        Leaves are strings (no schema conversion) and children are only lists when they repeat
+        within a record or are named in list_fields.  The request goes through the egress plugins
+        (rate limiting, history, metrics call count); the response bypasses the cache, the read
+        coalescing and the ingress plugins.
+
+        Args:
+            method_name (str): The name of the webservice method.
+            *args, **kwargs: The arguments of the method, as for client.service.<method_name>.
+            record_path (tuple, optional): Local names from the operation response element to a
+                record, e.g. ('return', 'records') for getContactRecords. Defaults to ('return',).
+            list_fields (tuple, optional): Child names that are always lists, e.g. ('skills', 'agentGroups').
+            as_tuples (bool, optional): Yield tuples of (name, value) pairs instead of dicts.
+
+        Returns:
+            generator: The records, in the order of the response.
+
+        Raises:
+            zeep.exceptions.Fault: While iterating, when the response is a SOAP fault.
+        """
+        service = self.service
+        envelope, http_headers = service._binding._create(
+            method_name, args, kwargs, client=self, options=service._binding_options
+        )
+        try:
+            response = self.transport_session.post(
+                service._binding_options["address"],
+                data=etree.tostring(envelope),
+                headers=http_headers,
+                stream=True,
+                timeout=getattr(self.transport, "operation_timeout", None),
+            )
+        finally:
+            self._after_call(method_name)
+        # faults come back as 500 with an envelope
+        if response.status_code not in (200, 500):
+            response.close()
+            response.raise_for_status()
+        response.raw.decode_content = True
+        return self._iter_raw_records(response, record_path, list_fields, as_tuples)
+
+    def _iter_raw_records(self, response, record_path, list_fields, as_tuples):
+        try:
+            yield from raw_xml.iter_records(
+                response.raw,
+                record_path=record_path,
+                list_fields=list_fields,
+                as_tuples=as_tuples,
+            )
+        finally:
+            response.close()
+
+    def map(self, method_name, payloads, max_workers=8, progress=None, stop_on_fault=False):
+        """
+        Calls a service method once for every payload on a pool of worker threads that share
+        the client's session, rate limiter and connection pool.
+
+        Args:
+            method_name (str): The service method to call, e.g. 'modifyUser'.
+            payloads (iterable): One entry per call.  A dict is passed as keyword arguments, a
+                tuple or list as positional arguments and anything else as the only argument.
+            max_workers (int, optional): The number of concurrent calls. Defaults to 8.
+            progress (callable, optional): Called with each BulkCallResult, in payload order, as
+                calls complete, e.g. to update a tqdm progress bar.
+            stop_on_fault (bool, optional): Make no more calls once a call failed, the calls
+                already in flight still complete. Defaults to False.
+
+        Returns:
+            list: A BulkCallResult for every payload, in the order of the payloads.  Calls that
+            raised a zeep or requests error have the exception in fault and result set to None.
+            With stop_on_fault, the payloads that weren't called after a fault are left out.
+        """
+        service_method = getattr(self.service, method_name)
+        self._ensure_connection_pool(max_workers)
+        stopped = threading.Event()
+
+        def call(payload):
+            if stopped.is_set():
+                return None
+            try:
+                if isinstance(payload, dict):
+                    result = service_method(**payload)
+                elif isinstance(payload, (tuple, list)):
+                    result = service_method(*payload)
+                else:
+                    result = service_method(payload)
+                return BulkCallResult(payload, result, None)
+            except (zeep.exceptions.Error, requests.exceptions.RequestException) as e:
+                logging.debug(f"{method_name} failed for {payload}: {e}")
+                if stop_on_fault:
+                    stopped.set()
+                return BulkCallResult(payload, None, e)
+
+        results = []
+        payloads = iter(payloads)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # only keep a bounded number of calls queued so large iterables aren't materialized
+            pending = collections.deque(
+                executor.submit(call, payload)
+                for payload in itertools.islice(payloads, max_workers * 2)
+            )
+            while pending:
+                result = pending.popleft().result()
+                if result is not None:
+                    results.append(result)
+                    if progress is not None:
+                        progress(result)
+                if stopped.is_set():
+                    continue
+                for payload in itertools.islice(payloads, 1):
+                    pending.append(executor.submit(call, payload))
+
+        return results
+
+    def _ensure_connection_pool(self, pool_size):
+        """
+        Makes sure the session keeps at least pool_size connections per host so concurrent
+        calls re-use connections instead of opening new ones.
+        """
+        if pool_size <= self._pool_size:
+            return
+        self._mount_adapter(pool_size)
+        self._pool_size = pool_size
+
+    def _mount_adapter(self, pool_size):
+        if self.cassette is not None:
+            adapter = cassette.CassetteAdapter(
+                self.cassette, pool_connections=pool_size, pool_maxsize=pool_size
+            )
+        else:
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size
+            )
+        self.transport_session.mount("https://", adapter)
+        self.transport_session.mount("http://", adapter)
 
     def print_available_service_methods(self, print_methods=True):
         """
@@ -327,6 +778,249 @@ class Five9Client(zeep.Client):
             print(f"\t{method}")
 
 
+class _Five9OperationProxy(OperationProxy):
+    def __call__(self, *args, **kwargs):
+        cache = self._proxy._client.response_cache
+        if cache is None:
+            return self._send(*args, **kwargs)
+        return cache.call(self._op_name, self._send, args, kwargs)
+
+    def _send(self, *args, **kwargs):
+        coalescer = self._proxy._client.single_flight
+        if coalescer is None:
+            return self._send_now(*args, **kwargs)
+        return coalescer.call(self._op_name, self._send_now, args, kwargs)
+
+    def _send_now(self, *args, **kwargs):
+        try:
+            return super().__call__(*args, **kwargs)
+        finally:
+            self._proxy._client._after_call(self._op_name)
+
+
+class _Five9ServiceProxy(ServiceProxy):
+    def __init__(self, client, binding, **binding_options):
+        super().__init__(client, binding, **binding_options)
+        self._operations = {
+            name: _Five9OperationProxy(self, name) for name in self._binding.all()
+        }
+
+
+class _AsyncFive9OperationProxy(AsyncOperationProxy):
+    async def __call__(self, *args, **kwargs):
+        cache = self._proxy._client.response_cache
+        if cache is None:
+            return await self._send(*args, **kwargs)
+        return await cache.call_async(self._op_name, self._send, args, kwargs)
+
+    async def _send(self, *args, **kwargs):
+        coalescer = self._proxy._client.single_flight
+        if coalescer is None:
+            return await self._send_now(*args, **kwargs)
+        return await coalescer.call_async(self._op_name, self._send_now, args, kwargs)
+
+    async def _send_now(self, *args, **kwargs):
+        await self._proxy._client._before_call(self._op_name)
+        try:
+            return await super().__call__(*args, **kwargs)
+        finally:
+            self._proxy._client._after_call(self._op_name)
+
+
+class _AsyncFive9ServiceProxy(AsyncServiceProxy):
+    def __init__(self, client, binding, **binding_options):
+        super().__init__(client, binding, **binding_options)
+        self._operations = {
+            name: _AsyncFive9OperationProxy(self, name) for name in self._binding.all()
+        }
+
+
+class AsyncFive9Client(Five9Client, zeep.AsyncClient):
+    """
+    An asyncio variant of Five9Client.  Takes the same arguments (credentials, account aliases,
+    host aliases, session type, wsdl_source, rate limiting) but the service methods are
+    coroutines sent over an httpx.AsyncClient, so many calls can be in flight on one thread.
+
+    The WSDL is still loaded synchronously while the client is created.  Because properties can't
+    be awaited, call_counters, vcc_configuration, domain_name and domain_id only return the values
+    of the last ``await client.refresh()`` (or refresh_call_counters/refresh_vcc_configuration).
+
+    Requires httpx.  Use as an async context manager to close the connections:
+
+        async with AsyncFive9Client(account="default_account") as client:
+            skills = await client.service.getSkills()
+
+    Arguments:
+        Same as Five9Client except cassette and lazy_bootstrap, plus
+        max_connections: The maximum number of open connections to the API host. Default is 100. (optional)
+        operation_timeout: Timeout in seconds for a single API call. Default is None (no timeout). (optional)
+    """
+
+    def __init__(self, *args, **kwargs):
+        if httpx is None:
+            raise Five9ClientCreationError("AsyncFive9Client requires httpx, pip install httpx")
+        if kwargs.get("cassette", None):
+            # the calls are sent by httpx, cassettes record requests sessions
+            raise Five9ClientCreationError("Cassettes are only supported by Five9Client")
+
+        self.max_connections = kwargs.get("max_connections", 100)
+        self.operation_timeout = kwargs.get("operation_timeout", None)
+        self._configure_lock = None
+
+        if not kwargs.get("lazy_bootstrap", True):
+            # refresh() is a coroutine and can't run in the constructor
+            raise Five9ClientCreationError(
+                "AsyncFive9Client can't bootstrap during construction, await client.refresh() instead"
+            )
+        super().__init__(*args, **kwargs)
+
+    def _create_transport(self, wsdl_transport):
+        auth = self.transport_session.auth
+        client = httpx.AsyncClient(
+            auth=httpx.BasicAuth(auth.username, auth.password),
+            timeout=self.operation_timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        return zeep.transports.AsyncTransport(client=client)
+
+    def _rate_limit_plugins(self, resync_interval):
+        # throttling waits in _before_call so the event loop isn't blocked
+        self.rate_limit_resync_interval = resync_interval
+        return []
+
+    def bind(self, service_name=None, port_name=None):
+        if not self.wsdl.services:
+            return
+
+        service = self._get_service(service_name)
+        port = self._get_port(service, port_name)
+        return _AsyncFive9ServiceProxy(self, port.binding, **port.binding_options)
+
+    async def _before_call(self, method_name):
+        """
+        Waits for the rate limiter before method_name is sent, reading the call counters first
+        when the limiter is not configured yet.
+        """
+        if self.rate_limiter is None or method_name in rate_limiting.UNTHROTTLED_METHODS:
+            return
+
+        if self.rate_limiter.needs_configuration(self.rate_limit_resync_interval):
+            if self._configure_lock is None:
+                self._configure_lock = asyncio.Lock()
+            async with self._configure_lock:
+                if self.rate_limiter.needs_configuration(self.rate_limit_resync_interval):
+                    try:
+                        await self.refresh_call_counters()
+                    except Exception as e:
+                        # don't block calls when the limits can't be read
+                        logging.warning(f"Unable to read call counters: {e}")
+                        self.rate_limiter.update_from_call_counters([])
+
+        await self.rate_limiter.acquire_async(method_name)
+
+    def _after_call(self, method_name):
+        if self.rate_limiter is None or method_name in rate_limiting.UNTHROTTLED_METHODS:
+            return
+        self.rate_limiter.release(method_name)
+
+    @property
+    def call_counters(self):
+        """
+        Returns the call counters fetched by the last refresh, None before the first refresh.
+        """
+        return self._call_counters
+
+    @property
+    def vcc_configuration(self):
+        """
+        Returns the VCC configuration fetched by the last refresh, None before the first refresh.
+        """
+        return self._vcc_configuration
+
+    @property
+    def current_api_useage_formatted(self):
+        """
+        Returns the call counters of the last refresh formatted like Five9Client.current_api_useage_formatted.
+        """
+        return self._format_call_counters(self._call_counters)
+
+    async def refresh_call_counters(self):
+        if self.sessiontype == "admin":
+            self._call_counters = await self.service.getCallCountersState()
+            if self.rate_limiter is not None:
+                self.rate_limiter.update_from_call_counters(self._call_counters)
+        return self._call_counters
+
+    async def refresh_vcc_configuration(self):
+        if self.sessiontype != "statistics":
+            self._vcc_configuration = await self.service.getVCCConfiguration()
+        return self._vcc_configuration
+
+    async def refresh(self):
+        await self.refresh_call_counters()
+        await self.refresh_vcc_configuration()
+
+    async def map(self, method_name, payloads, max_workers=8, progress=None, stop_on_fault=False):
+        """
+        Coroutine version of Five9Client.map, with at most max_workers calls in flight.  As
+        with Five9Client.map, payloads are read as calls complete and progress is called in
+        payload order.
+
+        Returns:
+            list: A BulkCallResult for every payload, in the order of the payloads.  With
+            stop_on_fault, the payloads that weren't called after a fault are left out.
+        """
+        service_method = getattr(self.service, method_name)
+        semaphore = asyncio.Semaphore(max_workers)
+        stopped = asyncio.Event()
+
+        async def call(payload):
+            async with semaphore:
+                if stopped.is_set():
+                    return None
+                try:
+                    if isinstance(payload, dict):
+                        result = await service_method(**payload)
+                    elif isinstance(payload, (tuple, list)):
+                        result = await service_method(*payload)
+                    else:
+                        result = await service_method(payload)
+                    result = BulkCallResult(payload, result, None)
+                except (zeep.exceptions.Error, httpx.HTTPError) as e:
+                    logging.debug(f"{method_name} failed for {payload}: {e}")
+                    result = BulkCallResult(payload, None, e)
+                    if stop_on_fault:
+                        stopped.set()
+            return result
+
+        results = []
+        payloads = iter(payloads)
+        # only keep a bounded number of calls queued so large iterables aren't materialized
+        pending = collections.deque(
+            asyncio.ensure_future(call(payload))
+            for payload in itertools.islice(payloads, max_workers * 2)
+        )
+        try:
+            while pending:
+                result = await pending.popleft()
+                if result is not None:
+                    results.append(result)
+                    if progress is not None:
+                        progress(result)
+                if stopped.is_set():
+                    continue
+                for payload in itertools.islice(payloads, 1):
+                    pending.append(asyncio.ensure_future(call(payload)))
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return results
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument(
@@ -366,6 +1060,14 @@ if __name__ == "__main__":
         required=False,
     )
 
+    parser.add_argument(
+        "-w",
+        "--wsdlsource",
+        help="remote, bundled or cache, default is remote",
+        choices=wsdl_cache.WSDL_SOURCES,
+        required=False,
+    )
+
     parser.add_argument(
         "-go",
         "--getobjects",
@@ -395,11 +1097,12 @@ if __name__ == "__main__":
     sessiontype = args["sessiontype"] or "admin"
     sessiontype = sessiontype.lower()
     get_objects = args["getobjects"] or None
+    wsdl_source = args["wsdlsource"] or "remote"
 
     logging_level = args["loglevel"] or "INFO"
 
     client = Five9Client(
-        five9username=username, five9password=password, account=account, sessiontype=sessiontype, api_hostname=hostname, api_version=version, logging_level=logging_level
+        five9username=username, five9password=password, account=account, sessiontype=sessiontype, api_hostname=hostname, api_version=version, logging_level=logging_level, wsdl_source=wsdl_source
     )
 
     if get_objects:
@@ -0,0 +1,76 @@
+# unittests for the cassette module, these record from the local stand-in server
+
+import os
+import tempfile
+import unittest
+
+import zeep
+
+from five9 import five9_session
+from five9.utils.cassette import CassetteMissError
+from five9.utils.standin_server import StandInDomain, StandInServer
+
+
+class TestCassette(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.cassette_path = os.path.join(cls.temp_dir.name, "session.cassette")
+
+        with StandInServer(domain=StandInDomain(users=20), wsdl_cache_dir=cls.temp_dir.name) as server:
+            client = cls.client(api_hostname=server.api_hostname, wsdl_source="remote")
+            cls.users = zeep.helpers.serialize_object(client.service.getUsersInfo())
+            cls.raw_users = list(client.raw_call("getUsersInfo", list_fields=("skills",)))
+            try:
+                client.service.getSkill("Missing Skill")
+            except zeep.exceptions.Fault as e:
+                cls.fault = e.message
+            cls.recorded = client.cassette.recorded
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    @classmethod
+    def client(cls, **kwargs):
+        # the stand-in server is stopped when replaying, nothing listens on this port
+        kwargs.setdefault("api_hostname", "http://127.0.0.1:9")
+        return five9_session.Five9Client(
+            five9username="standin",
+            five9password="standin",
+            cassette=cls.cassette_path,
+            wsdl_cache_dir=cls.temp_dir.name,
+            **kwargs,
+        )
+
+    def test_recorded(self):
+        # WSDL, call counters, the three calls
+        self.assertEqual(self.recorded, 5)
+
+    def test_replay_without_a_network(self):
+        client = self.client(wsdl_source="remote")
+        self.assertEqual(client.cassette.mode, "replay")
+        self.assertEqual(zeep.helpers.serialize_object(client.service.getUsersInfo()), self.users)
+        self.assertEqual(
+            list(client.raw_call("getUsersInfo", list_fields=("skills",))), self.raw_users
+        )
+        with self.assertRaises(zeep.exceptions.Fault) as context:
+            client.service.getSkill("Missing Skill")
+        self.assertEqual(context.exception.message, self.fault)
+
+    def test_unrecorded_calls_fail(self):
+        client = self.client(wsdl_source="bundled")
+        with self.assertRaises(CassetteMissError):
+            client.service.getCampaigns()
+
+    def test_latency(self):
+        client = self.client(wsdl_source="bundled", cassette_latency=0.01)
+        waits = []
+        client.cassette.sleep = waits.append
+        client.service.getUsersInfo()
+        # the call counters are read before the first call
+        self.assertEqual(waits, [0.01, 0.01])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,366 @@
+# unittests for the domain_capture module against the local stand-in server
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+from five9 import five9_session
+from five9.utils.domain_capture import METHODS, Five9DomainConfig
+from five9.utils import snapshot_json
+from five9.utils.capture_journal import CaptureJournal
+from five9.utils.domain_index import VARIABLE
+from five9.utils.ivr_utils import ivr_variable_usage
+from five9.utils.snapshot_archive import SnapshotArchive
+from five9.utils.snapshot_loader import LazyObjects
+from five9.utils.standin_server import StandInDomain, StandInServer
+
+
+def read_snapshot(domain_path):
+    snapshot = {}
+    for directory, directories, files in os.walk(domain_path):
+        directories[:] = [name for name in directories if name != ".git"]
+        for name in files:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as snapshot_file:
+                snapshot[os.path.relpath(path, domain_path)] = snapshot_file.read()
+    return snapshot
+
+
+class TestDomainCaptureOffline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.wsdl_cache_dir = tempfile.TemporaryDirectory()
+        cls.server = StandInServer(
+            domain=StandInDomain(users=10, campaigns=30, campaign_profiles=6, ivr_scripts=5),
+            rate_limits=None,
+            wsdl_cache_dir=cls.wsdl_cache_dir.name,
+        ).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        cls.wsdl_cache_dir.cleanup()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def capture(self, **kwargs):
+        client = five9_session.Five9Client(
+            five9username="standin",
+            five9password="standin",
+            api_hostname=self.server.api_hostname,
+            wsdl_source="bundled",
+            wsdl_cache_dir=self.wsdl_cache_dir.name,
+            logging_level="WARNING",
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            domain_config = Five9DomainConfig(
+                client=client, methods=list(METHODS), **kwargs
+            )
+            domain_config.get_domain_objects()
+        return domain_config
+
+    def test_parallel_capture_matches_sequential_capture(self):
+        sequential = self.capture(max_workers=1)
+        sequential_snapshot = read_snapshot(sequential.domain_path)
+        parallel = self.capture(max_workers=8)
+        parallel_snapshot = read_snapshot(parallel.domain_path)
+
+        self.assertIn(os.path.join("campaigns_outbound", "Campaign 001.json"), parallel_snapshot)
+        self.assertIn(os.path.join("campaign_profile_filters", "Profile 000.json"), parallel_snapshot)
+        self.assertEqual(parallel_snapshot, sequential_snapshot)
+        self.assertEqual(
+            list(parallel.domain_objects["getCampaigns_campaigns_outbound"]),
+            list(sequential.domain_objects["getCampaigns_campaigns_outbound"]),
+        )
+
+    def test_detail_calls_stop_after_a_fault(self):
+        calls = self.server.calls["getOutboundCampaign"]
+        self.server.faults = {"getOutboundCampaign": "Unavailable"}
+        try:
+            domain_config = self.capture(max_workers=2)
+        finally:
+            self.server.faults = {}
+        # the calls in flight when the fault arrived, not one per campaign
+        self.assertLessEqual(self.server.calls["getOutboundCampaign"] - calls, 4)
+        self.assertEqual(domain_config.domain_objects["getCampaigns_campaigns_outbound"], {})
+
+    def test_incremental_capture_only_writes_changes(self):
+        full = read_snapshot(self.capture().domain_path)
+
+        unchanged = self.capture(incremental=True)
+        self.assertEqual(unchanged.snapshot_files.changed, set())
+        self.assertEqual(unchanged.snapshot_files.removed, set())
+
+        domain = self.server.domain
+        campaigns = dict(domain.campaigns)
+        try:
+            domain.campaigns["Campaign 001"] = dict(campaigns["Campaign 001"], description="Changed")
+            del domain.campaigns["Campaign 004"]
+            changed = self.capture(incremental=True)
+        finally:
+            domain.campaigns = campaigns
+        self.assertEqual(
+            changed.snapshot_files.changed,
+            {"getCampaigns.json", "campaigns_outbound/Campaign 001.json"},
+        )
+        self.assertEqual(changed.snapshot_files.removed, {"campaigns_outbound/Campaign 004.json"})
+        # only the changed files were staged, the commit holds all of them
+        self.assertTrue(changed.snapshot_files.in_sync)
+        self.assertEqual(changed.repo.git.status("--porcelain"), "")
+        self.assertEqual(
+            set(changed.repo.git.diff("--name-status", "HEAD~1", "HEAD").splitlines()),
+            {
+                "M\tgetCampaigns.json",
+                "M\tcampaigns_outbound/Campaign 001.json",
+                "D\tcampaigns_outbound/Campaign 004.json",
+            },
+        )
+
+        # the same files as a full capture
+        restored = self.capture(incremental=True)
+        self.assertEqual(read_snapshot(restored.domain_path), full)
+        self.assertEqual(
+            restored.snapshot_files.changed,
+            {
+                "getCampaigns.json",
+                "campaigns_outbound/Campaign 001.json",
+                "campaigns_outbound/Campaign 004.json",
+            },
+        )
+        self.assertEqual(restored.repo.git.status("--porcelain"), "")
+
+    def test_archive_capture_matches_file_capture(self):
+        files = read_snapshot(self.capture().domain_path)
+        archived = self.capture(snapshot_format="archive")
+        self.assertEqual(os.listdir(os.path.dirname(archived.archive_path)), [os.path.basename(archived.archive_path)])
+        with SnapshotArchive(archived.archive_path) as archive:
+            self.assertEqual(archive.metadata["domain_name"], "Stand-in Domain")
+            self.assertEqual(
+                {path: archive.read_bytes(path) for path in archive},
+                {path.replace(os.sep, "/"): content for path, content in files.items()},
+            )
+
+    def test_load_snapshot_without_a_client(self):
+        captured = self.capture()
+        files = read_snapshot(captured.domain_path)
+        expected = json.loads(snapshot_json.dumps(captured.domain_objects))
+        archive_path = self.capture(snapshot_format="archive").archive_path
+
+        for snapshot_path in (captured.domain_path, archive_path):
+            with contextlib.redirect_stdout(io.StringIO()):
+                loaded = Five9DomainConfig.from_snapshot(snapshot_path)
+            self.assertIsNone(loaded.client)
+            self.assertEqual(loaded.domain_name, "Stand-in Domain")
+            self.assertEqual(set(loaded.domain_objects), set(expected))
+
+            campaigns = loaded.domain_objects["getCampaigns_campaigns_outbound"]
+            self.assertFalse(campaigns.is_loaded("Campaign 001"))
+            self.assertEqual(campaigns["Campaign 001"], expected["getCampaigns_campaigns_outbound"]["Campaign 001"])
+            self.assertTrue(campaigns.is_loaded("Campaign 001"))
+            self.assertFalse(campaigns.is_loaded("Campaign 004"))
+            self.assertFalse(loaded.domain_objects.is_loaded("getSkills"))
+
+            self.assertEqual(json.loads(snapshot_json.dumps(loaded.domain_objects)), expected)
+
+        # analysis runs offline, from the archive it writes to the same folder as a capture
+        with contextlib.redirect_stdout(io.StringIO()):
+            loaded.demystify_campaign_profile_filters()
+        loaded.snapshot.close()
+        self.assertEqual(read_snapshot(captured.domain_path), files)
+
+    def test_incremental_captures_on_the_same_instance(self):
+        domain_config = self.capture(incremental=True)
+        domain = self.server.domain
+        campaigns = dict(domain.campaigns)
+        try:
+            del domain.campaigns["Campaign 001"]
+            with contextlib.redirect_stdout(io.StringIO()):
+                domain_config.get_domain_objects()
+        finally:
+            domain.campaigns = campaigns
+        self.assertFalse(
+            os.path.exists(os.path.join(domain_config.domain_path, "campaigns_outbound", "Campaign 001.json"))
+        )
+        self.assertEqual(domain_config.snapshot_files.removed, {"campaigns_outbound/Campaign 001.json"})
+        self.assertEqual(domain_config.snapshot_files.changed, {"getCampaigns.json"})
+        self.assertTrue(domain_config.snapshot_files.in_sync)
+        self.assertEqual(domain_config.repo.git.status("--porcelain"), "")
+
+    def test_incremental_capture_after_an_uncommitted_capture(self):
+        self.capture(incremental=True)
+        domain_path = self.capture(incremental=True).domain_path
+        # a capture that stopped before its commit
+        with open(os.path.join(domain_path, "getSkills.json"), "a") as snapshot_file:
+            snapshot_file.write("\n")
+        with open(os.path.join(domain_path, ".git", "five9_snapshot_uncommitted"), "w"):
+            pass
+
+        recovered = self.capture(incremental=True)
+        self.assertFalse(recovered.snapshot_files.in_sync)
+        self.assertEqual(recovered.repo.git.status("--porcelain"), "")
+        self.assertTrue(self.capture(incremental=True).snapshot_files.in_sync)
+
+    def test_changed_details_only_reads_changed_details(self):
+        full = self.capture(incremental=True)
+        details = full.detail_calls
+        self.assertEqual(full.details_reused, 0)
+
+        unchanged = self.capture(incremental=True, changed_details_only=True)
+        self.assertEqual(unchanged.detail_calls + unchanged.details_reused, details)
+        # only the rotating share due for a refresh is read
+        self.assertLess(unchanged.detail_calls, details / 4)
+        self.assertEqual(unchanged.snapshot_files.changed, set())
+        self.assertEqual(unchanged.domain_objects, full.domain_objects)
+
+        domain = self.server.domain
+        campaigns = dict(domain.campaigns)
+        try:
+            domain.campaigns["Campaign 001"] = dict(campaigns["Campaign 001"], description="Changed")
+            changed = self.capture(incremental=True, changed_details_only=True)
+        finally:
+            domain.campaigns = campaigns
+        self.assertEqual(
+            changed.snapshot_files.changed,
+            {"getCampaigns.json", "campaigns_outbound/Campaign 001.json"},
+        )
+        self.assertEqual(
+            changed.domain_objects["getCampaigns_campaigns_outbound"]["Campaign 001"]["description"], "Changed"
+        )
+        self.assertEqual(
+            list(changed.domain_objects["getCampaigns_campaigns_outbound"]),
+            list(full.domain_objects["getCampaigns_campaigns_outbound"]),
+        )
+
+        every_capture = self.capture(incremental=True, changed_details_only=True, detail_refresh_period=1)
+        self.assertEqual(every_capture.details_reused, 0)
+
+        self.capture(snapshot_format="archive")
+        archived = self.capture(snapshot_format="archive", changed_details_only=True)
+        self.assertGreater(archived.details_reused, 0)
+        with SnapshotArchive(archived.archive_path) as archive:
+            self.assertEqual(
+                json.loads(archive.read("campaigns_outbound/Campaign 001.json")),
+                full.domain_objects["getCampaigns_campaigns_outbound"]["Campaign 001"],
+            )
+
+    def test_resume_an_interrupted_capture(self):
+        full = self.capture()
+        files = read_snapshot(full.domain_path)
+        journal_path = os.path.join(full.domain_path, ".git", "five9_capture_journal.jsonl")
+        self.assertFalse(os.path.exists(journal_path))
+
+        # a method that faults is left for the resumed capture
+        self.server.faults = {"getInboundCampaign": "Unavailable"}
+        try:
+            failed = self.capture()
+        finally:
+            self.server.faults = {}
+        self.assertTrue(os.path.exists(journal_path))
+        calls = dict(self.server.calls)
+        resumed = self.capture(resume=True)
+        self.assertEqual(self.server.calls["getSkills"], calls["getSkills"])
+        self.assertEqual(self.server.calls["getOutboundCampaign"], calls["getOutboundCampaign"])
+        self.assertEqual(resumed.details_resumed, len(failed.domain_objects["getCampaigns_campaigns_outbound"]))
+        self.assertEqual(resumed.domain_objects, full.domain_objects)
+        self.assertEqual(read_snapshot(resumed.domain_path), files)
+        self.assertFalse(os.path.exists(journal_path))
+        self.assertEqual(resumed.repo.git.status("--porcelain"), "")
+
+        # an archive capture stopped by a network error
+        with mock.patch.object(
+            Five9DomainConfig, "demystify_campaign_profile_filters", side_effect=ConnectionError("dropped")
+        ):
+            with self.assertRaises(ConnectionError):
+                self.capture(snapshot_format="archive")
+        self.assertEqual(os.listdir(os.path.join("domain_archives", "Stand-in Domain")), ["five9_capture_journal.jsonl"])
+        # the contents are in the journal file, only their offsets are kept
+        with CaptureJournal(
+            os.path.join("domain_archives", "Stand-in Domain", "five9_capture_journal.jsonl"),
+            keep_contents=True,
+            resume=True,
+        ) as journal:
+            self.assertTrue(all(isinstance(offset, int) for offset in journal.files.values()))
+            self.assertEqual(journal.read("getDialingRules.json").encode("utf-8"), files["getDialingRules.json"])
+        calls = dict(self.server.calls)
+        resumed = self.capture(snapshot_format="archive", resume=True)
+        self.assertEqual(self.server.calls["getCampaignProfileFilter"], calls["getCampaignProfileFilter"])
+        self.assertEqual(self.server.calls["getDialingRules"], calls["getDialingRules"])
+        with SnapshotArchive(resumed.archive_path) as archive:
+            self.assertEqual(
+                {relative_path: archive.read_bytes(relative_path) for relative_path in archive},
+                {relative_path.replace(os.sep, "/"): content for relative_path, content in files.items()},
+            )
+
+    def test_streaming_capture_reads_objects_back(self):
+        full = self.capture()
+        files = read_snapshot(full.domain_path)
+        expected = json.loads(snapshot_json.dumps(full.domain_objects))
+
+        streamed = self.capture(streaming=True)
+        self.assertEqual(read_snapshot(streamed.domain_path), files)
+        campaigns = streamed.domain_objects["getCampaigns_campaigns_outbound"]
+        self.assertEqual(list(campaigns), list(expected["getCampaigns_campaigns_outbound"]))
+        self.assertEqual(campaigns["Campaign 001"], expected["getCampaigns_campaigns_outbound"]["Campaign 001"])
+        # read back, not kept
+        self.assertFalse(campaigns.is_loaded("Campaign 001"))
+        self.assertEqual(json.loads(snapshot_json.dumps(streamed.domain_objects)), expected)
+
+        archived = self.capture(snapshot_format="archive", streaming=True)
+        self.assertEqual(json.loads(snapshot_json.dumps(archived.domain_objects)), expected)
+        self.assertEqual(archived.snapshot.path, archived.archive_path)
+        archived.snapshot.close()
+
+    def test_streaming_archive_capture_keeps_no_contents(self):
+        journal_files = []
+        finish_journal = Five9DomainConfig._finish_journal
+
+        def record_journal(domain_config, methods):
+            journal_files.append(dict(domain_config.capture_journal.files))
+            return finish_journal(domain_config, methods)
+
+        with mock.patch.object(Five9DomainConfig, "_finish_journal", record_journal):
+            archived = self.capture(snapshot_format="archive", streaming=True)
+        self.addCleanup(archived.snapshot.close)
+
+        # the journal keeps the offsets of the contents in its file
+        self.assertIn("campaigns_outbound/Campaign 001.json", journal_files[0])
+        self.assertTrue(all(isinstance(offset, int) for offset in journal_files[0].values()))
+
+        domain_objects = archived.domain_objects
+        details = 0
+        for key in list(domain_objects):
+            if not domain_objects.is_loaded(key):
+                continue
+            # the detail objects, every one read back from the archive when used
+            objects = domain_objects[key]
+            self.assertIsInstance(objects, LazyObjects)
+            self.assertFalse(any(objects.is_loaded(name) for name in objects))
+            details += len(objects)
+        self.assertGreater(details, 0)
+
+    def test_cross_reference_index(self):
+        captured = self.capture()
+        with contextlib.redirect_stdout(io.StringIO()):
+            index = captured.cross_reference_index()
+            self.assertEqual(captured.cross_reference_index().files_read, 0)
+        ivrs = [types.SimpleNamespace(**ivr) for ivr in captured.domain_objects["getIVRScripts_ivrs"].values()]
+        usage = ivr_variable_usage(ivrs)
+        self.assertEqual(index.names(VARIABLE), list(usage))
+        for variable, ivr_names in usage.items():
+            self.assertEqual(index.used_by(VARIABLE, variable), {("getIVRScripts_ivrs", name) for name in ivr_names})
+
+
+if __name__ == "__main__":
+    unittest.main()
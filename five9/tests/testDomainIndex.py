@@ -0,0 +1,119 @@
+# unittests for the domain_index module, these run without a Five9 domain
+
+import os
+import tempfile
+import unittest
+
+from five9.utils import snapshot_json
+from five9.utils.domain_capture import Five9DomainConfig
+from five9.utils.domain_index import CONTACT_FIELD, PROMPT, SKILL, VARIABLE, DomainIndex
+
+
+MAIN_MENU = (
+    "<ivrScript><modules>"
+    "<skillTransfer><moduleName>ToSales</moduleName><data><listOfSkillsEx>"
+    "<extrnalObj><id>1</id><name>Sales</name></extrnalObj><varSelected>false</varSelected>"
+    "</listOfSkillsEx></data></skillTransfer>"
+    "<play><moduleName>Greeting</moduleName><prompt><filePrompt><promptData>"
+    "<prompt><id>7</id><name>Welcome</name></prompt>"
+    "</promptData></filePrompt></prompt></play>"
+    "<setVariables><variableName>Custom.account</variableName><variableName>ignored</variableName></setVariables>"
+    "</modules></ivrScript>"
+)
+
+FILES = {
+    "ivrs/Main Menu.json": {"name": "Main Menu", "description": "", "xmlDefinition": MAIN_MENU},
+    "ivrs/Closed.json": {"name": "Closed", "description": "", "xmlDefinition": "<ivrScript><modules/></ivrScript>"},
+    "campaigns_inbound/Support.json": {
+        "name": "Support",
+        "profileName": None,
+        "defaultIvrSchedule": {"ivrSchedule": {"name": None, "scriptName": "Main Menu", "scriptParameters": []}},
+    },
+    "campaigns_outbound/Renewals.json": {"name": "Renewals", "profileName": "Profile A"},
+    "campaign_profile_filters/Profile A.json": {
+        "crmCriteria": [{"compareOperator": "Equals", "leftValue": "state", "rightValue": "CA"}],
+        "grouping": {"expression": None, "type": "All"},
+        "orderByFields": [{"descending": False, "fieldName": "last_name", "rank": 1}],
+    },
+    "getUserProfiles.json": [{"name": "Agents", "skills": ["Sales", "Support"]}],
+    "getSkills.json": [{"name": "Sales"}, {"name": "Support"}],
+}
+
+
+def write_files(root, files):
+    for relative_path, value in files.items():
+        path = os.path.join(root, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as snapshot_file:
+            snapshot_file.write(snapshot_json.dumps(value))
+
+
+class TestDomainIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.temp_dir.name, "My Domain")
+        write_files(self.root, FILES)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_used_by(self):
+        index = DomainIndex.build(self.root)
+        self.assertEqual(
+            index.used_by(SKILL, "Sales"),
+            {("getIVRScripts_ivrs", "Main Menu"), ("getUserProfiles", "Agents")},
+        )
+        # the campaign running the IVR script
+        self.assertEqual(
+            index.used_by(SKILL, "Sales", transitive=True) - index.used_by(SKILL, "Sales"),
+            {("getCampaigns_campaigns_inbound", "Support")},
+        )
+        self.assertEqual(index.used_by(PROMPT, "Welcome"), {("getIVRScripts_ivrs", "Main Menu")})
+        self.assertEqual(
+            index.used_by(CONTACT_FIELD, "state", transitive=True),
+            {("getCampaignProfiles_campaign_profile_filters", "Profile A"), ("getCampaigns_campaigns_outbound", "Renewals")},
+        )
+        self.assertEqual(index.names(VARIABLE), ["Custom.account"])
+        self.assertEqual(index.used_by(SKILL, "Unknown"), set())
+
+        # the same index from the domain_objects of a capture
+        live = Five9DomainConfig.__new__(Five9DomainConfig)
+        live.domain_objects = {
+            "getIVRScripts_ivrs": {name: FILES[f"ivrs/{name}.json"] for name in ("Main Menu", "Closed")},
+            "getCampaigns_campaigns_inbound": {"Support": FILES["campaigns_inbound/Support.json"]},
+            "getCampaigns_campaigns_outbound": {"Renewals": FILES["campaigns_outbound/Renewals.json"]},
+            "getCampaignProfiles_campaign_profile_filters": {"Profile A": FILES["campaign_profile_filters/Profile A.json"]},
+            "getUserProfiles": FILES["getUserProfiles.json"],
+        }
+        live_index = DomainIndex.build(live)
+        self.assertEqual(live_index.used_by(SKILL, "Sales", transitive=True), index.used_by(SKILL, "Sales", transitive=True))
+        self.assertEqual(live_index.used_by(CONTACT_FIELD, "last_name"), index.used_by(CONTACT_FIELD, "last_name"))
+
+    def test_incremental_update_and_persistence(self):
+        index_path = os.path.join(self.temp_dir.name, "index.json")
+        index = DomainIndex.build(self.root)
+        self.assertEqual(index.files_read, 6)
+        index.save(index_path)
+
+        loaded = DomainIndex.load(index_path)
+        self.assertEqual(loaded.used_by(SKILL, "Sales", transitive=True), index.used_by(SKILL, "Sales", transitive=True))
+        self.assertEqual(loaded.update(self.root).files_read, 0)
+
+        write_files(self.root, {"ivrs/Main Menu.json": dict(FILES["ivrs/Main Menu.json"], xmlDefinition="<ivrScript/>")})
+        os.remove(os.path.join(self.root, "campaigns_outbound", "Renewals.json"))
+        loaded.update(self.root)
+        self.assertEqual(loaded.files_read, 1)
+        self.assertEqual(loaded.used_by(SKILL, "Sales"), {("getUserProfiles", "Agents")})
+        self.assertEqual(loaded.used_by(PROMPT, "Welcome"), set())
+        self.assertEqual(
+            loaded.used_by(CONTACT_FIELD, "state", transitive=True),
+            {("getCampaignProfiles_campaign_profile_filters", "Profile A")},
+        )
+        self.assertEqual(
+            loaded.used_by(SKILL, "Sales", transitive=True),
+            DomainIndex.build(self.root).used_by(SKILL, "Sales", transitive=True),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# unittests for the fleet_capture module, against stand-in servers
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from five9.utils.fleet_capture import capture_fleet, fleet_aliases
+from five9.utils.standin_server import StandInDomain, StandInServer
+
+
+class TestFleetCapture(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.wsdl_cache_dir = tempfile.TemporaryDirectory()
+        cls.servers = {
+            alias: StandInServer(
+                domain=StandInDomain(users=5, campaigns=10, campaign_profiles=3, ivr_scripts=2, domain_name=name),
+                wsdl_cache_dir=cls.wsdl_cache_dir.name,
+            ).start()
+            for alias, name in (("tenant_a", "Tenant A"), ("tenant_b", "Tenant B"))
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers.values():
+            server.stop()
+        cls.wsdl_cache_dir.cleanup()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        self.accounts = {
+            alias: {"username": "standin", "password": "standin", "api_hostname": server.api_hostname}
+            for alias, server in self.servers.items()
+        }
+        self.accounts["default_account"] = {"username": "apiUserUsername", "password": "apiUserPassword"}
+        # another alias of the same domain
+        self.accounts["tenant_a_copy"] = dict(self.accounts["tenant_a"])
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def test_fleet_aliases_skip_placeholders(self):
+        self.assertEqual(fleet_aliases(self.accounts), ["tenant_a", "tenant_b", "tenant_a_copy"])
+
+    def test_capture_fleet(self):
+        aliases = ["tenant_a", "tenant_b", "default_account", "tenant_a_copy"]
+        list_calls = {alias: server.calls["getCampaigns"] for alias, server in self.servers.items()}
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            captures = capture_fleet(
+                aliases=aliases,
+                accounts=self.accounts,
+                client_kwargs={
+                    "wsdl_source": "bundled",
+                    "wsdl_cache_dir": self.wsdl_cache_dir.name,
+                    "logging_level": "WARNING",
+                },
+            )
+        self.assertEqual([capture.alias for capture in captures], aliases)
+        self.assertEqual(output.getvalue().count("/4] "), 4)
+
+        for capture, domain_name in zip(captures, ("Tenant A", "Tenant B")):
+            self.assertIsNone(capture.error, capture.error)
+            self.assertEqual(capture.domain_name, domain_name)
+            self.assertEqual(capture.faults, 0)
+            self.assertGreater(capture.calls, 0)
+            # every listed campaign and its detail file, not the number of methods
+            domain_path = os.path.join("domain_snapshots", domain_name)
+            detail_files = sum(
+                len(os.listdir(os.path.join(domain_path, name)))
+                for name in os.listdir(domain_path)
+                if os.path.isdir(os.path.join(domain_path, name)) and name != ".git"
+            )
+            self.assertGreaterEqual(capture.objects, 10 + detail_files)
+            self.assertTrue(os.path.exists(os.path.join("domain_snapshots", domain_name, "getCampaigns.json")))
+            self.assertTrue(os.path.exists(capture.log_path))
+
+        # not launched, it would prompt for credentials
+        self.assertIn("No credentials", captures[2].error)
+
+        # the domain of tenant_a is only captured once
+        self.assertEqual(
+            self.servers["tenant_a"].calls["getCampaigns"] - list_calls["tenant_a"],
+            self.servers["tenant_b"].calls["getCampaigns"] - list_calls["tenant_b"],
+        )
+        self.assertEqual(captures[3].same_domain_as, "tenant_a")
+        self.assertEqual(captures[3].domain_name, "Tenant A")
+        self.assertEqual(captures[3].objects, captures[0].objects)
+        self.assertEqual(captures[3].calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# unittests for the history module, these run without a Five9 domain
+
+import concurrent.futures
+import unittest
+from types import SimpleNamespace
+
+from lxml import etree
+
+from five9.utils.history import Five9HistoryPlugin, format_envelope
+
+
+def exchange(plugin, name):
+    operation = SimpleNamespace(name=name)
+    plugin.egress(etree.Element(f"{name}Request"), {}, operation, {})
+    plugin.ingress(etree.Element(f"{name}Response"), {}, operation)
+
+
+class TestHistory(unittest.TestCase):
+    def test_keeps_the_last_exchange_by_default(self):
+        plugin = Five9HistoryPlugin()
+        self.assertIsNone(plugin.last_sent)
+        exchange(plugin, "getSkills")
+        exchange(plugin, "getCampaigns")
+        self.assertEqual(len(plugin.exchanges), 1)
+        self.assertEqual(plugin.last_sent["envelope"].tag, "getCampaignsRequest")
+        self.assertEqual(plugin.last_received["envelope"].tag, "getCampaignsResponse")
+
+    def test_ring_buffer(self):
+        plugin = Five9HistoryPlugin(maxlen=3)
+        for i in range(10):
+            exchange(plugin, f"call{i}")
+        self.assertEqual(
+            [item["operation"] for item in plugin.exchanges], ["call7", "call8", "call9"]
+        )
+
+    def test_disabled(self):
+        plugin = Five9HistoryPlugin(maxlen=0)
+        exchange(plugin, "getSkills")
+        self.assertEqual(plugin.exchanges, [])
+        self.assertIsNone(plugin.last_received)
+
+    def test_sampling(self):
+        plugin = Five9HistoryPlugin(maxlen=None, sample_every=4)
+        for i in range(1, 13):
+            exchange(plugin, f"call{i}")
+        self.assertEqual(
+            [item["operation"] for item in plugin.exchanges], ["call4", "call8", "call12"]
+        )
+
+    def test_concurrent_responses_match_their_requests(self):
+        plugin = Five9HistoryPlugin(maxlen=None)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda i: exchange(plugin, f"call{i}"), range(200)))
+        for item in plugin.exchanges:
+            self.assertEqual(
+                item["received"]["envelope"].tag, f"{item['operation']}Response"
+            )
+
+    def test_format_envelope(self):
+        envelope = etree.fromstring("<a><b>1</b></a>")
+        self.assertEqual(format_envelope(envelope), "<a>\n  <b>1</b>\n</a>\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# unittests for the metrics module, these run without a Five9 domain
+
+import unittest
+from types import SimpleNamespace
+
+from lxml import etree
+
+from five9.utils.metrics import MetricsPlugin, format_prometheus, percentile
+
+SOAP_ENV = "http://schemas.xmlsoap.org/soap/envelope/"
+
+
+def envelope(child_tag):
+    root = etree.Element(f"{{{SOAP_ENV}}}Envelope")
+    body = etree.SubElement(root, f"{{{SOAP_ENV}}}Body")
+    etree.SubElement(body, child_tag)
+    return root
+
+
+def exchange(plugin, name, response_tag=None, http_headers=None):
+    operation = SimpleNamespace(name=name)
+    plugin.egress(envelope(f"{name}Request"), {}, operation, {})
+    plugin.ingress(
+        envelope(response_tag or f"{name}Response"), http_headers or {}, operation
+    )
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counts_calls_and_faults(self):
+        plugin = MetricsPlugin()
+        exchange(plugin, "getSkills")
+        exchange(plugin, "getSkills", response_tag=f"{{{SOAP_ENV}}}Fault")
+        exchange(plugin, "getCampaigns")
+        metrics = plugin.snapshot()
+        self.assertEqual(list(metrics), ["getCampaigns", "getSkills"])
+        self.assertEqual(metrics["getSkills"]["calls"], 2)
+        self.assertEqual(metrics["getSkills"]["faults"], 1)
+        self.assertEqual(metrics["getSkills"]["latency_seconds"]["count"], 2)
+        self.assertEqual(metrics["getCampaigns"]["faults"], 0)
+
+    def test_envelope_sizes(self):
+        plugin = MetricsPlugin()
+        exchange(plugin, "getSkills", http_headers={"Content-Length": "1234"})
+        metrics = plugin.snapshot()["getSkills"]
+        self.assertEqual(
+            metrics["request_bytes"], len(etree.tostring(envelope("getSkillsRequest")))
+        )
+        self.assertEqual(metrics["response_bytes"], 1234)
+
+        plugin = MetricsPlugin(measure_bytes=False)
+        exchange(plugin, "getSkills")
+        self.assertEqual(plugin.snapshot()["getSkills"]["request_bytes"], 0)
+
+    def test_percentile(self):
+        values = list(range(101))
+        self.assertIsNone(percentile([], 0.5))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([1.0, 2.0], 0.5), 1.5)
+
+    def test_prometheus_format(self):
+        plugin = MetricsPlugin()
+        exchange(plugin, "getSkills")
+        text = format_prometheus(plugin.snapshot())
+        self.assertIn('five9_soap_calls_total{operation="getSkills"} 1', text)
+        self.assertIn(
+            'five9_soap_latency_seconds_bucket{operation="getSkills",le="+Inf"} 1', text
+        )
+        self.assertIn('five9_soap_latency_seconds_count{operation="getSkills"} 1', text)
+
+    def test_reset(self):
+        plugin = MetricsPlugin()
+        exchange(plugin, "getSkills")
+        plugin.reset()
+        self.assertEqual(plugin.snapshot(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+# unittests for the rate_limiting module, these run without a Five9 domain
+
+import unittest
+
+from five9.utils.rate_limiting import (
+    RateLimiter,
+    SlidingWindow,
+    operation_type_for_method,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+CALL_COUNTERS = [
+    {
+        "timeout": 1,
+        "callCounterStates": [
+            {"operationType": "Query", "limit": 2, "value": 0},
+            {"operationType": "Modify", "limit": 1, "value": 0},
+        ],
+    },
+    {
+        "timeout": 60,
+        "callCounterStates": [
+            {"operationType": "Query", "limit": 60, "value": 58},
+        ],
+    },
+]
+
+
+class TestRateLimiting(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.rate_limiter = RateLimiter(clock=self.clock, sleep=self.clock.sleep)
+        self.rate_limiter.update_from_call_counters(CALL_COUNTERS)
+
+    def test_operation_types(self):
+        self.assertEqual(operation_type_for_method("getUsersInfo"), "Query")
+        self.assertEqual(operation_type_for_method("isImportRunning"), "Query")
+        self.assertEqual(operation_type_for_method("modifyUser"), "Modify")
+        self.assertEqual(operation_type_for_method("userSkillAdd"), "Modify")
+        self.assertEqual(operation_type_for_method("runReport"), "ReportRequest")
+        self.assertEqual(
+            operation_type_for_method("modifyUser", {"modifyUser": "Upload"}), "Upload"
+        )
+
+    def test_sliding_window(self):
+        window = SlidingWindow(10, 10, used=10, clock=self.clock)
+        self.assertAlmostEqual(window.wait_time(), 10.0)
+        self.clock.now = 10
+        self.assertEqual(window.available, 10)
+        for _ in range(10):
+            window.consume()
+            window.complete()
+        self.clock.now = 19
+        self.assertAlmostEqual(window.wait_time(), 1.0)
+        self.clock.now = 20
+        self.assertEqual(window.wait_time(), 0.0)
+
+    def call(self, method_name, duration=0.0):
+        waited = self.rate_limiter.acquire(method_name)
+        self.clock.now += duration
+        self.rate_limiter.release(method_name)
+        return waited
+
+    def test_calls_are_timed_from_their_response(self):
+        window = SlidingWindow(1, 10, clock=self.clock)
+        window.consume()
+        self.clock.now = 30
+        # still in flight, Five9 may not have counted it yet
+        self.assertGreater(window.wait_time(), 0)
+        window.complete()
+        self.assertAlmostEqual(window.wait_time(), 10.0)
+
+    def test_never_exceeds_the_limit_in_any_window(self):
+        calls = []
+        for _ in range(20):
+            self.call("modifyUser", duration=0.25)
+            calls.append(self.clock.now)
+        for start in calls:
+            self.assertLessEqual(len([t for t in calls if start <= t < start + 1]), 1)
+
+    def test_acquire_without_waiting_while_tokens_remain(self):
+        self.assertEqual(self.call("getSkills"), 0.0)
+        self.assertEqual(self.call("getSkills"), 0.0)
+
+    def test_acquire_waits_for_the_tightest_window(self):
+        # the 60 second window only had 2 calls left
+        self.call("getSkills")
+        self.call("getSkills")
+        self.assertAlmostEqual(self.call("getSkills"), 60.0)
+
+    def test_operation_types_are_independent(self):
+        self.call("modifyUser")
+        self.assertEqual(self.call("getSkills"), 0.0)
+        self.assertAlmostEqual(self.call("modifyUser"), 1.0)
+
+    def test_unlimited_operation_types_are_not_throttled(self):
+        for _ in range(100):
+            self.assertEqual(self.rate_limiter.acquire("runReport"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+# unittests for the raw_xml module, these run without a Five9 domain
+
+import io
+import unittest
+
+from zeep.exceptions import Fault
+
+from five9.utils.raw_xml import iter_records
+
+ENVELOPE = (
+    '<env:Envelope xmlns:env="http://schemas.xmlsoap.org/soap/envelope/" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"><env:Body>{}</env:Body></env:Envelope>'
+)
+
+USERS_RESPONSE = ENVELOPE.format(
+    '<ns2:getUsersInfoResponse xmlns:ns2="http://service.admin.ws.five9.com/">'
+    "<return><agentGroups>A</agentGroups><agentGroups>B</agentGroups>"
+    "<generalInfo><id>1</id><userName>one</userName><osLogin/>"
+    '<federationId xsi:nil="true"/></generalInfo>'
+    "<skills><id>10</id><skillName>Sales</skillName></skills></return>"
+    "<return><generalInfo><id>2</id><userName>two</userName></generalInfo></return>"
+    "</ns2:getUsersInfoResponse>"
+)
+
+CONTACTS_RESPONSE = ENVELOPE.format(
+    '<ns2:getContactRecordsResponse xmlns:ns2="http://service.admin.ws.five9.com/">'
+    "<return><fields>number1</fields><fields>first_name</fields>"
+    "<records><values><data>5551234567</data><data>Ann</data></values></records>"
+    "<records><values><data>5557654321</data><data>Bob</data></values></records>"
+    "</return></ns2:getContactRecordsResponse>"
+)
+
+FAULT_RESPONSE = ENVELOPE.format(
+    "<env:Fault><faultcode>env:Server</faultcode>"
+    "<faultstring>User not found</faultstring></env:Fault>"
+)
+
+
+def records(response, **kwargs):
+    return list(iter_records(io.BytesIO(response.encode("utf-8")), **kwargs))
+
+
+class TestRawXml(unittest.TestCase):
+    def test_records_as_dicts(self):
+        users = records(USERS_RESPONSE, list_fields=("skills",))
+        self.assertEqual(len(users), 2)
+        self.assertEqual(users[0]["agentGroups"], ["A", "B"])
+        self.assertEqual(
+            users[0]["generalInfo"],
+            {"id": "1", "userName": "one", "osLogin": "", "federationId": None},
+        )
+        self.assertEqual(users[0]["skills"], [{"id": "10", "skillName": "Sales"}])
+        self.assertNotIn("skills", users[1])
+
+    def test_record_path(self):
+        contacts = records(
+            CONTACTS_RESPONSE, record_path=("return", "records"), list_fields=("data",)
+        )
+        self.assertEqual(
+            [contact["values"]["data"] for contact in contacts],
+            [["5551234567", "Ann"], ["5557654321", "Bob"]],
+        )
+
+    def test_as_tuples(self):
+        users = records(USERS_RESPONSE, as_tuples=True)
+        self.assertEqual(users[1], (("generalInfo", {"id": "2", "userName": "two"}),))
+
+    def test_fault(self):
+        with self.assertRaises(Fault) as context:
+            records(FAULT_RESPONSE)
+        self.assertEqual(context.exception.message, "User not found")
+        self.assertEqual(context.exception.code, "env:Server")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# unittests for the response_cache module, these run without a Five9 domain
+
+import unittest
+
+from five9.utils.response_cache import ResponseCache, object_types_for_method
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeService:
+    def __init__(self):
+        self.calls = []
+
+    def send(self, method_name):
+        def call(*args, **kwargs):
+            self.calls.append(method_name)
+            return {"method": method_name, "args": list(args)}
+
+        return call
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttl=60, maxsize=3, clock=self.clock)
+        self.service = FakeService()
+
+    def call(self, method_name, *args, **kwargs):
+        return self.cache.call(
+            method_name, self.service.send(method_name), args, kwargs
+        )
+
+    def test_object_types(self):
+        self.assertEqual(object_types_for_method("getUsersInfo"), {"user"})
+        self.assertEqual(object_types_for_method("userSkillAdd"), {"user", "skill"})
+        self.assertEqual(
+            object_types_for_method("modifyOutboundCampaign"), {"outbound", "campaign"}
+        )
+        self.assertEqual(object_types_for_method("getIVRScripts"), {"ivr", "script"})
+
+    def test_reads_are_cached_per_arguments(self):
+        self.call("getSkill", "sales")
+        self.call("getSkill", "sales")
+        self.call("getSkill", "support")
+        self.assertEqual(self.service.calls, ["getSkill", "getSkill"])
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_cached_responses_are_copies(self):
+        self.call("getSkills")["method"] = "changed"
+        self.assertEqual(self.call("getSkills")["method"], "getSkills")
+
+    def test_ttl(self):
+        self.call("getSkills")
+        self.clock.now = 61
+        self.call("getSkills")
+        self.assertEqual(self.service.calls, ["getSkills", "getSkills"])
+
+    def test_lru_eviction(self):
+        for name in ["a", "b", "c"]:
+            self.call("getSkill", name)
+        self.call("getSkill", "a")
+        self.call("getSkill", "d")
+        self.assertEqual(len(self.cache), 3)
+        self.call("getSkill", "a")
+        self.call("getSkill", "b")
+        self.assertEqual(self.service.calls.count("getSkill"), 5)
+
+    def test_writes_invalidate_the_same_object_type(self):
+        self.call("getSkills")
+        self.call("getCampaigns")
+        self.call("userSkillAdd", {"userName": "user"})
+        self.call("getSkills")
+        self.call("getCampaigns")
+        self.assertEqual(
+            self.service.calls, ["getSkills", "getCampaigns", "userSkillAdd", "getSkills"]
+        )
+
+    def test_uncacheable_reads(self):
+        self.call("getCallCountersState")
+        self.call("getCallCountersState")
+        self.call("isReportRunning", "id")
+        self.call("isReportRunning", "id")
+        self.assertEqual(len(self.service.calls), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 # unit test for the five9_session library
+import asyncio
 from io import StringIO
 import unittest
 from unittest.mock import patch
@@ -42,7 +43,9 @@ class TestFive9Session(unittest.TestCase):
     def test_session_create_with_invalid_credentials(self):
         with self.assertRaises(five9_session.Five9ClientCreationError):
             test_client = five9_session.Five9Client(
-                five9username="badusername", five9password="badpassword"
+                five9username="badusername",
+                five9password="badpassword",
+                lazy_bootstrap=False,
             )
             test_client.service.closeSession()
 
@@ -60,8 +63,17 @@ class TestFive9Session(unittest.TestCase):
         self.assertGreater(len(test_client.call_counters), 0)
         test_client.service.closeSession()
 
+    def test_session_create_makes_no_api_calls(self):
+        test_client = five9_session.Five9Client(account=self.account)
+        self.assertEqual(len(test_client.history._buffer), 0)
+        self.assertIsNotNone(test_client.domain_name)
+        self.assertEqual(len(test_client.history._buffer), 1)
+        self.assertIsNotNone(test_client.domain_id)
+        test_client.service.closeSession()
+
     def test_client_envelopes(self):
         test_client = five9_session.Five9Client(account=self.account)
+        test_client.refresh()
         self.assertIsNot(test_client.latest_envelopes, "")
         self.assertIsNot(test_client.latest_envelope_sent, "")
         self.assertIsNot(test_client.latest_envelope_received, "")
@@ -106,6 +118,39 @@ class TestFive9Session(unittest.TestCase):
             )
         )
 
+    def test_client_map(self):
+        test_client = five9_session.Five9Client(account=self.account)
+        skills = test_client.service.getSkills()
+        skill_names = [skill.name for skill in skills] + ["not_a_real_skill_name"]
+
+        results = test_client.map("getSkill", skill_names, max_workers=4)
+
+        # results are returned in the order of the payloads
+        self.assertEqual([result.payload for result in results], skill_names)
+        for result, skill in zip(results, skills):
+            self.assertIsNone(result.fault)
+            self.assertEqual(result.result.name, skill.name)
+        self.assertIsNone(results[-1].result)
+        self.assertIsNotNone(results[-1].fault)
+        test_client.service.closeSession()
+
+    def test_async_client(self):
+        async def get_skills():
+            async with five9_session.AsyncFive9Client(account=self.account) as client:
+                await client.refresh()
+                skills = await client.service.getSkills()
+                results = await client.map(
+                    "getSkill", [skill.name for skill in skills], max_workers=4
+                )
+                return client, skills, results
+
+        client, skills, results = asyncio.run(get_skills())
+        self.assertIsNotNone(client.domain_name)
+        self.assertGreater(len(client.call_counters), 0)
+        self.assertEqual(
+            [result.result.name for result in results], [skill.name for skill in skills]
+        )
+
     @patch("sys.stdout", new_callable=StringIO)
     def test_client_show_available_service_methods(self, mock_stdout):
         test_client = five9_session.Five9Client(account=self.account)
@@ -0,0 +1,111 @@
+# unittests for the single_flight module, these run without a Five9 domain
+
+import asyncio
+import concurrent.futures
+import threading
+import traceback
+import unittest
+
+from five9.utils.single_flight import SingleFlight
+
+
+class BlockingService:
+    """Sends block until release() so concurrent callers overlap."""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+        self.released = threading.Event()
+
+    def send(self, *args, **kwargs):
+        self.calls.append(args)
+        self.released.wait(5)
+        if self.error:
+            raise self.error
+        return {"args": list(args)}
+
+
+class TestSingleFlight(unittest.TestCase):
+    def run_concurrently(self, single_flight, service, method_name, callers=5):
+        with concurrent.futures.ThreadPoolExecutor(callers) as executor:
+            futures = [
+                executor.submit(
+                    single_flight.call, method_name, service.send, ("campaign",), {}
+                )
+                for _ in range(callers)
+            ]
+            # wait for every caller to join the call in flight
+            while single_flight.coalesced + len(service.calls) < callers:
+                threading.Event().wait(0.01)
+            service.released.set()
+            return futures
+
+    def test_concurrent_reads_share_one_request(self):
+        single_flight = SingleFlight()
+        service = BlockingService()
+        futures = self.run_concurrently(single_flight, service, "getCampaignState")
+        results = [future.result() for future in futures]
+        self.assertEqual(len(service.calls), 1)
+        self.assertEqual(single_flight.coalesced, 4)
+        self.assertTrue(all(result == {"args": ["campaign"]} for result in results))
+        # every caller owns its result
+        self.assertEqual(len({id(result) for result in results}), 5)
+        self.assertEqual(len(single_flight), 0)
+
+    def test_faults_reach_every_caller(self):
+        single_flight = SingleFlight()
+        service = BlockingService(error=ValueError("fault"))
+        futures = self.run_concurrently(single_flight, service, "getCampaignState")
+        for future in futures:
+            self.assertRaises(ValueError, future.result)
+        self.assertEqual(len(service.calls), 1)
+
+    def test_waiters_raise_their_own_fault(self):
+        single_flight = SingleFlight()
+        error = ValueError("fault")
+        service = BlockingService(error=error)
+        futures = self.run_concurrently(single_flight, service, "getCampaignState", callers=3)
+        errors = [future.exception() for future in futures]
+        waiter_errors = [caught for caught in errors if caught is not error]
+        self.assertEqual(len(waiter_errors), 2)
+        self.assertIsNot(waiter_errors[0], waiter_errors[1])
+        for caught in waiter_errors:
+            self.assertIsInstance(caught, ValueError)
+            self.assertEqual(caught.args, ("fault",))
+            self.assertIs(caught.__cause__, error)
+            # only the waiter's own frames
+            self.assertNotIn("send", [frame.name for frame in traceback.extract_tb(caught.__traceback__)])
+
+    def test_writes_are_not_coalesced(self):
+        single_flight = SingleFlight()
+        service = BlockingService()
+        service.released.set()
+        futures = self.run_concurrently(single_flight, service, "startCampaign")
+        [future.result() for future in futures]
+        self.assertEqual(len(service.calls), 5)
+
+    def test_async(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def send(*args):
+            calls.append(args)
+            await asyncio.sleep(0.01)
+            return {"args": list(args)}
+
+        async def main():
+            return await asyncio.gather(
+                *[
+                    single_flight.call_async("getUsersInfo", send, (), {})
+                    for _ in range(5)
+                ]
+            )
+
+        results = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"args": []}] * 5)
+        self.assertEqual(len(single_flight), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
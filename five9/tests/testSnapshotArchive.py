@@ -0,0 +1,99 @@
+# unittests for the snapshot_archive module, these run without a Five9 domain
+
+import os
+import tempfile
+import unittest
+
+from five9.utils.snapshot_archive import (
+    SnapshotArchive,
+    SnapshotArchiveError,
+    SnapshotArchiveWriter,
+    archive_directory,
+    extract_archive,
+)
+
+FILES = {
+    "getSkills.json": '[\n    {\n        "name": "Sales"\n    }\n]',
+    "campaigns_outbound/Campaign 001.json": '{\n    "name": "Campaign 001"\n}',
+    "campaigns_outbound/Campaign 002.json": '{\n    "name": "Campaign 002"\n}',
+    "ivrs/Main IVR.json": '{\n    "name": "Main IVR"\n}',
+    # the same content is stored once
+    "ivrs/Copy of Main IVR.json": '{\n    "name": "Main IVR"\n}',
+    "campaign_profile_filters_demystified/Profile é.sql": "SELECT * WHERE name = 'é'",
+}
+
+
+class TestSnapshotArchive(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.archive_path = os.path.join(self.temp_dir.name, "capture.f9snap")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_archive(self):
+        with SnapshotArchiveWriter(self.archive_path, metadata={"domain_name": "Test"}) as archive:
+            for relative_path, content in FILES.items():
+                archive.add(relative_path, content)
+
+    def test_random_access(self):
+        self.write_archive()
+        with SnapshotArchive(self.archive_path) as archive:
+            self.assertEqual(archive.metadata, {"domain_name": "Test"})
+            self.assertEqual(archive.paths(), sorted(FILES))
+            self.assertEqual(
+                archive.paths("campaigns_outbound/"),
+                ["campaigns_outbound/Campaign 001.json", "campaigns_outbound/Campaign 002.json"],
+            )
+            self.assertIn("ivrs/Main IVR.json", archive)
+            for relative_path in reversed(sorted(FILES)):
+                self.assertEqual(archive.read(relative_path), FILES[relative_path])
+            self.assertEqual(len(archive._blobs), len(FILES) - 1)
+            with self.assertRaises(SnapshotArchiveError):
+                archive.read("ivrs/Missing.json")
+
+    def test_failed_capture_leaves_no_archive(self):
+        with self.assertRaises(RuntimeError):
+            with SnapshotArchiveWriter(self.archive_path) as archive:
+                archive.add("getSkills.json", "[]")
+                # files are read back while the archive is written
+                self.assertEqual(archive.read("getSkills.json"), "[]")
+                raise RuntimeError("capture failed")
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    def test_rejects_other_files(self):
+        with open(self.archive_path, "wb") as other_file:
+            other_file.write(b'{"not": "an archive"}')
+        with self.assertRaises(SnapshotArchiveError):
+            SnapshotArchive(self.archive_path)
+
+    def test_converts_to_and_from_a_snapshot_folder(self):
+        self.write_archive()
+        directory = os.path.join(self.temp_dir.name, "snapshot")
+        self.assertEqual(extract_archive(self.archive_path, directory), len(FILES))
+        os.makedirs(os.path.join(directory, ".git"))
+        with open(os.path.join(directory, ".git", "HEAD"), "w") as head_file:
+            head_file.write("ref: refs/heads/master\n")
+
+        archive_path = os.path.join(self.temp_dir.name, "packed.f9snap")
+        self.assertEqual(archive_directory(directory, archive_path), len(FILES))
+        with SnapshotArchive(archive_path) as archive:
+            self.assertEqual({path: archive.read(path) for path in archive}, FILES)
+
+    def test_extract_rejects_paths_outside_of_the_folder(self):
+        directory = os.path.join(self.temp_dir.name, "snapshot")
+        outside = os.path.join(self.temp_dir.name, "outside.json")
+        for relative_path in ("../outside.json", "ivrs/../../outside.json", outside.replace(os.sep, "/")):
+            with self.subTest(relative_path=relative_path):
+                with SnapshotArchiveWriter(self.archive_path) as archive:
+                    archive.add("getSkills.json", "[]")
+                    archive.add(relative_path, "{}")
+                with self.assertRaises(SnapshotArchiveError):
+                    extract_archive(self.archive_path, directory)
+                self.assertFalse(os.path.exists(outside))
+                # nothing is extracted from the archive
+                self.assertFalse(os.path.exists(os.path.join(directory, "getSkills.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+# unittests for the snapshot_diff module, these run without a Five9 domain
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from git import Repo
+
+from five9.utils import snapshot_json
+from five9.utils.domain_capture import Five9DomainConfig
+from five9.utils.snapshot import commit_snapshot
+from five9.utils.snapshot_archive import archive_directory
+from five9.utils.snapshot_diff import (
+    ADDED,
+    MODIFIED,
+    REMOVED,
+    FieldChange,
+    diff_snapshots,
+    diff_values,
+)
+
+
+def profile(name, description="--sync"):
+    return {"name": name, "description": description, "initialCallPriority": 1}
+
+
+def profile_filter(name, right_value="CA"):
+    return {
+        "crmCriteria": [{"compareOperator": "Equals", "leftValue": "state", "rightValue": right_value}],
+        "grouping": {"expression": None, "type": "All"},
+        "orderByFields": [],
+        "profileName": name,
+    }
+
+
+SNAPSHOT = {
+    "getCampaignProfiles": [profile("Profile A"), profile("Profile B"), profile("Profile C")],
+    "getCampaignProfiles_campaign_profile_filters": {
+        "Profile A": profile_filter("Profile A"),
+        "Profile B": profile_filter("Profile B"),
+        "Profile C": profile_filter("Profile C"),
+    },
+    "getCampaigns_campaigns_outbound": {
+        "Campaign 1": {"name": "Campaign 1", "dialingMode": "PREDICTIVE"},
+        "Campaign 2": {"name": "Campaign 2", "dialingMode": "PREVIEW"},
+    },
+    "getAvailableLocales": ["en-US", "fr-CA"],
+}
+
+FOLDERS = {
+    "getCampaignProfiles_campaign_profile_filters": "campaign_profile_filters",
+    "getCampaigns_campaigns_outbound": "campaigns_outbound",
+}
+
+
+def write_snapshot(root, domain_objects):
+    for folder in FOLDERS.values():
+        shutil.rmtree(os.path.join(root, folder), ignore_errors=True)
+    for key, value in domain_objects.items():
+        if key in FOLDERS:
+            os.makedirs(os.path.join(root, FOLDERS[key]), exist_ok=True)
+            for name, detail in value.items():
+                with open(os.path.join(root, FOLDERS[key], f"{name}.json"), "w") as snapshot_file:
+                    snapshot_file.write(snapshot_json.dumps(detail))
+        else:
+            os.makedirs(root, exist_ok=True)
+            with open(os.path.join(root, f"{key}.json"), "w") as snapshot_file:
+                snapshot_file.write(snapshot_json.dumps(value))
+
+
+def changed_snapshot():
+    changed = json.loads(json.dumps(SNAPSHOT))
+    changed["getCampaignProfiles"][1]["initialCallPriority"] = 5
+    changed["getCampaignProfiles"].append(profile("Profile D"))
+    changed["getCampaignProfiles_campaign_profile_filters"]["Profile C"]["crmCriteria"][0]["rightValue"] = "NV"
+    changed["getCampaignProfiles_campaign_profile_filters"]["Profile D"] = profile_filter("Profile D")
+    del changed["getCampaigns_campaigns_outbound"]["Campaign 2"]
+    return changed
+
+
+EXPECTED_CHANGES = {
+    ("getCampaignProfiles", "Profile B", MODIFIED),
+    ("getCampaignProfiles", "Profile D", ADDED),
+    ("getCampaignProfiles_campaign_profile_filters", "Profile C", MODIFIED),
+    ("getCampaignProfiles_campaign_profile_filters", "Profile D", ADDED),
+    ("getCampaigns_campaigns_outbound", "Campaign 2", REMOVED),
+}
+
+
+class TestSnapshotDiff(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.old_path = os.path.join(self.temp_dir.name, "old")
+        self.new_path = os.path.join(self.temp_dir.name, "new")
+        write_snapshot(self.old_path, SNAPSHOT)
+        write_snapshot(self.new_path, changed_snapshot())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def load(self, snapshot_path, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return Five9DomainConfig.from_snapshot(snapshot_path, **kwargs)
+
+    def assertChanges(self, diff):
+        self.assertEqual({(change.kind, change.name, change.change) for change in diff}, EXPECTED_CHANGES)
+
+    def test_diff_values(self):
+        old = {"a": 1, "b": {"c": [1, 2, 3]}, "odd key": None}
+        new = {"a": 1, "b": {"c": [1, 5]}, "odd key": True, "d": "added"}
+        self.assertEqual(
+            diff_values(old, new),
+            [
+                FieldChange("$.b.c[1]", MODIFIED, 2, 5),
+                FieldChange("$.b.c[2]", REMOVED, 3, None),
+                FieldChange("$.d", ADDED, None, "added"),
+                FieldChange('$["odd key"]', MODIFIED, None, True),
+            ],
+        )
+
+    def test_diff_directories(self):
+        diff = diff_snapshots(self.old_path, self.new_path)
+        self.assertChanges(diff)
+        self.assertEqual(
+            diff.get("getCampaignProfiles_campaign_profile_filters", "Profile C").fields,
+            [FieldChange("$.crmCriteria[0].rightValue", MODIFIED, "CA", "NV")],
+        )
+        self.assertEqual(
+            diff.get("getCampaignProfiles", "Profile B").fields,
+            [FieldChange("$.initialCallPriority", MODIFIED, 1, 5)],
+        )
+        self.assertIsNone(diff.get("getCampaignProfiles", "Profile A"))
+        # identical files aren't compared
+        self.assertEqual(diff.files_skipped, 4)
+        self.assertEqual(diff.summary()["getCampaignProfiles"], {ADDED: 1, REMOVED: 0, MODIFIED: 1})
+
+    def test_diff_commits_archives_and_domain_objects(self):
+        repo = Repo.init(self.old_path)
+        commit_snapshot(repo, "old")
+        write_snapshot(self.old_path, changed_snapshot())
+        commit_snapshot(repo, "new")
+        self.assertChanges(diff_snapshots(self.old_path, self.old_path, old_rev="HEAD~1", new_rev="HEAD"))
+        self.assertFalse(diff_snapshots(self.old_path, self.new_path, old_rev="HEAD"))
+
+        archive_path = os.path.join(self.temp_dir.name, "new.f9snap")
+        archive_directory(self.new_path, archive_path)
+        old_commit = self.load(self.old_path, rev="HEAD~1")
+        self.assertChanges(diff_snapshots(old_commit, archive_path))
+
+        live = Five9DomainConfig.__new__(Five9DomainConfig)
+        live.domain_objects = changed_snapshot()
+        self.assertChanges(diff_snapshots(self.old_path, live, old_rev="HEAD~1"))
+
+    def test_sync_skips_unchanged_objects(self):
+        target = self.load(self.old_path)
+        target.client = mock.MagicMock()
+        source = self.load(self.new_path, sync_target_domain=target)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            source.sync_to_target_domain()
+        self.assertIn("SYNC (unchanged): Profile A", output.getvalue())
+        synced = {call.kwargs["profileName"] for call in target.client.service.modifyCampaignProfileCrmCriteria.call_args_list}
+        self.assertEqual(synced, {"Profile B", "Profile C", "Profile D"})
+
+
+if __name__ == "__main__":
+    unittest.main()
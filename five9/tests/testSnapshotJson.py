@@ -0,0 +1,65 @@
+# unittests for the snapshot_json module, these run without a Five9 domain
+
+import datetime
+import decimal
+import json
+import unittest
+from unittest import mock
+
+from five9.utils import snapshot_json
+from five9.utils.snapshot_json import dumps, json_default
+
+
+def reference(obj, indent=4):
+    return json.dumps(obj, sort_keys=True, indent=indent, default=json_default)
+
+
+DOMAIN_OBJECT = {
+    "generalInfo": {
+        "userName": "agent@example.com",
+        "fullName": "Zoë  Smith \U0001F600",
+        "startDate": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+        "lastUpdated": datetime.datetime(2024, 5, 6, 7, 8, 9, 123456),
+        "hireDate": datetime.date(2019, 12, 31),
+        "shiftStart": datetime.time(9, 30),
+        "id": 300001,
+        "active": True,
+        "osLogin": None,
+    },
+    "rates": [0.5, 1e-05, 1.5e16, -0.0001, 12345678901234567890],
+    "budget": decimal.Decimal("1234.50"),
+    "audio": b"\x00\x01binary\xff",
+    "notes": "tab\there, newline\nthere, quote \" and \x7f",
+    "skills": [{"level": 1, "skillName": "Sales"}, {}, []],
+}
+
+
+class TestSnapshotJson(unittest.TestCase):
+    def test_converts_values_json_cannot_write(self):
+        output = json.loads(dumps(DOMAIN_OBJECT))
+        self.assertEqual(output["generalInfo"]["startDate"], "2020-01-01T00:00:00+00:00")
+        self.assertEqual(output["generalInfo"]["lastUpdated"], "2024-05-06T07:08:09.123456")
+        self.assertEqual(output["generalInfo"]["hireDate"], "2019-12-31")
+        self.assertEqual(output["generalInfo"]["shiftStart"], "09:30:00")
+        self.assertEqual(output["budget"], "1234.50")
+        self.assertEqual(output["audio"], "AAFiaW5hcnn/")
+
+    def test_same_output_as_json(self):
+        for indent in (4, 2, 3):
+            self.assertEqual(dumps(DOMAIN_OBJECT, indent=indent), reference(DOMAIN_OBJECT, indent))
+        self.assertEqual(
+            dumps(DOMAIN_OBJECT, sort_keys=False),
+            json.dumps(DOMAIN_OBJECT, indent=4, default=json_default),
+        )
+
+    def test_same_output_without_orjson(self):
+        with mock.patch.object(snapshot_json, "orjson", None):
+            self.assertEqual(dumps(DOMAIN_OBJECT), reference(DOMAIN_OBJECT))
+
+    def test_unknown_types_raise(self):
+        with self.assertRaises(TypeError):
+            dumps({"names": {"a", "b"}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+# unittests for the stand-in server, these run a local server instead of a Five9 domain
+
+import asyncio
+import tempfile
+import unittest
+
+import zeep
+
+from five9 import five9_session
+from five9.utils.standin_server import StandInDomain, StandInServer
+
+
+class TestStandInServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.wsdl_cache_dir = tempfile.TemporaryDirectory()
+        cls.server = StandInServer(
+            domain=StandInDomain(users=20, report_duration=0.1, import_duration=0.1),
+            rate_limits={"Query": {1: 5}},
+            faults={"getPrompts": "Prompts are unavailable"},
+            wsdl_cache_dir=cls.wsdl_cache_dir.name,
+        ).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        cls.wsdl_cache_dir.cleanup()
+
+    def client(self, **kwargs):
+        kwargs.setdefault("wsdl_source", "bundled")
+        kwargs.setdefault("api_hostname", self.server.api_hostname)
+        kwargs.setdefault("wsdl_cache_dir", self.wsdl_cache_dir.name)
+        return five9_session.Five9Client(
+            five9username="standin",
+            five9password="standin",
+            **kwargs,
+        )
+
+    def test_remote_wsdl_points_at_the_server(self):
+        client = self.client(wsdl_source="remote", rate_limit=False)
+        self.assertEqual(client.service._binding_options["address"], self.server.url)
+
+    def test_clients_of_the_same_wsdl_keep_their_own_address(self):
+        other_server = StandInServer(
+            domain=StandInDomain(users=1, domain_name="Other Domain"),
+            wsdl_cache_dir=self.wsdl_cache_dir.name,
+        ).start()
+        self.addCleanup(other_server.stop)
+        client = self.client(rate_limit=False)
+        other_client = self.client(api_hostname=other_server.api_hostname, rate_limit=False)
+        self.assertEqual(client.service._binding_options["address"], self.server.url)
+        self.assertEqual(other_client.service._binding_options["address"], other_server.url)
+        self.assertEqual(client.domain_name, "Stand-in Domain")
+        self.assertEqual(other_client.domain_name, "Other Domain")
+
+    def test_users(self):
+        client = self.client()
+        self.assertEqual(client.domain_name, "Stand-in Domain")
+        users = client.service.getUsersInfo("user0000[0-4].*")
+        self.assertEqual(len(users), 5)
+
+        general_info = users[0].generalInfo
+        general_info.firstName = "Changed"
+        client.service.modifyUser(userGeneralInfo=general_info)
+        user = client.service.getUsersInfo(general_info.userName)[0]
+        self.assertEqual(user.generalInfo.firstName, "Changed")
+
+    def test_report(self):
+        client = self.client()
+        identifier = client.service.runReport(
+            folderName="Call Log Reports", reportName="Call Log", criteria={}
+        )
+        while client.service.isReportRunning(identifier, 1):
+            pass
+        csv_data = client.service.getReportResultCsv(identifier)
+        self.assertEqual(len(csv_data.splitlines()), 101)
+
+    def test_list_import(self):
+        client = self.client()
+        client.service.createList("Stand-in List")
+        settings = {
+            "fieldsMapping": [
+                {"columnNumber": 1, "fieldName": "number1", "key": True},
+                {"columnNumber": 2, "fieldName": "first_name", "key": False},
+            ],
+            "skipHeaderLine": True,
+            "cleanListBeforeUpdate": False,
+            "crmAddMode": "ADD_NEW",
+            "crmUpdateMode": "UPDATE_FIRST",
+            "listAddMode": "ADD_FIRST",
+        }
+        identifier = {
+            "identifier": client.service.addToListCsv(
+                "Stand-in List", settings, "number1,first_name\n5551234567,Ann\n5557654321,Bob\n"
+            )
+        }
+        while client.service.isImportRunning(identifier, 1):
+            pass
+        result = client.service.getListImportResult(identifier)
+        self.assertEqual(result.listRecordsInserted, 2)
+        self.assertEqual(client.service.getListsInfo("Stand-in List")[0].size, 2)
+
+    def test_faults(self):
+        client = self.client()
+        with self.assertRaises(zeep.exceptions.Fault) as context:
+            client.service.getSkill("Missing Skill")
+        self.assertIn("not found", context.exception.message)
+        with self.assertRaises(zeep.exceptions.Fault) as context:
+            client.service.getPrompts()
+        self.assertEqual(context.exception.message, "Prompts are unavailable")
+
+    def test_map_results_and_progress_in_payload_order(self):
+        client = self.client()
+        names = [skill.name for skill in client.service.getSkills()]
+        reported = []
+        results = client.map("getSkill", names, max_workers=4, progress=reported.append)
+        self.assertEqual([result.payload for result in results], names)
+        self.assertEqual([result.result.name for result in results], names)
+        self.assertTrue(all(result.fault is None for result in results))
+        self.assertEqual([id(result) for result in reported], [id(result) for result in results])
+
+    def test_map_stop_on_fault(self):
+        client = self.client()
+        names = [skill.name for skill in client.service.getSkills()]
+        calls = self.server.calls["getSkill"]
+        results = client.map("getSkill", ["Missing Skill"] + names, max_workers=1, stop_on_fault=True)
+        self.assertEqual([result.payload for result in results], ["Missing Skill"])
+        self.assertIn("not found", results[0].fault.message)
+        # the payload queued behind the fault isn't called
+        self.assertEqual(self.server.calls["getSkill"], calls + 1)
+
+    def test_map_reads_a_generator_as_calls_complete(self):
+        client = self.client()
+        skills = client.service.getSkills()
+        names = [skills[index % len(skills)].name for index in range(12)]
+        read = []
+
+        def payloads():
+            for name in names:
+                read.append(name)
+                yield name
+
+        reported = []
+        results = client.map(
+            "getSkill",
+            payloads(),
+            max_workers=2,
+            progress=lambda result: reported.append((result.payload, len(read))),
+        )
+        self.assertEqual([result.payload for result in results], names)
+        self.assertEqual([payload for payload, _ in reported], names)
+        # never more than max_workers * 2 payloads ahead of the results reported
+        for index, (_, read_count) in enumerate(reported):
+            self.assertLessEqual(read_count, index + 4)
+
+    def test_async_client(self):
+        async def get_skills():
+            async with five9_session.AsyncFive9Client(
+                five9username="standin",
+                five9password="standin",
+                api_hostname=self.server.api_hostname,
+                wsdl_source="bundled",
+                wsdl_cache_dir=self.wsdl_cache_dir.name,
+            ) as client:
+                await client.refresh()
+                skills = await client.service.getSkills()
+                results = await client.map("getSkill", [skill.name for skill in skills], max_workers=4)
+                stopped = await client.map(
+                    "getSkill", ["Missing Skill"] + [skill.name for skill in skills], max_workers=1, stop_on_fault=True
+                )
+                names = [skills[index % len(skills)].name for index in range(6)]
+                read = []
+
+                def payloads():
+                    for name in names:
+                        read.append(name)
+                        yield name
+
+                reported = []
+                await client.map(
+                    "getSkill",
+                    payloads(),
+                    max_workers=1,
+                    progress=lambda result: reported.append((result.payload, len(read))),
+                )
+                return client, skills, results, stopped, names, reported
+
+        client, skills, results, stopped, names, reported = asyncio.run(get_skills())
+        self.assertEqual(client.domain_name, "Stand-in Domain")
+        self.assertGreater(len(client.call_counters), 0)
+        self.assertGreater(len(skills), 0)
+        self.assertEqual([result.result.name for result in results], [skill.name for skill in skills])
+        self.assertEqual([result.payload for result in stopped], ["Missing Skill"])
+        self.assertIsNotNone(stopped[0].fault)
+        # reported in payload order, with at most max_workers * 2 payloads read ahead
+        self.assertEqual([payload for payload, _ in reported], names)
+        self.assertLessEqual(reported[0][1], 2)
+
+    def test_async_client_bootstraps_on_refresh(self):
+        with self.assertRaises(five9_session.Five9ClientCreationError):
+            five9_session.AsyncFive9Client(
+                five9username="standin",
+                five9password="standin",
+                api_hostname=self.server.api_hostname,
+                wsdl_source="bundled",
+                wsdl_cache_dir=self.wsdl_cache_dir.name,
+                lazy_bootstrap=False,
+            )
+
+    def test_rate_limits_are_enforced(self):
+        client = self.client(rate_limit=False, coalesce_reads=False)
+        results = client.map("getCampaigns", [()] * 12, max_workers=4)
+        self.assertTrue(any(result.fault for result in results))
+        self.assertIn(
+            "limit", next(result.fault for result in results if result.fault).message
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
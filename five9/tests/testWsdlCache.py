@@ -0,0 +1,124 @@
+# unittests for the wsdl_cache module, these use the bundled WSDL and the local stand-in server
+
+import glob
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+from five9 import five9_session
+from five9.utils import wsdl_cache
+from five9.utils.standin_server import StandInDomain, StandInServer
+
+
+def operation_names(document):
+    return {
+        binding_name: sorted(binding._operations)
+        for binding_name, binding in document.bindings.items()
+    }
+
+
+class TestWsdlCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_dir = self.temp_dir.name
+        # every test starts from an empty in-process cache
+        patcher = mock.patch.dict(wsdl_cache._DOCUMENT_CACHE, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def load(self):
+        return wsdl_cache.load_wsdl_document(
+            wsdl_cache.BUNDLED_WSDL_PATH, wsdl_cache.Five9Transport(), cache_dir=self.cache_dir
+        )
+
+    def pickle_paths(self):
+        return glob.glob(os.path.join(self.cache_dir, "parsed", "*.pickle"))
+
+    def test_parsed_schema_round_trip(self):
+        parsed = self.load()
+        self.assertEqual(len(self.pickle_paths()), 1)
+
+        wsdl_cache._DOCUMENT_CACHE.clear()
+        with mock.patch.object(wsdl_cache, "Document", side_effect=AssertionError("parsed again")):
+            loaded = self.load()
+        self.assertEqual(operation_names(loaded), operation_names(parsed))
+        self.assertGreater(len(operation_names(loaded)), 0)
+
+        skill_type = loaded.types.get_type(
+            "{http://service.admin.ws.five9.com/}skill"
+        )
+        self.assertEqual(skill_type(name="Sales").name, "Sales")
+
+    def test_unreadable_pickles_are_parsed_again(self):
+        self.load()
+        (pickle_path,) = self.pickle_paths()
+        with open(pickle_path, "rb") as pickle_file:
+            valid = pickle_file.read()
+
+        # a stale pickle refers to something that no longer exists
+        stale = pickle.dumps(wsdl_cache.Five9Transport).replace(
+            b"Five9Transport", b"Five9Transpor_"
+        )
+        for content in (b"not a pickle", valid[: len(valid) // 2], stale):
+            with self.subTest(content=content[:20]):
+                with open(pickle_path, "wb") as pickle_file:
+                    pickle_file.write(content)
+                wsdl_cache._DOCUMENT_CACHE.clear()
+                with self.assertLogs(level="WARNING") as logs:
+                    document = self.load()
+                self.assertIn("Discarding unreadable parsed WSDL cache", logs.output[0])
+                self.assertGreater(len(operation_names(document)), 0)
+                # the parsed schema replaced the unreadable pickle
+                with open(pickle_path, "rb") as pickle_file:
+                    pickle.load(pickle_file)
+
+
+class TestWsdlCacheSource(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server_cache_dir = tempfile.TemporaryDirectory()
+        cls.server = StandInServer(
+            domain=StandInDomain(users=5), wsdl_cache_dir=cls.server_cache_dir.name
+        ).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+        cls.server_cache_dir.cleanup()
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def client(self):
+        return five9_session.Five9Client(
+            five9username="standin",
+            five9password="standin",
+            api_hostname=self.server.api_hostname,
+            wsdl_source="cache",
+            wsdl_cache_dir=self.temp_dir.name,
+            rate_limit=False,
+        )
+
+    def test_cache_source_downloads_once(self):
+        # the client keeps the hostname without its scheme
+        wsdl_path = wsdl_cache.cached_wsdl_path(
+            self.server.api_hostname.split("://")[-1], "wsadmin", "v13", cache_dir=self.temp_dir.name
+        )
+        self.assertFalse(os.path.exists(wsdl_path))
+        with mock.patch.object(wsdl_cache, "fetch_wsdl", wraps=wsdl_cache.fetch_wsdl) as fetch_wsdl:
+            client = self.client()
+            self.assertEqual(fetch_wsdl.call_count, 1)
+            self.assertTrue(os.path.exists(wsdl_path))
+            self.assertEqual(client.service._binding_options["address"], self.server.url)
+
+            other_client = self.client()
+            self.assertEqual(fetch_wsdl.call_count, 1)
+        self.assertEqual(len(other_client.service.getUsersInfo()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
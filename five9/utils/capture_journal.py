@@ -0,0 +1,127 @@
+"""
+Checkpoint journal of a domain capture, to resume it after an interruption.
+
+The journal is a JSON lines file appended to as the capture goes: a line per
+snapshot file written ({"path": ...}, with its "content" when the files
+aren't kept on disk, as in archive captures) and a line per method whose
+objects were all captured ({"method": ...}).  A line is flushed as soon as
+it is written, a partly written last line is ignored when the journal is
+read back.  Only the paths are kept in memory, the contents journaled are
+read back from the file when a capture resumes.
+"""
+import json
+import os
+import threading
+import time
+
+
+JOURNAL_VERSION = 1
+
+
+class CaptureJournal:
+    """
+    The journal of a capture, read back when the capture resumes.
+
+    Args:
+        path (str): The journal file.
+        root (str, optional): The snapshot folder holding the files of the paths journaled
+            without their content.
+        keep_contents (bool, optional): Journal the content of every file. Defaults to False.
+        resume (bool, optional): Continue the journal at path if there is one, otherwise it is
+            started over. Defaults to False.
+        metadata (dict, optional): Written to the first line of a new journal, e.g. the domain name.
+
+    Attributes:
+        resumed (bool): True when an earlier journal was continued.
+        methods (set): The methods completed, in earlier runs included.
+        files (dict): Relative path -> offset of its journal line (None when it is read from root)
+            of the files written.
+    """
+
+    def __init__(self, path, root=None, keep_contents=False, resume=False, metadata=None):
+        self.path = path
+        self.root = root
+        self.keep_contents = keep_contents
+        self.methods = set()
+        self.files = {}
+        self.metadata = {}
+        self._lock = threading.Lock()
+        self._reader = None
+
+        self.resumed = resume and os.path.exists(path)
+        if self.resumed:
+            self._read()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "ab" if self.resumed else "wb")
+        if not self.resumed:
+            self.metadata = dict(metadata or {}, journal=JOURNAL_VERSION, started=time.strftime("%Y-%m-%d %H:%M:%S"))
+            self._append(self.metadata)
+
+    def _read(self):
+        with open(self.path, "rb") as journal_file:
+            offset = 0
+            for line in journal_file:
+                line_offset, offset = offset, offset + len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # the capture stopped while the line was written
+                    continue
+                if "journal" in entry:
+                    self.metadata = entry
+                elif "method" in entry:
+                    self.methods.add(entry["method"])
+                elif "path" in entry:
+                    self.files[entry["path"]] = line_offset if "content" in entry else None
+
+    def _append(self, entry):
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+        return offset
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def record_file(self, relative_path, content):
+        """Journals a snapshot file once it is written."""
+        entry = {"path": relative_path}
+        if self.keep_contents:
+            entry["content"] = content
+        offset = self._append(entry)
+        self.files[relative_path] = offset if self.keep_contents else None
+
+    def complete_method(self, method):
+        """Journals a method whose objects were all captured."""
+        self.methods.add(method)
+        self._append({"method": method})
+
+    def read(self, relative_path):
+        """The content of a journaled file."""
+        offset = self.files[relative_path]
+        if offset is None:
+            with open(os.path.join(self.root, *relative_path.split("/")), encoding="utf-8") as snapshot_file:
+                return snapshot_file.read()
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+        self._reader.seek(offset)
+        return json.loads(self._reader.readline())["content"]
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def remove(self):
+        """Closes and deletes the journal of a capture that completed."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,240 @@
+import base64
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import requests
+from lxml import etree
+from urllib3.response import HTTPResponse
+
+
+CASSETTE_MODES = ["auto", "record", "replay"]
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """Raised on replay for a request that isn't in the cassette."""
+
+
+def request_operation(body):
+    """
+    Returns the name of the operation a SOAP request calls, e.g. 'getSkills',
+    or None when body isn't a SOAP envelope.
+    """
+    if not body:
+        return None
+    try:
+        envelope = etree.fromstring(body)
+    except etree.XMLSyntaxError:
+        return None
+    for soap_body in envelope.iter("{*}Body"):
+        for child in soap_body:
+            if isinstance(child.tag, str):
+                return etree.QName(child).localname
+    return None
+
+
+def _request_target(url):
+    # the host isn't part of the match so a cassette replays against any api_hostname
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+def _body_bytes(body):
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    return bytes(body)
+
+
+class Cassette:
+    """
+    Records the HTTP exchanges of a client to a file and replays them later
+    without a network.
+
+    A cassette is a gzip file of JSON lines, one per exchange, holding the
+    request method, path, a digest of the request body, the operation, the
+    response status, content type and body and how long the exchange took.
+    Every exchange is appended as its own gzip member as soon as it completes,
+    so a cassette survives a script that stops half way.  Credentials
+    (the Authorization header) are never written.
+
+    On replay a request is matched on its method, path and body.  The same
+    request recorded several times (polling isReportRunning) is answered in
+    the recorded order, repeating the last answer once they are used up.  A
+    request whose body differs from every recording (a timestamp in the
+    criteria) gets the next recorded response of the same operation.
+
+    Args:
+        path (str): The cassette file.
+        mode (str, optional): 'record' writes a new cassette, 'replay' reads one and 'auto'
+            replays when path exists and records otherwise. Defaults to 'auto'.
+        latency (float or str, optional): Latency added to every replayed exchange, seconds
+            or 'recorded' to wait as long as the recorded exchange took. Defaults to None (no wait).
+        sleep (callable, optional): Sleep function. Defaults to time.sleep.
+    """
+
+    def __init__(self, path, mode="auto", latency=None, sleep=time.sleep):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected one of {CASSETTE_MODES}")
+        if mode == "auto":
+            mode = "replay" if os.path.exists(path) else "record"
+
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.sleep = sleep
+        self.recorded = 0
+        self.replayed = 0
+        self._lock = threading.Lock()
+        self._by_request = defaultdict(deque)
+        self._by_operation = defaultdict(deque)
+
+        if self.replaying:
+            self._load()
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            with open(path, "wb") as cassette_file:
+                cassette_file.write(self._member({"version": CASSETTE_VERSION}))
+        logging.info(f"Cassette {path} opened to {self.mode}")
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    @staticmethod
+    def _member(entry):
+        return gzip.compress((json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8"))
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as cassette_file:
+            header = json.loads(cassette_file.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version {header.get('version')} in {self.path}")
+            for line in cassette_file:
+                entry = json.loads(line)
+                self._by_request[(entry["method"], entry["target"], entry["digest"])].append(entry)
+                self._by_operation[(entry["method"], entry["target"], entry["operation"])].append(entry)
+
+    @staticmethod
+    def _next(entries):
+        # the last answer is repeated once the recorded ones are used up
+        return entries.popleft() if len(entries) > 1 else entries[0]
+
+    def record(self, method, url, body, status, content_type, content, elapsed):
+        """
+        Appends an exchange to the cassette.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+            body (bytes): The request body.
+            status (int): The response status code.
+            content_type (str): The response Content-Type.
+            content (bytes): The response body.
+            elapsed (float): Seconds from sending the request to reading the whole response.
+        """
+        entry = {
+            "method": method,
+            "target": _request_target(url),
+            "digest": hashlib.sha1(body).hexdigest(),
+            "operation": request_operation(body),
+            "status": status,
+            "content_type": content_type,
+            "elapsed": round(elapsed, 6),
+        }
+        try:
+            entry["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_base64"] = base64.b64encode(content).decode("ascii")
+
+        member = self._member(entry)
+        with self._lock:
+            with open(self.path, "ab") as cassette_file:
+                cassette_file.write(member)
+            self.recorded += 1
+
+    def play(self, method, url, body):
+        """
+        Returns the recorded exchange answering a request, after the replay latency.
+
+        Raises:
+            CassetteMissError: When nothing was recorded for the request.
+        """
+        target = _request_target(url)
+        with self._lock:
+            entries = self._by_request.get((method, target, hashlib.sha1(body).hexdigest()))
+            if not entries:
+                operation = request_operation(body)
+                entries = self._by_operation.get((method, target, operation))
+                if not entries:
+                    raise CassetteMissError(
+                        f"No recorded response for {method} {target} ({operation}) in {self.path}"
+                    )
+                logging.debug(f"Cassette has no exact match, replaying the next {operation} response")
+            entry = self._next(entries)
+            self.replayed += 1
+
+        if self.latency == "recorded":
+            self.sleep(entry["elapsed"])
+        elif self.latency:
+            self.sleep(self.latency)
+        return entry
+
+
+class CassetteAdapter(requests.adapters.HTTPAdapter):
+    """
+    requests transport adapter that records the exchanges of a session to a
+    Cassette, or answers them from it.  Responses are always rebuilt from the
+    complete body so streamed reads (Five9Client.raw_call) behave the same
+    whether they are recorded, replayed or neither.
+
+    Args:
+        cassette (Cassette): The cassette to record to or replay from.
+        **kwargs: Passed to requests.adapters.HTTPAdapter (pool_connections, pool_maxsize...).
+    """
+
+    def __init__(self, cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(**kwargs)
+
+    def _build(self, request, status, content_type, content):
+        raw = HTTPResponse(
+            body=io.BytesIO(content),
+            headers={"Content-Type": content_type or "", "Content-Length": str(len(content))},
+            status=status,
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        body = _body_bytes(request.body)
+        if self.cassette.replaying:
+            entry = self.cassette.play(request.method, request.url, body)
+            if "body_base64" in entry:
+                content = base64.b64decode(entry["body_base64"])
+            else:
+                content = entry["body"].encode("utf-8")
+            return self._build(request, entry["status"], entry["content_type"], content)
+
+        start = time.perf_counter()
+        response = super().send(
+            request, stream=False, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+        )
+        content = response.content
+        elapsed = time.perf_counter() - start
+        content_type = response.headers.get("Content-Type")
+        self.cassette.record(
+            request.method, request.url, body, response.status_code, content_type, content, elapsed
+        )
+        return self._build(request, response.status_code, content_type, content)
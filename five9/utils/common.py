@@ -41,6 +41,14 @@ def parse_arguments(additional_args=None):
         help="Five9 host alias (us, ca, eu, frk, in)",
     )
 
+    parser.add_argument(
+        "--wsdlsource",
+        type=str,
+        default="remote",
+        choices=["remote", "bundled", "cache"],
+        help="Load the service definition from the API host (remote), the bundled WSDL or the local WSDL cache",
+    )
+
     if additional_args:
         for arg in additional_args:
             parser.add_argument(arg.pop("name"), **arg)
@@ -54,4 +62,5 @@ def create_five9_client(args):
         five9password=args.password,
         account=args.account_alias,
         api_hostname_alias=args.hostalias,
+        wsdl_source=args.wsdlsource,
     )
@@ -1,18 +1,31 @@
-import datetime
+import glob
+import hashlib
 import json
 import os
 import shutil
 import time
+import zlib
 
 from git import Repo
 import zeep
 
 from five9 import five9_session
+from . import snapshot_json
 from .campaign_profile_comprehension import demystify_filter
-
-API_SLEEP_INTERVAL = 0.3
+from .capture_journal import CaptureJournal
+from .domain_index import DomainIndex
+from .snapshot import SnapshotFiles, commit_snapshot
+from .snapshot_archive import ARCHIVE_EXTENSION, SnapshotArchive, SnapshotArchiveWriter
+from .snapshot_diff import diff_snapshots, object_kind
+from .snapshot_loader import GitSnapshot, LazyObjects, SnapshotDirectory, load_domain_objects, open_snapshot
 
 REPO_PATH = "domain_snapshots"
+# archives of the captures in the archive snapshot format, one folder per domain
+ARCHIVE_PATH = "domain_archives"
+# cross-reference indexes of the domains, see cross_reference_index
+INDEX_PATH = "domain_indexes"
+
+SNAPSHOT_FORMATS = ["files", "archive"]
 
 METHOD_DEFAULT_ARGS = {
     "getAgentGroups": ".*",
@@ -41,8 +54,41 @@ METHOD_DEPENDENCIES = {
     "getCampaignProfiles": ["getCampaigns"],
 }
 
+# Concurrent detail calls (getOutboundCampaign, getSkillsInfo...), within the domain's rate limits
+DEFAULT_MAX_WORKERS = 8
+
+# The checkpoint journal of a capture, in the snapshot's .git folder or the domain's archive folder
+JOURNAL_NAME = "five9_capture_journal.jsonl"
+
+# Methods listing the objects of detail calls, their list records are fingerprinted by changed_details_only
+DETAIL_LIST_METHODS = ["getCampaigns", "getCampaignProfiles", "getSkills"]
+
+# With changed_details_only, an unchanged object's detail is still read at least once in this many captures
+DEFAULT_DETAIL_REFRESH_PERIOD = 10
+
+
+def record_fingerprint(record):
+    """The sha1 of a list record (a zeep object or its dict) as a snapshot file would hold it."""
+    return hashlib.sha1(
+        snapshot_json.dumps(zeep.helpers.serialize_object(record, dict)).encode("utf-8")
+    ).hexdigest()
+
 
 class Five9DomainConfig:
+    # set in incremental mode, see getVCCConfiguration
+    snapshot_files = None
+    # set while get_domain_objects captures to an archive
+    snapshot_archive = None
+    archive_path = None
+    # the last capture of the domain, read by changed_details_only
+    previous_snapshot = None
+    # the checkpoints of the capture in progress, see get_domain_objects
+    capture_journal = None
+    # the snapshot read by an offline instance (see from_snapshot), or written by a streaming capture
+    snapshot = None
+    # the differences from sync_target_domain, see sync_to_target_domain
+    sync_diff = None
+
     def __init__(
         self,
         client=None,
@@ -52,18 +98,56 @@ class Five9DomainConfig:
         api_hostname_alias=None,
         sync_target_domain=None,
         methods=METHODS,
+        max_workers=DEFAULT_MAX_WORKERS,
+        incremental=False,
+        snapshot_format="files",
+        snapshot_path=None,
+        snapshot_rev=None,
+        changed_details_only=False,
+        detail_refresh_period=DEFAULT_DETAIL_REFRESH_PERIOD,
+        resume=False,
+        streaming=False,
     ):
+        if snapshot_format not in SNAPSHOT_FORMATS:
+            raise ValueError(f"Unknown snapshot format '{snapshot_format}', expected one of {SNAPSHOT_FORMATS}")
+        if incremental and snapshot_format != "files":
+            raise ValueError("Incremental captures are only supported in the 'files' snapshot format")
+        if detail_refresh_period < 1:
+            raise ValueError(f"detail_refresh_period must be at least 1, got {detail_refresh_period}")
+
         self.client = client
         self.sync_target_domain = sync_target_domain
         self.methods = methods
-
-        self.domain_objects = {}
+        self.max_workers = max_workers
+        # keep the previous snapshot and only write the files that changed
+        self.incremental = incremental
+        # 'files' writes a file per object in a git repository, 'archive' a single file per capture
+        self.snapshot_format = snapshot_format
+        # only read the details of objects whose list record changed since the last capture, and a
+        # rotating 1/detail_refresh_period of the others
+        self.changed_details_only = changed_details_only
+        self.detail_refresh_period = detail_refresh_period
+        # continue the last capture of the domain where it stopped, from its journal
+        self.resume = resume
+        # detail calls made and details taken from the previous capture by get_domain_objects
+        self.detail_calls = 0
+        self.details_reused = 0
+        self.details_resumed = 0
+
+        # write each object and release it, domain_objects reads them back from the snapshot
+        self.streaming = streaming
+        self.domain_objects = self._new_objects()
 
         self.domain_path = None
 
         self.vccConfig = None
+        self.domain_name = None
         self.repo = None
 
+        if snapshot_path is not None:
+            self._load_snapshot(snapshot_path, snapshot_rev)
+            return
+
         print("api_hostname_alias", api_hostname_alias)
 
         if client is None:
@@ -86,14 +170,74 @@ class Five9DomainConfig:
 
             self.getVCCConfiguration()
 
-    def sync_to_target_domain(self, sync_objects=[]):
-        """Method to run the domain object sync methods that are implemented.  If no sync_objects are provided, will run all sync methods"""
+    @classmethod
+    def from_snapshot(cls, snapshot_path, rev=None, **kwargs):
+        """
+        Returns a Five9DomainConfig for a captured domain, without a client or
+        any API call.  domain_objects holds what the capture stored, each
+        object read from the snapshot the first time it is used, so analysis
+        (demystify_campaign_profile_filters, syncing to a target domain...)
+        starts at once and only loads what it reads.
+
+        Args:
+            snapshot_path (str): A snapshot folder (domain_snapshots/<domain name>) or archive file.
+            rev (str, optional): A commit of the snapshot folder's repository, e.g. 'HEAD~1'.
+                Defaults to None, the files of the folder.
+            **kwargs: Passed to Five9DomainConfig, e.g. sync_target_domain.
+        """
+        return cls(snapshot_path=snapshot_path, snapshot_rev=rev, **kwargs)
+
+    def _load_snapshot(self, snapshot_path, rev=None):
+        self.snapshot = open_snapshot(snapshot_path, rev)
+        self.domain_name = self.snapshot.metadata.get("domain_name")
+        self.domain_objects = load_domain_objects(self.snapshot)
+        if os.path.isdir(snapshot_path) and rev is None:
+            self.domain_path = snapshot_path
+        else:
+            # where a file capture of the domain would be, for the files analysis writes
+            self.domain_path = os.path.join(os.getcwd(), "domain_snapshots", f"{self.domain_name}")
+        print(f"\nLoaded the domain snapshot of {self.domain_name} from:\n{snapshot_path}\n")
+
+    def cross_reference_index(self, index_path=None):
+        """
+        Returns the cross-reference index of the domain (which campaigns and IVRs use a
+        skill, which profiles filter on a contact field...), updated from domain_objects.
+        The index is saved between calls, so only the objects that changed since the last
+        one are read again.
+
+        Args:
+            index_path (str, optional): The index file. Defaults to domain_indexes/<domain name>.json
+                in the current working directory.
+
+        Returns:
+            DomainIndex: The index, see five9.utils.domain_index.
+        """
+        if index_path is None:
+            index_path = os.path.join(os.getcwd(), INDEX_PATH, f"{self.domain_name}.json")
+        index = DomainIndex.load(index_path).update(self)
+        index.save(index_path)
+        print(f"Cross-reference index of {self.domain_name}: {index.files_read} files read, saved to {index_path}")
+        return index
+
+    def sync_to_target_domain(self, sync_objects=[], diff=None):
+        """
+        Method to run the domain object sync methods that are implemented.  If no sync_objects are provided, will run all sync methods
+
+        Objects that are identical in the target domain's captured domain_objects are skipped.
+
+        Args:
+            sync_objects (list, optional): Keys of sync_methods, e.g. 'campaignProfiles'.
+            diff (SnapshotDiff, optional): The differences from the target domain to this one.
+                Defaults to None, comparing their domain_objects.
+        """
 
         self.sync_methods = {
             "campaignProfiles": self.sync_campaignProfiles,
         }
 
         if self.sync_target_domain is not None:
+            self.sync_diff = diff if diff is not None else diff_snapshots(self.sync_target_domain, self)
+            print(f"SYNC - {len(self.sync_diff)} objects differ from the target domain")
             if len(sync_objects) == 0:
                 sync_objects = self.sync_methods.keys()
             for sync_object in sync_objects:
@@ -105,6 +249,7 @@ class Five9DomainConfig:
         """Method to get the VCC Configuration for the domain and create the domain snapshot folder"""
 
         self.vccConfig = self.client.service.getVCCConfiguration()
+        self.domain_name = self.vccConfig.domainName
 
         # Use current working directory instead of hardcoded path
         current_working_directory = os.getcwd()
@@ -115,8 +260,21 @@ class Five9DomainConfig:
             f"{self.vccConfig.domainName}",
         )
 
+        if self.snapshot_format == "archive":
+            # objects are still addressed by their path in the snapshot folder, which isn't created
+            print(f"\nDomain snapshot archives for:\n{self.vccConfig.domainName}\n")
+            return
+
+        if os.path.exists(self.domain_path) and self.resume and os.path.exists(self._journal_path()):
+            # the files of the interrupted capture are kept and resumed from
+            print(f"\nResuming the interrupted capture of {self.vccConfig.domainName}:\n{self.domain_path}\n")
+
+        elif os.path.exists(self.domain_path) and self.incremental:
+            # keep the previous snapshot, only changed files are rewritten
+            print(f"\nUpdating the existing snapshot for {self.vccConfig.domainName}:\n{self.domain_path}\n")
+
         # delete the contents of the domain snapshot folder if it exists, except for the .git folder
-        if os.path.exists(self.domain_path):
+        elif os.path.exists(self.domain_path):
             print(
                 f"\nDeleting existing snapshot data for {self.vccConfig.domainName}:\n{self.domain_path}\n"
             )
@@ -147,6 +305,10 @@ class Five9DomainConfig:
             self.repo.index.commit("Initial Commit")
             print(f"Created new repo at {self.domain_path}")
 
+        # getVCCConfiguration runs again for every get_domain_objects, the files aren't read twice
+        if self.incremental and self.snapshot_files is None:
+            self.snapshot_files = SnapshotFiles(self.domain_path)
+
         print(f"\nDomain snapshot initialized for:\n{self.vccConfig.domainName}\n")
 
 
@@ -163,24 +325,12 @@ class Five9DomainConfig:
     ):
         output_string = ""
 
-        def fix_datetimes(obj):
-            if isinstance(obj, dict):
-                return {k: fix_datetimes(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [fix_datetimes(i) for i in obj]
-            elif isinstance(obj, datetime.datetime):
-                return obj.isoformat()
-            elif isinstance(obj, datetime.date):
-                return obj.isoformat()
-            else:
-                return obj
-
         if toJson == True:
             filetype = "json"
             try:
-                clean_object = fix_datetimes(domain_object)  # <= Only modifies datetime fields
-                output_string = json.dumps(
-                    clean_object,
+                # datetimes, decimals and bytes are converted as they are written
+                output_string = snapshot_json.dumps(
+                    domain_object,
                     sort_keys=sort_keys,
                     indent=indent
                 )
@@ -190,39 +340,209 @@ class Five9DomainConfig:
         else:
             output_string = domain_object
 
-        with open(f"{target_path}.{filetype}", "w") as outputFile:
-            outputFile.write(output_string)
-
+        self._write_file(f"{target_path}.{filetype}", output_string)
         return True
 
+    def _write_file(self, path, content, journal=True):
+        domain_prefix = os.path.join(self.domain_path, "")
+        if path.startswith(domain_prefix):
+            # os.path.relpath is slow for every file of a large domain
+            relative_path = path[len(domain_prefix):].replace(os.sep, "/")
+        else:
+            relative_path = os.path.relpath(path, self.domain_path).replace(os.sep, "/")
+        if self.snapshot_archive is not None:
+            self.snapshot_archive.add(relative_path, content)
+        elif self.snapshot_files is not None:
+            self.snapshot_files.write(path, content)
+        else:
+            with open(path, "w") as outputFile:
+                outputFile.write(content)
+        if journal and self.capture_journal is not None:
+            self.capture_journal.record_file(relative_path, content)
+
     def get_config_object_detail(
-        self, parent_method_name, subfolder_name, method_response=None, vcc_method=None
+        self,
+        parent_method_name,
+        subfolder_name,
+        method_response=None,
+        vcc_method=None,
+        max_workers=None,
     ):
+        """
+        Stores and writes one file per object of method_response, or per result of vcc_method
+        called with each object's name.  The vcc_method calls run on max_workers threads
+        (Five9Client.map, within the client's rate limits) and every result is written as soon
+        as it and the results before it are in, while the next calls are in flight.  Objects
+        are stored and written in the order of method_response, so the snapshot doesn't depend
+        on the number of workers.
+
+        With changed_details_only, the objects whose list record is the same as in the previous
+        capture take their detail from it instead of calling vcc_method, except for the rotating
+        share of them due for a refresh.
+
+        Args:
+            parent_method_name (str): The method that listed the objects, e.g. 'getCampaigns'.
+            subfolder_name (str): The snapshot folder for the objects, e.g. 'campaigns_outbound'.
+            method_response (list): The objects listed by parent_method_name.
+            vcc_method (str, optional): The method returning the detail of one object by name.
+            max_workers (int, optional): Concurrent vcc_method calls. Defaults to self.max_workers.
+
+        Raises:
+            zeep.exceptions.Fault: The first failed vcc_method call, after the objects before it are written.
+        """
         subfolder_path = os.path.join(self.domain_path, subfolder_name)
 
-        os.makedirs(os.path.dirname(subfolder_path), exist_ok=True)
+        if self.snapshot_archive is None:
+            os.makedirs(os.path.dirname(subfolder_path), exist_ok=True)
         print(f"\n\t{parent_method_name} - {subfolder_name}")
-        self.domain_objects[f"{parent_method_name}_{subfolder_name}"] = {}
+        # details captured before an interruption, restored from the journal
+        resumed = {}
+        if self.capture_journal is not None and self.capture_journal.resumed:
+            resumed = self.domain_objects.get(f"{parent_method_name}_{subfolder_name}", {})
+        detail_objects = self.domain_objects[f"{parent_method_name}_{subfolder_name}"] = self._new_objects()
 
-        for domain_object in method_response:
-            object_name = domain_object.name
+        def store(object_name, domain_object):
             print(f"\t\t{object_name}")
-            if vcc_method is not None:
-                sub_method = getattr(self.client.service, vcc_method)
-                domain_object = sub_method(object_name)
-                time.sleep(0.2)
-                # print(domain_object)
-            self.domain_objects[f"{parent_method_name}_{subfolder_name}"][
-                object_name
-            ] = zeep.helpers.serialize_object(domain_object, dict)
+            detail = zeep.helpers.serialize_object(domain_object, dict)
             target_path = os.path.join(subfolder_path, object_name)
-            os.makedirs(os.path.dirname(target_path), exist_ok=True)
-            self.write_object_to_target_path(
-                target_path,
-                self.domain_objects[f"{parent_method_name}_{subfolder_name}"][
-                    object_name
-                ],
+            if self.snapshot_archive is None:
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            self.write_object_to_target_path(target_path, detail)
+            self._keep(detail_objects, object_name, f"{subfolder_name}/{object_name}.json", detail)
+
+        method_response = method_response or []
+        if vcc_method is None:
+            for domain_object in method_response:
+                store(domain_object.name, domain_object)
+            self._prune(subfolder_path)
+            return
+
+        object_names = [domain_object.name for domain_object in method_response]
+        reused = self._reusable_details(parent_method_name, subfolder_name, method_response)
+        self.details_reused += len(reused)
+        resumed = {object_name: resumed[object_name] for object_name in object_names if object_name in resumed}
+        self.details_resumed += len(resumed)
+        reused.update(resumed)
+        self.detail_calls += len(object_names) - len(reused)
+        failed = []
+
+        def write_result(result):
+            # results arrive in order, nothing after a failed call is stored
+            if failed:
+                return
+            if result.fault is not None:
+                failed.append(result.fault)
+                return
+            store(result.payload, result.result)
+
+        self.client.map(
+            vcc_method,
+            [object_name for object_name in object_names if object_name not in reused],
+            max_workers=max_workers or self.max_workers,
+            progress=write_result,
+            stop_on_fault=True,
+        )
+        if failed:
+            raise failed[0]
+        if reused:
+            print(
+                f"\t\t{len(reused) - len(resumed)} unchanged since the previous capture, "
+                f"{len(resumed)} captured before the interruption"
             )
+            for object_name, detail in reused.items():
+                store(object_name, detail)
+            # in the order of method_response, as when every detail is read
+            if self.streaming:
+                detail_objects.reorder(object_names)
+            else:
+                ordered = {object_name: detail_objects[object_name] for object_name in object_names}
+                detail_objects.clear()
+                detail_objects.update(ordered)
+        self._prune(subfolder_path)
+
+    def _store_method_response(self, method, target_path, method_response):
+        domain_object = zeep.helpers.serialize_object(method_response, dict)
+        self.write_object_to_target_path(target_path, domain_object)
+        self._keep(self.domain_objects, method, f"{method}.json", domain_object)
+
+    def _new_objects(self):
+        return LazyObjects(keep_loaded=False) if self.streaming else {}
+
+    def _keep(self, objects, key, relative_path, value):
+        # in streaming mode the object is released once written, and read back from the snapshot
+        if self.streaming:
+            objects.set_loader(key, lambda: json.loads(self._read_back(relative_path)))
+        else:
+            objects[key] = value
+
+    def _read_back(self, relative_path):
+        if self.snapshot_archive is not None:
+            # the capture in progress
+            return self.snapshot_archive.read(relative_path)
+        return self.snapshot.read(relative_path)
+
+    def _set_snapshot(self, snapshot):
+        if self.snapshot is not None:
+            self.snapshot.close()
+        self.snapshot = snapshot
+
+    def _open_previous_snapshot(self):
+        # the last capture of the domain and the number of captures, (None, 0) for the first one
+        if self.snapshot_format == "archive":
+            archives = sorted(
+                glob.glob(
+                    os.path.join(
+                        glob.escape(os.path.join(os.getcwd(), ARCHIVE_PATH, f"{self.vccConfig.domainName}")),
+                        f"*{ARCHIVE_EXTENSION}",
+                    )
+                )
+            )
+            if archives:
+                return SnapshotArchive(archives[-1]), len(archives)
+        elif self.repo is not None and self.repo.head.is_valid():
+            return GitSnapshot(self.domain_path), int(self.repo.git.rev_list("--count", "HEAD"))
+        return None, 0
+
+    def _prepare_detail_reuse(self):
+        # fingerprints of the previous capture's list records, read before they are overwritten
+        self.previous_snapshot, captures = self._open_previous_snapshot()
+        self._refresh_slot = captures % self.detail_refresh_period
+        self._previous_fingerprints = {}
+        self._previous_paths = set()
+        if self.previous_snapshot is None:
+            print("No previous capture of the domain, every detail is read")
+            return
+        self._previous_paths = set(self.previous_snapshot.paths())
+        for method in DETAIL_LIST_METHODS:
+            if f"{method}.json" in self._previous_paths:
+                records = json.loads(self.previous_snapshot.read(f"{method}.json")) or []
+                self._previous_fingerprints[method] = {
+                    record["name"]: record_fingerprint(record)
+                    for record in records
+                    if isinstance(record, dict) and "name" in record
+                }
+
+    def _reusable_details(self, parent_method_name, subfolder_name, method_response):
+        # object name -> detail from the previous capture, for the objects whose detail isn't read
+        if self.previous_snapshot is None:
+            return {}
+        fingerprints = self._previous_fingerprints.get(parent_method_name, {})
+        reused = {}
+        for domain_object in method_response:
+            relative_path = f"{subfolder_name}/{domain_object.name}.json"
+            if (
+                relative_path in self._previous_paths
+                and zlib.crc32(domain_object.name.encode("utf-8")) % self.detail_refresh_period
+                != self._refresh_slot
+                and fingerprints.get(domain_object.name) == record_fingerprint(domain_object)
+            ):
+                reused[domain_object.name] = json.loads(self.previous_snapshot.read(relative_path))
+        return reused
+
+    def _prune(self, subfolder_path):
+        # every object of the subfolder was captured, the files left over are deleted objects
+        if self.snapshot_files is not None and os.path.isdir(subfolder_path):
+            self.snapshot_files.prune(subfolder_path)
 
     def get_domain_objects(self, methods=None):
         if methods is None:
@@ -230,17 +550,53 @@ class Five9DomainConfig:
         if self.client is not None:
             try:
                 self.getVCCConfiguration()
+                if self.snapshot_files is not None:
+                    self.snapshot_files.start()
+                self.detail_calls = 0
+                self.details_reused = 0
+                self.details_resumed = 0
+                if self.snapshot_format == "archive":
+                    self.archive_path = os.path.join(
+                        os.getcwd(),
+                        ARCHIVE_PATH,
+                        f"{self.vccConfig.domainName}",
+                        f"{time.strftime('%Y%m%d-%H%M%S')}{ARCHIVE_EXTENSION}",
+                    )
+                    self.snapshot_archive = SnapshotArchiveWriter(
+                        self.archive_path,
+                        metadata={
+                            "domain_name": self.vccConfig.domainName,
+                            "captured": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        },
+                    )
+                self.capture_journal = CaptureJournal(
+                    self._journal_path(),
+                    root=self.domain_path,
+                    keep_contents=self.snapshot_archive is not None,
+                    resume=self.resume,
+                    metadata={"domain_name": self.vccConfig.domainName},
+                )
+                if self.streaming and self.snapshot_archive is None:
+                    self._set_snapshot(SnapshotDirectory(self.domain_path))
+                if self.capture_journal.resumed:
+                    self._restore_from_journal()
+                if self.changed_details_only:
+                    self._prepare_detail_reuse()
 
                 print("Processing Domain Object Methods")
                 for method in self.client.service._operations.keys():
                     if method in methods:
+                        if method in self.capture_journal.methods:
+                            print(f"\t{method} (captured before the interruption)")
+                            continue
                         print(f"\t{method}")
                         vcc_method = getattr(self.client.service, method)
                         target_path_for_method = os.path.join(self.domain_path, method)
                         # create directory for the target path
-                        os.makedirs(
-                            os.path.dirname(target_path_for_method), exist_ok=True
-                        )
+                        if self.snapshot_archive is None:
+                            os.makedirs(
+                                os.path.dirname(target_path_for_method), exist_ok=True
+                            )
 
                         try:
                             if method in METHOD_DEFAULT_ARGS.keys():
@@ -256,12 +612,7 @@ class Five9DomainConfig:
                                 )
 
                             elif method == "getCampaigns":
-                                self.domain_objects[
-                                    method
-                                ] = zeep.helpers.serialize_object(method_response, dict)
-                                self.write_object_to_target_path(
-                                    target_path_for_method, self.domain_objects[method]
-                                )
+                                self._store_method_response(method, target_path_for_method, method_response)
                                 method_response = vcc_method(campaignType="OUTBOUND")
                                 self.get_config_object_detail(
                                     method,
@@ -278,12 +629,7 @@ class Five9DomainConfig:
                                 )
 
                             elif method == "getCampaignProfiles":
-                                self.domain_objects[
-                                    method
-                                ] = zeep.helpers.serialize_object(method_response, dict)
-                                self.write_object_to_target_path(
-                                    target_path_for_method, self.domain_objects[method]
-                                )
+                                self._store_method_response(method, target_path_for_method, method_response)
                                 self.get_config_object_detail(
                                     method,
                                     "campaign_profile_filters",
@@ -294,12 +640,7 @@ class Five9DomainConfig:
                                 self.demystify_campaign_profile_filters()
 
                             elif method == "getSkills":
-                                self.domain_objects[
-                                    method
-                                ] = zeep.helpers.serialize_object(method_response, dict)
-                                self.write_object_to_target_path(
-                                    target_path_for_method, self.domain_objects[method]
-                                )
+                                self._store_method_response(method, target_path_for_method, method_response)
                                 self.get_config_object_detail(
                                     method,
                                     "skills_info",
@@ -308,37 +649,129 @@ class Five9DomainConfig:
                                 )
 
                             else:
-                                self.domain_objects[
-                                    method
-                                ] = zeep.helpers.serialize_object(method_response, dict)
-                                self.write_object_to_target_path(
-                                    target_path_for_method, self.domain_objects[method]
-                                )
+                                self._store_method_response(method, target_path_for_method, method_response)
+
+                            self.capture_journal.complete_method(method)
 
                         except zeep.exceptions.Fault as e:
                             print("Error: ")
                             print(e)
 
-                # add changes to the git repo and commit
-                # print the repo status and path
-                print(f"Git Status: {self.repo.git.status()}")
-                self.repo.git.add(A=True)
-                self.repo.index.commit(
-                    f"Domain Object Sync {time.strftime('%Y-%m-%d %H:%M:%S')}"
+                self._finish_journal(methods)
+                if self.snapshot_archive is not None:
+                    self.snapshot_archive.close()
+                    print(f"Archived {len(self.snapshot_archive.paths)} files to {self.archive_path}")
+                    if self.streaming:
+                        self._set_snapshot(SnapshotArchive(self.archive_path))
+                    self._print_detail_reuse()
+                    self.snapshot_archive = None
+                    return
+
+                # add changes to the git repo and commit, only the changed files when they are known
+                changed_paths = None
+                if self.snapshot_files is not None:
+                    print(
+                        f"Snapshot files: {len(self.snapshot_files.changed)} written, "
+                        f"{len(self.snapshot_files.removed)} removed, "
+                        f"{len(self.snapshot_files.written) - len(self.snapshot_files.changed)} unchanged"
+                    )
+                    if self.snapshot_files.in_sync:
+                        changed_paths = self.snapshot_files.changed | self.snapshot_files.removed
+                commit = commit_snapshot(
+                    self.repo,
+                    f"Domain Object Sync {time.strftime('%Y-%m-%d %H:%M:%S')}",
+                    changed_paths,
                 )
+                print(f"Committed {commit[:10]} in {self.domain_path}")
+                self._print_detail_reuse()
+                if self.snapshot_files is not None:
+                    self.snapshot_files.save()
 
             except zeep.exceptions.Fault as e:
                 print(e)
+            finally:
+                # the capture failed, no partial archive is kept
+                if self.snapshot_archive is not None:
+                    self.snapshot_archive.abort()
+                    self.snapshot_archive = None
+                if self.previous_snapshot is not None:
+                    self.previous_snapshot.close()
+                    self.previous_snapshot = None
+                if self.capture_journal is not None:
+                    self.capture_journal.close()
+                    self.capture_journal = None
         else:
             print("No active client object available to connect with Five9 VCC")
 
+    def _journal_path(self):
+        if self.snapshot_format == "archive":
+            return os.path.join(os.getcwd(), ARCHIVE_PATH, f"{self.vccConfig.domainName}", JOURNAL_NAME)
+        return os.path.join(self.domain_path, ".git", JOURNAL_NAME)
+
+    def _restore_from_journal(self):
+        # the objects of the interrupted capture, written to this one without calling their methods again
+        journal = self.capture_journal
+        print(
+            f"Resuming from {journal.path}, started {journal.metadata.get('started')}: "
+            f"{len(journal.methods)} methods and {len(journal.files)} files already captured"
+        )
+        for relative_path in journal.files:
+            content = journal.read(relative_path)
+            path = os.path.join(self.domain_path, *relative_path.split("/"))
+            if self.snapshot_archive is None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write_file(path, content, journal=False)
+            kind, name = object_kind(relative_path)
+            if kind is None:
+                continue
+            value = None if self.streaming else json.loads(content)
+            if name is None:
+                self._keep(self.domain_objects, kind, relative_path, value)
+            else:
+                self._keep(self.domain_objects.setdefault(kind, self._new_objects()), name, relative_path, value)
+
+    def _finish_journal(self, methods):
+        # a capture with failed methods keeps its journal, resume=True then only captures those
+        incomplete = [
+            method
+            for method in self.client.service._operations.keys()
+            if method in methods and method not in self.capture_journal.methods
+        ]
+        if incomplete:
+            print(
+                f"Capture incomplete, {', '.join(incomplete)} failed: capture again with resume=True "
+                f"(--resume) to only capture them"
+            )
+            self.capture_journal.close()
+        else:
+            self.capture_journal.remove()
+        self.capture_journal = None
+
+    def _print_detail_reuse(self):
+        if self.changed_details_only:
+            print(
+                f"Detail calls: {self.detail_calls} made, "
+                f"{self.details_reused} unchanged objects taken from the previous capture"
+            )
+
     def sync_contactFields(self):
         pass
 
+    def _differs_from_target(self, *kinds, name):
+        # objects the diff found identical in the target domain don't need syncing
+        if self.sync_diff is None:
+            return True
+        return any(self.sync_diff.get(kind, name) is not None for kind in kinds)
+
     def sync_campaignProfiles(self):
         for profile in self.domain_objects["getCampaignProfiles"]:
             description = profile["description"] or ""
             if description.find("--sync") > -1:
+                if not self._differs_from_target(
+                    "getCampaignProfiles", "getCampaignProfiles_campaign_profile_filters", name=profile["name"]
+                ):
+                    print(f'\t\t\tSYNC (unchanged): {profile["name"]}')
+                    continue
                 try:
                     self.sync_target_domain.client.service.createCampaignProfile(
                         profile
@@ -416,7 +849,8 @@ class Five9DomainConfig:
             self.domain_path, "campaign_profile_filters_demystified"
         )
 
-        os.makedirs(subfolder_path, exist_ok=True)
+        if self.snapshot_archive is None:
+            os.makedirs(subfolder_path, exist_ok=True)
         print(
             f"\n\n********** Demystifying campaign profile filters to\n{subfolder_path}"
         )
@@ -432,3 +866,4 @@ class Five9DomainConfig:
                 self.write_object_to_target_path(
                     target_path=target_filename, domain_object=demystified, toJson=False, filetype="sql"
                 )
+        self._prune(subfolder_path)
@@ -0,0 +1,333 @@
+"""
+Cross-reference index of a captured domain.
+
+    python -m five9.utils.domain_index "domain_snapshots/My Domain" --used-by skill "Sales"
+    python -m five9.utils.domain_index my_domain.f9snap --used-by contact_field state --transitive
+
+The index answers which objects use a skill, an IVR script, a prompt, a
+call variable, a contact field or a campaign profile, with one dictionary
+lookup:
+
+    index = DomainIndex.build("domain_snapshots/My Domain")
+    index.used_by(SKILL, "Sales")
+    # {('getIVRScripts_ivrs', 'Main Menu')}
+    index.used_by(SKILL, "Sales", transitive=True)
+    # also the campaigns whose IVR schedule runs Main Menu
+
+Objects are named as in snapshot_diff, by their domain_objects key and
+name.  References are read from:
+
+    IVR scripts          skills of skill transfers, prompts, call variables (xmlDefinition)
+    campaigns            campaign profile, IVR scripts of the schedules
+    profile filters      contact fields of the criteria and the order by fields
+    user profiles        skills
+
+The index keeps the content digest of every file it read, update() then
+only reads the files that changed since, and save() / load() keep it
+between runs.
+"""
+import argparse
+import json
+import os
+import xml.etree.ElementTree as ET
+
+from .snapshot_diff import object_kind, object_name, snapshot_source
+
+
+INDEX_VERSION = 1
+
+# what objects are referenced as
+SKILL = "skill"
+IVR = "ivr"
+PROMPT = "prompt"
+VARIABLE = "variable"
+CONTACT_FIELD = "contact_field"
+CAMPAIGN_PROFILE = "campaign_profile"
+
+# objects that are themselves referenced, followed by used_by(..., transitive=True)
+REFERENCED_AS = {
+    "getIVRScripts_ivrs": IVR,
+    "getCampaignProfiles_campaign_profile_filters": CAMPAIGN_PROFILE,
+}
+
+
+def ivr_references(ivr):
+    """The (kind, name) references of an IVR script, from its xmlDefinition."""
+    references = set()
+    try:
+        root = ET.fromstring(ivr.get("xmlDefinition") or "<ivrScript/>")
+    except ET.ParseError:
+        return references
+    for skill_transfer in root.iter("skillTransfer"):
+        for external_object in skill_transfer.iter("extrnalObj"):
+            name = external_object.findtext("name")
+            if name:
+                references.add((SKILL, name))
+    for prompt in root.iter("prompt"):
+        name = prompt.findtext("name")
+        if name:
+            references.add((PROMPT, name))
+    for variable in root.iter("variableName"):
+        # group.name, as in ivr_utils.ivr_variable_usage
+        if variable.text and "." in variable.text:
+            references.add((VARIABLE, variable.text))
+    return references
+
+
+def _script_names(value):
+    # the scriptName of every IVR schedule, at any depth
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == "scriptName" and isinstance(item, str):
+                yield item
+            else:
+                yield from _script_names(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _script_names(item)
+
+
+def campaign_references(campaign):
+    """The (kind, name) references of a campaign's detail."""
+    references = {(IVR, name) for name in _script_names(campaign)}
+    if campaign.get("profileName"):
+        references.add((CAMPAIGN_PROFILE, campaign["profileName"]))
+    return references
+
+
+def profile_filter_references(profile_filter):
+    """The (kind, name) references of a campaign profile filter."""
+    references = set()
+    for criterion in profile_filter.get("crmCriteria") or []:
+        if criterion.get("leftValue"):
+            references.add((CONTACT_FIELD, criterion["leftValue"]))
+    for field in profile_filter.get("orderByFields") or []:
+        if field.get("fieldName"):
+            references.add((CONTACT_FIELD, field["fieldName"]))
+    return references
+
+
+def user_profile_references(user_profile):
+    """The (kind, name) references of a user profile."""
+    return {(SKILL, name) for name in user_profile.get("skills") or [] if isinstance(name, str)}
+
+
+# domain_objects key -> function returning the references of one of its objects
+EXTRACTORS = {
+    "getIVRScripts_ivrs": ivr_references,
+    "getCampaigns_campaigns_inbound": campaign_references,
+    "getCampaigns_campaigns_outbound": campaign_references,
+    "getCampaignProfiles_campaign_profile_filters": profile_filter_references,
+    "getUserProfiles": user_profile_references,
+}
+
+
+class DomainIndex:
+    """
+    The references between the objects of a domain snapshot, in both
+    directions.
+
+    Attributes:
+        digest_kind (str): The kind of digests of the files read, see snapshot_loader.
+        files_read (int): The files read by the last update().
+    """
+
+    def __init__(self):
+        self.digest_kind = None
+        self.files_read = 0
+        # relative path -> [digest, [source, ...]], source: (domain_objects key, object name)
+        self._files = {}
+        self._references = {}
+        self._used_by = {}
+
+    @classmethod
+    def build(cls, snapshot, rev=None):
+        """
+        Returns the index of a snapshot.
+
+        Args:
+            snapshot: A Five9DomainConfig, a snapshot folder, archive or, with rev, the
+                snapshot folder of a commit.
+            rev (str, optional): A commit of the snapshot folder's repository.
+        """
+        index = cls()
+        index.update(snapshot, rev)
+        return index
+
+    def __len__(self):
+        return len(self._references)
+
+    def used_by(self, kind, name, transitive=False):
+        """
+        The objects referencing an object.
+
+        Args:
+            kind (str): SKILL, IVR, PROMPT, VARIABLE, CONTACT_FIELD or CAMPAIGN_PROFILE.
+            name (str): The name of the object.
+            transitive (bool, optional): Also the objects referencing those, e.g. the campaigns
+                running an IVR script that transfers to a skill. Defaults to False.
+
+        Returns:
+            set: (domain_objects key, object name) of the referencing objects.
+        """
+        found = set(self._used_by.get((kind, name), ()))
+        if not transitive:
+            return found
+        pending = list(found)
+        while pending:
+            source_kind, source_name = pending.pop()
+            if source_kind in REFERENCED_AS:
+                for source in self._used_by.get((REFERENCED_AS[source_kind], source_name), ()):
+                    if source not in found:
+                        found.add(source)
+                        pending.append(source)
+        return found
+
+    def references(self, source_kind, name):
+        """The (kind, name) references of an object, by its domain_objects key and name."""
+        return set(self._references.get((source_kind, name), ()))
+
+    def names(self, kind):
+        """The sorted names of the referenced objects of a kind, e.g. every variable used."""
+        return sorted(name for referenced_kind, name in self._used_by if referenced_kind == kind)
+
+    def _add(self, relative_path, digest, value):
+        kind, name = object_kind(relative_path)
+        if name is None:
+            objects = {object_name(item): item for item in value or [] if object_name(item) is not None}
+        else:
+            objects = {name: value}
+        sources = []
+        for item_name, item in objects.items():
+            source = (kind, item_name)
+            references = EXTRACTORS[kind](item) if isinstance(item, dict) else set()
+            self._references[source] = references
+            for reference in references:
+                self._used_by.setdefault(reference, set()).add(source)
+            sources.append(source)
+        self._files[relative_path] = [digest, sources]
+
+    def _remove(self, relative_path):
+        _, sources = self._files.pop(relative_path, (None, []))
+        for source in sources:
+            for reference in self._references.pop(source, ()):
+                users = self._used_by.get(reference)
+                if users is not None:
+                    users.discard(source)
+                    if not users:
+                        del self._used_by[reference]
+
+    def update(self, snapshot, rev=None):
+        """
+        Brings the index up to date with a snapshot, reading only the files
+        whose digest changed since the last update (all of them when the
+        snapshot's digests are of another kind).
+
+        Args:
+            snapshot: As for build().
+            rev (str, optional): A commit of the snapshot folder's repository.
+
+        Returns:
+            DomainIndex: self, files_read holds the number of files read.
+        """
+        opened = isinstance(snapshot, str)
+        source = snapshot_source(snapshot, rev)
+        try:
+            digest_kind = getattr(source, "digest_kind", None)
+            if digest_kind is None or digest_kind != self.digest_kind:
+                # digests that can't be compared, everything is read again
+                for relative_path in list(self._files):
+                    self._remove(relative_path)
+                self.digest_kind = digest_kind
+            paths = [path for path in source.paths() if object_kind(path)[0] in EXTRACTORS]
+            for relative_path in self._files.keys() - set(paths):
+                self._remove(relative_path)
+            self.files_read = 0
+            for relative_path in paths:
+                digest = source.digest(relative_path) if digest_kind is not None else None
+                entry = self._files.get(relative_path)
+                if digest is not None and entry is not None and entry[0] == digest:
+                    continue
+                self._remove(relative_path)
+                if hasattr(source, "load"):
+                    value = source.load(relative_path)
+                else:
+                    value = json.loads(source.read(relative_path))
+                self._add(relative_path, digest, value)
+                self.files_read += 1
+        finally:
+            if opened:
+                source.close()
+        return self
+
+    def save(self, path):
+        """Writes the index to a file, read back with load()."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        files = {
+            relative_path: {
+                "digest": digest,
+                "objects": [
+                    [source_kind, source_name, sorted(self._references[(source_kind, source_name)])]
+                    for source_kind, source_name in sources
+                ],
+            }
+            for relative_path, (digest, sources) in self._files.items()
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as index_file:
+            json.dump(
+                {"version": INDEX_VERSION, "digest_kind": self.digest_kind, "files": files},
+                index_file,
+                sort_keys=True,
+                separators=(",", ":"),
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Returns the index saved to a file, an empty one when there is none or it is outdated."""
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with open(path) as index_file:
+            saved = json.load(index_file)
+        if saved.get("version") != INDEX_VERSION:
+            return index
+        index.digest_kind = saved["digest_kind"]
+        for relative_path, entry in saved["files"].items():
+            sources = []
+            for source_kind, source_name, references in entry["objects"]:
+                source = (source_kind, source_name)
+                index._references[source] = {tuple(reference) for reference in references}
+                for reference in index._references[source]:
+                    index._used_by.setdefault(reference, set()).add(source)
+                sources.append(source)
+            index._files[relative_path] = [entry["digest"], sources]
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Finds the objects of a domain snapshot using an object")
+    parser.add_argument("snapshot", help="snapshot folder or archive")
+    parser.add_argument("--rev", default=None, help="commit of the snapshot folder")
+    parser.add_argument("--index", default=None, help="index file, kept up to date between runs")
+    parser.add_argument(
+        "--used-by",
+        nargs=2,
+        metavar=("KIND", "NAME"),
+        required=True,
+        help=f"the object, KIND is one of {SKILL}, {IVR}, {PROMPT}, {VARIABLE}, {CONTACT_FIELD}, {CAMPAIGN_PROFILE}",
+    )
+    parser.add_argument("--transitive", action="store_true", help="also the objects using those")
+    args = parser.parse_args()
+
+    index = DomainIndex.load(args.index) if args.index else DomainIndex()
+    index.update(args.snapshot, args.rev)
+    if args.index:
+        index.save(args.index)
+    for source_kind, source_name in sorted(index.used_by(*args.used_by, transitive=args.transitive)):
+        print(f"{source_kind} {source_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Captures of several domains at the same time, one process per domain.
+
+    from five9.utils import fleet_capture
+    captures = fleet_capture.capture_fleet(incremental=True)
+
+Each domain is captured by its own Five9Client, so it keeps its own
+connection pool and rate limits; the accounts come from
+private.credentials.ACCOUNTS, whose entries may also hold Five9Client
+settings for their domain, e.g. 'api_hostname_alias': 'eu'.  Aliases of
+the same domain (default_account is often a copy of another alias) are
+captured once, so two processes never write the same snapshot folder.
+"""
+import collections
+import contextlib
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from five9 import five9_session
+from .domain_capture import Five9DomainConfig
+
+# per tenant capture output, in the current working directory like domain_snapshots
+FLEET_LOG_PATH = "fleet_capture_logs"
+
+# the placeholder written by setup.py to private/credentials.py
+PLACEHOLDER_USERNAME = "apiUserUsername"
+
+TenantCapture = collections.namedtuple(
+    "TenantCapture",
+    ["alias", "domain_name", "objects", "calls", "faults", "error", "seconds", "log_path", "same_domain_as"],
+    defaults=(None,),
+)
+
+
+def fleet_aliases(accounts=None):
+    """The aliases of accounts (private.credentials.ACCOUNTS) that have credentials."""
+    accounts = five9_session.ACCOUNTS if accounts is None else accounts
+    return [
+        alias
+        for alias, account in accounts.items()
+        if account.get("username") and account.get("username") != PLACEHOLDER_USERNAME
+    ]
+
+
+def _client_kwargs(client_kwargs, account):
+    # the Five9Client settings of the account win over those of the fleet
+    return {
+        **client_kwargs,
+        **{key: value for key, value in account.items() if key not in ("username", "password")},
+    }
+
+
+def _domain_name(username, password, client_kwargs):
+    # a single getVCCConfiguration, to capture every domain once
+    client = five9_session.Five9Client(five9username=username, five9password=password, **client_kwargs)
+    return client.domain_name
+
+
+def _object_count(domain_config):
+    # the items of every method response and the detail files, not the keys of domain_objects
+    count = 0
+    for key, value in domain_config.domain_objects.items():
+        if key not in domain_config.methods or isinstance(value, list):
+            count += len(value)
+        elif value is not None:
+            count += 1
+    return count
+
+
+def _capture_tenant(alias, username, password, client_kwargs, config_kwargs, log_path):
+    # runs in its own process: its own client, connection pool and rate limits
+    start = time.monotonic()
+    domain_name = None
+    client = None
+    error = None
+    objects = 0
+    with open(log_path, "w") as log_file, contextlib.redirect_stdout(log_file), contextlib.redirect_stderr(log_file):
+        try:
+            client = five9_session.Five9Client(
+                five9username=username, five9password=password, **client_kwargs
+            )
+            domain_config = Five9DomainConfig(client=client, **config_kwargs)
+            domain_name = domain_config.domain_name
+            domain_config.get_domain_objects()
+            objects = _object_count(domain_config)
+        except Exception as e:
+            traceback.print_exc()
+            error = f"{type(e).__name__}: {e}"
+
+    operation_metrics = client.metrics() if client is not None else {}
+    return TenantCapture(
+        alias=alias,
+        domain_name=domain_name,
+        objects=objects,
+        calls=sum(operation["calls"] for operation in operation_metrics.values()),
+        faults=sum(operation["faults"] for operation in operation_metrics.values()),
+        error=error,
+        seconds=time.monotonic() - start,
+        log_path=log_path,
+    )
+
+
+def capture_fleet(
+    aliases=None,
+    max_processes=None,
+    accounts=None,
+    client_kwargs=None,
+    progress=None,
+    **config_kwargs,
+):
+    """
+    Captures the domains of several accounts at the same time, each in its
+    own process with its own client, so every tenant gets its own connection
+    pool and rate limits and the fleet takes about as long as its slowest
+    tenant.  The output of every capture goes to
+    fleet_capture_logs/<timestamp>/<alias>.log.
+
+    The domain of every alias is read first (getVCCConfiguration) and a
+    domain shared by several aliases is only captured by the first of them.
+
+    Args:
+        aliases (list, optional): Aliases of accounts. Defaults to every alias with credentials.
+        max_processes (int, optional): Tenants captured at the same time. Defaults to all of them.
+        accounts (dict, optional): Alias -> {'username', 'password'} and any Five9Client
+            settings of the alias. Defaults to private.credentials.ACCOUNTS.
+        client_kwargs (dict, optional): Passed to every Five9Client, e.g. api_hostname_alias.
+        progress (callable, optional): Called with each TenantCapture as it finishes.
+            Defaults to printing a line per tenant.
+        **config_kwargs: Passed to every Five9DomainConfig, e.g. incremental=True.
+
+    Returns:
+        list: A TenantCapture per alias, in the order of aliases.  error is None for the
+            captures that succeeded; objects counts the listed objects and the detail files,
+            faults the failed calls of every capture.  The aliases of a domain captured by
+            another alias have that alias in same_domain_as and its objects, error and log_path.
+    """
+    accounts = five9_session.ACCOUNTS if accounts is None else accounts
+    aliases = fleet_aliases(accounts) if aliases is None else list(aliases)
+    client_kwargs = client_kwargs or {}
+    log_folder = os.path.join(os.getcwd(), FLEET_LOG_PATH, time.strftime("%Y%m%d-%H%M%S"))
+    os.makedirs(log_folder, exist_ok=True)
+
+    if progress is None:
+        def progress(capture):
+            if capture.same_domain_as:
+                print(
+                    f"[{len(results)}/{len(aliases)}] {capture.alias} ({capture.domain_name}): "
+                    f"same domain as {capture.same_domain_as}, captured once"
+                )
+                return
+            status = f"failed, {capture.error}" if capture.error else f"{capture.objects} objects"
+            print(
+                f"[{len(results)}/{len(aliases)}] {capture.alias} ({capture.domain_name}): {status}, "
+                f"{capture.calls} calls, {capture.faults} faults in {capture.seconds:.1f}s"
+            )
+
+    results = {}
+    pending = {}
+    for alias in aliases:
+        account = accounts.get(alias, {})
+        if account.get("username") in (None, "", PLACEHOLDER_USERNAME):
+            # a process would prompt for credentials
+            results[alias] = TenantCapture(
+                alias, None, 0, 0, 0, f"No credentials for '{alias}' in ACCOUNTS", 0.0, None
+            )
+            progress(results[alias])
+            continue
+        pending[alias] = account
+
+    # alias -> the alias capturing its domain
+    same_domain_as = {}
+    if pending:
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            domain_names = {
+                alias: executor.submit(
+                    _domain_name, account["username"], account.get("password"), _client_kwargs(client_kwargs, account)
+                )
+                for alias, account in pending.items()
+            }
+        capturing_aliases = {}
+        for alias, domain_name in domain_names.items():
+            try:
+                domain_name = domain_name.result()
+            except Exception as e:
+                # the capture would fail the same way
+                results[alias] = TenantCapture(alias, None, 0, 0, 0, f"{type(e).__name__}: {e}", 0.0, None)
+                progress(results[alias])
+                del pending[alias]
+                continue
+            if domain_name in capturing_aliases:
+                same_domain_as[alias] = capturing_aliases[domain_name]
+                del pending[alias]
+            else:
+                capturing_aliases[domain_name] = alias
+
+    if pending:
+        # spawned rather than forked, the parent may be running threads
+        with ProcessPoolExecutor(
+            max_workers=min(max_processes or len(pending), len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _capture_tenant,
+                    alias,
+                    account["username"],
+                    account.get("password"),
+                    _client_kwargs(client_kwargs, account),
+                    config_kwargs,
+                    os.path.join(log_folder, f"{alias}.log"),
+                ): alias
+                for alias, account in pending.items()
+            }
+            for future in as_completed(futures):
+                alias = futures[future]
+                try:
+                    results[alias] = future.result()
+                except Exception as e:
+                    # the process itself failed
+                    results[alias] = TenantCapture(alias, None, 0, 0, 0, f"{type(e).__name__}: {e}", 0.0, None)
+                progress(results[alias])
+
+    for alias, capturing_alias in same_domain_as.items():
+        results[alias] = results[capturing_alias]._replace(
+            alias=alias, calls=0, faults=0, seconds=0.0, same_domain_as=capturing_alias
+        )
+        progress(results[alias])
+
+    return [results[alias] for alias in aliases]
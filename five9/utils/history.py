@@ -0,0 +1,99 @@
+import contextvars
+import itertools
+import threading
+from collections import deque
+
+from lxml import etree
+from zeep.plugins import Plugin
+
+
+# the exchange recorded for the call in progress, per thread and per asyncio task
+_current_exchange = contextvars.ContextVar("five9_history_exchange", default=None)
+
+
+def format_envelope(envelope):
+    """
+    Pretty prints a SOAP envelope.
+
+    Args:
+        envelope (lxml.etree._Element): The envelope.
+
+    Returns:
+        str: The envelope as an indented XML string.
+    """
+    return etree.tostring(envelope, encoding="unicode", pretty_print=True)
+
+
+class Five9HistoryPlugin(Plugin):
+    """
+    Drop-in replacement for zeep's HistoryPlugin that bounds what it keeps.
+    Envelopes are stored as received and only formatted when they are read.
+
+    Args:
+        maxlen (int, optional): The number of exchanges kept, oldest first out.
+            0 disables the history. Defaults to 1.
+        sample_every (int, optional): Only record every sample_every-th exchange. Defaults to 1 (all).
+    """
+
+    def __init__(self, maxlen=1, sample_every=1):
+        self.maxlen = maxlen
+        self.sample_every = max(int(sample_every), 1)
+        self._buffer = deque([], maxlen)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.maxlen is None or self.maxlen > 0
+
+    @property
+    def last_sent(self):
+        """The most recent recorded request as a dict of envelope and http_headers, or None."""
+        exchange = self.last_exchange
+        if exchange:
+            return exchange["sent"]
+        return None
+
+    @property
+    def last_received(self):
+        """The most recent recorded response as a dict of envelope and http_headers, or None."""
+        exchange = self.last_exchange
+        if exchange:
+            return exchange["received"]
+        return None
+
+    @property
+    def last_exchange(self):
+        with self._lock:
+            return self._buffer[-1] if self._buffer else None
+
+    @property
+    def exchanges(self):
+        """The recorded exchanges, oldest first."""
+        with self._lock:
+            return list(self._buffer)
+
+    def clear(self):
+        with self._lock:
+            self._buffer.clear()
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        exchange = None
+        if self.enabled and next(self._counter) % self.sample_every == 0:
+            exchange = {
+                "operation": operation.name,
+                "sent": {"envelope": envelope, "http_headers": http_headers},
+                "received": None,
+            }
+            with self._lock:
+                self._buffer.append(exchange)
+        _current_exchange.set(exchange)
+        return envelope, http_headers
+
+    def ingress(self, envelope, http_headers, operation):
+        # matched to the request of the same thread/task, concurrent calls don't mix up
+        exchange = _current_exchange.get()
+        if exchange is not None:
+            exchange["received"] = {"envelope": envelope, "http_headers": http_headers}
+            _current_exchange.set(None)
+        return envelope, http_headers
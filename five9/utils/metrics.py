@@ -0,0 +1,194 @@
+import bisect
+import contextvars
+import json
+import threading
+import time
+from collections import deque
+
+from lxml import etree
+from zeep.plugins import Plugin
+
+
+# upper bounds (seconds) of the latency histogram buckets, Prometheus style
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# number of recent latencies per operation used for the percentiles
+LATENCY_SAMPLES = 1000
+
+SOAP_FAULT_PATH = "{http://schemas.xmlsoap.org/soap/envelope/}Body/{http://schemas.xmlsoap.org/soap/envelope/}Fault"
+
+# start time and operation of the call in progress, per thread and per asyncio task
+_current_call = contextvars.ContextVar("five9_metrics_call", default=None)
+
+
+def percentile(sorted_values, fraction):
+    """
+    Returns the value at fraction (0-1) of sorted_values, interpolating between neighbours.
+    """
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (
+        position - lower
+    )
+
+
+class OperationMetrics:
+    """
+    Counters for one webservice operation.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.faults = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latencies = deque([], LATENCY_SAMPLES)
+
+    def observe_latency(self, seconds):
+        self.latency_sum += seconds
+        self.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.latencies.append(seconds)
+
+    def as_dict(self):
+        latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "faults": self.faults,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "latency_seconds": {
+                "count": sum(self.latency_buckets),
+                "sum": self.latency_sum,
+                "p50": percentile(latencies, 0.50),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "buckets": dict(
+                    zip(
+                        [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"],
+                        self.latency_buckets,
+                    )
+                ),
+            },
+        }
+
+
+class MetricsPlugin(Plugin):
+    """
+    zeep plugin that records, per operation, the number of calls and faults,
+    the time from sending the request to receiving the response and the size
+    of the request and response envelopes.
+
+    Args:
+        measure_bytes (bool, optional): Record envelope sizes. Requests are
+            serialized once more to measure them. Defaults to True.
+    """
+
+    def __init__(self, measure_bytes=True):
+        self.measure_bytes = measure_bytes
+        self.operations = {}
+        self._lock = threading.Lock()
+
+    def _operation(self, name):
+        if name not in self.operations:
+            self.operations[name] = OperationMetrics()
+        return self.operations[name]
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        request_bytes = len(etree.tostring(envelope)) if self.measure_bytes else 0
+        with self._lock:
+            operation_metrics = self._operation(operation.name)
+            operation_metrics.calls += 1
+            operation_metrics.request_bytes += request_bytes
+        _current_call.set((operation.name, time.perf_counter()))
+        return envelope, http_headers
+
+    def ingress(self, envelope, http_headers, operation):
+        call = _current_call.get()
+        _current_call.set(None)
+        latency = time.perf_counter() - call[1] if call else None
+
+        response_bytes = 0
+        if self.measure_bytes:
+            content_length = (http_headers or {}).get("Content-Length")
+            if content_length is not None:
+                response_bytes = int(content_length)
+            else:
+                response_bytes = len(etree.tostring(envelope))
+
+        is_fault = envelope.find(SOAP_FAULT_PATH) is not None
+
+        with self._lock:
+            operation_metrics = self._operation(operation.name)
+            operation_metrics.response_bytes += response_bytes
+            if is_fault:
+                operation_metrics.faults += 1
+            if latency is not None:
+                operation_metrics.observe_latency(latency)
+        return envelope, http_headers
+
+    def snapshot(self):
+        """
+        Returns the metrics of every operation as a dict keyed by operation name.
+        """
+        with self._lock:
+            return {
+                name: operation_metrics.as_dict()
+                for name, operation_metrics in sorted(self.operations.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self.operations = {}
+
+
+def format_json(metrics):
+    """
+    Formats a metrics snapshot as a JSON string.
+    """
+    return json.dumps(metrics, indent=4, sort_keys=True)
+
+
+def format_prometheus(metrics, prefix="five9_soap"):
+    """
+    Formats a metrics snapshot in the Prometheus text exposition format.
+
+    Args:
+        metrics (dict): A MetricsPlugin snapshot.
+        prefix (str, optional): Prefix of the metric names. Defaults to 'five9_soap'.
+
+    Returns:
+        str: The metrics as Prometheus text.
+    """
+    lines = []
+
+    counters = [
+        ("calls_total", "calls", "SOAP calls sent"),
+        ("faults_total", "faults", "SOAP calls answered with a fault"),
+        ("request_bytes_total", "request_bytes", "Bytes of request envelopes"),
+        ("response_bytes_total", "response_bytes", "Bytes of response envelopes"),
+    ]
+    for metric_name, key, description in counters:
+        lines.append(f"# HELP {prefix}_{metric_name} {description}")
+        lines.append(f"# TYPE {prefix}_{metric_name} counter")
+        for operation, values in metrics.items():
+            lines.append(f'{prefix}_{metric_name}{{operation="{operation}"}} {values[key]}')
+
+    lines.append(f"# HELP {prefix}_latency_seconds Time from request to response")
+    lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+    for operation, values in metrics.items():
+        latency = values["latency_seconds"]
+        cumulative = 0
+        for bound, count in latency["buckets"].items():
+            cumulative += count
+            lines.append(
+                f'{prefix}_latency_seconds_bucket{{operation="{operation}",le="{bound}"}} {cumulative}'
+            )
+        lines.append(f'{prefix}_latency_seconds_sum{{operation="{operation}"}} {latency["sum"]}')
+        lines.append(f'{prefix}_latency_seconds_count{{operation="{operation}"}} {latency["count"]}')
+
+    return "\n".join(lines) + "\n"
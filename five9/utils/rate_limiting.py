@@ -0,0 +1,318 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+
+from zeep.plugins import Plugin
+
+
+# Methods whose apiOperationType can't be derived from the method name
+OPERATION_TYPES = {
+    "runReport": "ReportRequest",
+    "runReportCsv": "ReportRequest",
+    "getReportResult": "RetrieveReport",
+    "getReportResultCsv": "RetrieveReport",
+    "isReportRunning": "RetrieveReport",
+    "addToList": "Upload",
+    "addToListCsv": "Upload",
+    "addToListFtp": "Upload",
+    "deleteFromList": "Upload",
+    "deleteFromListCsv": "Upload",
+    "deleteFromListFtp": "Upload",
+    "deleteFromContacts": "Upload",
+    "deleteFromContactsCsv": "Upload",
+    "deleteFromContactsFtp": "Upload",
+    "updateContacts": "Upload",
+    "updateContactsCsv": "Upload",
+    "updateContactsFtp": "Upload",
+    "updateDispositions": "Upload",
+    "updateDispositionsCsv": "Upload",
+    "updateDispositionsFtp": "Upload",
+    "addRecordToList": "SingleUpload",
+    "addRecordToListSimple": "SingleUpload",
+    "deleteRecordFromList": "SingleUpload",
+    "updateCrmRecord": "SingleUpload",
+    "asyncAddRecordsToList": "AsynchronousUpload",
+    "asyncDeleteRecordsFromList": "AsynchronousUpload",
+    "asyncUpdateCampaignDispositions": "AsynchronousUpload",
+    "asyncUpdateCrmRecords": "AsynchronousUpload",
+    "getStatistics": "QueryStatistics",
+    "getStatisticsUpdate": "QueryChangedStatistics",
+}
+
+QUERY_PREFIXES = ("get", "is", "check")
+
+# Methods that are never throttled, getCallCountersState configures the limiter
+UNTHROTTLED_METHODS = ["getCallCountersState", "closeSession"]
+
+# Seconds between checks of a window whose calls are all still in flight
+IN_FLIGHT_POLL_INTERVAL = 0.05
+
+
+def operation_type_for_method(method_name, operation_types=None):
+    """
+    Returns the apiOperationType (as reported by getCallCountersState) that a
+    webservice method counts against.
+
+    Args:
+        method_name (str): The name of the webservice method, e.g. 'modifyUser'.
+        operation_types (dict, optional): Overrides of method name to operation type.
+
+    Returns:
+        str: The operation type, e.g. 'Query' or 'Modify'.
+    """
+    operation_types = operation_types or {}
+    if method_name in operation_types:
+        return operation_types[method_name]
+    if method_name in OPERATION_TYPES:
+        return OPERATION_TYPES[method_name]
+    if method_name.startswith(QUERY_PREFIXES):
+        return "Query"
+    return "Modify"
+
+
+class SlidingWindow:
+    """
+    Allows at most limit calls in any window seconds, by keeping the time of
+    the most recent calls.
+
+    A call is counted from when it is sent and timed from when its response
+    arrives, the latest moment Five9 can have counted it.  Five9 counts calls
+    in windows whose start isn't reported, so the calls already used in a
+    window are assumed to have just been made.  Unlike a token bucket, which
+    allows a full burst plus its refill within one window, this never
+    exceeds the limit however the windows are aligned.
+
+    Args:
+        limit (int): The call limit for the window.
+        window (float): The window length in seconds.
+        used (int, optional): Calls already made in the current window. Defaults to 0.
+        clock (callable, optional): Monotonic clock in seconds. Defaults to time.monotonic.
+    """
+
+    def __init__(self, limit, window, used=0, clock=time.monotonic):
+        self.limit = int(limit)
+        self.window = float(window)
+        self.clock = clock
+        now = clock()
+        self.calls = deque([now] * min(int(used), self.limit), maxlen=self.limit)
+        self.in_flight = 0
+
+    def expire(self):
+        expired = self.clock() - self.window
+        while self.calls and self.calls[0] <= expired:
+            self.calls.popleft()
+
+    @property
+    def available(self):
+        self.expire()
+        return self.limit - len(self.calls) - self.in_flight
+
+    def wait_time(self):
+        """Seconds until a call is allowed, 0 if one is allowed now."""
+        if self.available > 0:
+            return 0.0
+        if not self.calls:
+            return min(IN_FLIGHT_POLL_INTERVAL, self.window)
+        return max(self.calls[0] + self.window - self.clock(), 0.0)
+
+    def consume(self):
+        """Counts a call being sent."""
+        self.in_flight += 1
+
+    def complete(self):
+        """Times a call sent with consume from now, when its response arrived."""
+        # windows rebuilt while calls were in flight don't know about them
+        self.in_flight = max(self.in_flight - 1, 0)
+        self.calls.append(self.clock())
+
+    def __repr__(self):
+        return f"SlidingWindow(limit={self.limit}, window={self.window:.0f}, available={self.available})"
+
+
+class RateLimiter:
+    """
+    Keeps a sliding window for every operation type and limit window
+    reported by getCallCountersState and blocks callers until every window
+    of the operation type of their method allows a call.
+
+    Operation types without reported limits are not throttled.
+
+    Args:
+        operation_types (dict, optional): Overrides of method name to operation type.
+        clock (callable, optional): Monotonic clock in seconds. Defaults to time.monotonic.
+        sleep (callable, optional): Sleep function. Defaults to time.sleep.
+    """
+
+    def __init__(self, operation_types=None, clock=time.monotonic, sleep=time.sleep):
+        self.operation_types = operation_types or {}
+        self.clock = clock
+        self.sleep = sleep
+        self.buckets = {}
+        self.configured = False
+        self.configured_at = None
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+
+    def update_from_call_counters(self, call_counters):
+        """
+        (Re)builds the windows from a getCallCountersState response.  Each
+        window starts with the calls already used in it.
+
+        Args:
+            call_counters (list): The getCallCountersState response.
+        """
+        buckets = {}
+        for counter in call_counters or []:
+            timeout = counter["timeout"]
+            if not timeout:
+                continue
+            for state in counter["callCounterStates"] or []:
+                if state is None or not state["limit"]:
+                    continue
+                operation_type = state["operationType"]
+                buckets.setdefault(operation_type, []).append(
+                    SlidingWindow(state["limit"], timeout, state["value"], clock=self.clock)
+                )
+
+        with self._lock:
+            self.buckets = buckets
+            self.configured = True
+            self.configured_at = self.clock()
+
+        logging.debug(f"Rate limits configured: {self.buckets}")
+
+    def needs_configuration(self, resync_interval=None):
+        """
+        Returns True when the windows were never configured, or were
+        configured more than resync_interval seconds ago.
+        """
+        if not self.configured:
+            return True
+        if resync_interval is None:
+            return False
+        return self.clock() - self.configured_at >= resync_interval
+
+    def _take(self, operation_type):
+        """
+        Records a call in every window of operation_type when all of them
+        allow one.
+
+        Returns:
+            float: 0 when the call was recorded, otherwise the seconds to wait before retrying.
+        """
+        with self._lock:
+            buckets = self.buckets.get(operation_type, [])
+            wait = max([bucket.wait_time() for bucket in buckets], default=0.0)
+            if wait <= 0:
+                for bucket in buckets:
+                    bucket.consume()
+            return wait
+
+    def acquire(self, method_name):
+        """
+        Blocks until method_name may be called without exceeding any of the
+        limits of its operation type, then records the call in each window.
+
+        Args:
+            method_name (str): The name of the webservice method about to be called.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        operation_type = operation_type_for_method(method_name, self.operation_types)
+        waited = 0.0
+        while True:
+            wait = self._take(operation_type)
+            if wait <= 0:
+                self.total_wait += waited
+                return waited
+            logging.debug(f"Rate limit reached for {operation_type}, waiting {wait:.3f}s")
+            self.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, method_name):
+        """
+        Same as acquire, but waits with asyncio.sleep so the event loop keeps
+        running other calls.
+
+        Args:
+            method_name (str): The name of the webservice method about to be called.
+
+        Returns:
+            float: The number of seconds spent waiting.
+        """
+        operation_type = operation_type_for_method(method_name, self.operation_types)
+        waited = 0.0
+        while True:
+            wait = self._take(operation_type)
+            if wait <= 0:
+                self.total_wait += waited
+                return waited
+            logging.debug(f"Rate limit reached for {operation_type}, waiting {wait:.3f}s")
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def release(self, method_name):
+        """
+        Records that a call of method_name allowed by acquire has finished,
+        whether it succeeded, faulted or failed to send.
+
+        Args:
+            method_name (str): The name of the webservice method that was called.
+        """
+        operation_type = operation_type_for_method(method_name, self.operation_types)
+        with self._lock:
+            for bucket in self.buckets.get(operation_type, []):
+                bucket.complete()
+
+
+class RateLimitPlugin(Plugin):
+    """
+    zeep plugin that makes every outgoing call wait for its RateLimiter.  The
+    limiter is configured on the first call through configure (normally
+    Five9Client.refresh_call_counters), and again every resync_interval
+    seconds when one is given.
+
+    Args:
+        rate_limiter (RateLimiter): The limiter shared by all calls of the client.
+        configure (callable): Fetches the call counters and updates the limiter.
+        resync_interval (float, optional): Seconds between re-reading the call counters.
+    """
+
+    def __init__(self, rate_limiter, configure, resync_interval=None):
+        self.rate_limiter = rate_limiter
+        self.configure = configure
+        self.resync_interval = resync_interval
+        self._configure_lock = threading.Lock()
+        # the method acquired by the call in progress on each thread
+        self._acquired = threading.local()
+
+    def egress(self, envelope, http_headers, operation, binding_options):
+        if operation.name in UNTHROTTLED_METHODS:
+            return envelope, http_headers
+
+        if self.rate_limiter.needs_configuration(self.resync_interval):
+            with self._configure_lock:
+                if self.rate_limiter.needs_configuration(self.resync_interval):
+                    try:
+                        self.configure()
+                    except Exception as e:
+                        # don't block calls when the limits can't be read
+                        logging.warning(f"Unable to read call counters: {e}")
+                        self.rate_limiter.update_from_call_counters([])
+
+        self.rate_limiter.acquire(operation.name)
+        self._acquired.method_name = operation.name
+        return envelope, http_headers
+
+    def release(self):
+        """
+        Releases the call acquired by egress on this thread, if any.  Called
+        once the call has finished, zeep doesn't run ingress for failed sends.
+        """
+        method_name = getattr(self._acquired, "method_name", None)
+        if method_name is not None:
+            self._acquired.method_name = None
+            self.rate_limiter.release(method_name)
@@ -0,0 +1,123 @@
+from lxml import etree
+from zeep.exceptions import Fault
+
+SOAP_ENV = "http://schemas.xmlsoap.org/soap/envelope/"
+XSI_NIL = "{http://www.w3.org/2001/XMLSchema-instance}nil"
+
+# depth of the operation response element (Envelope > Body > getUsersInfoResponse)
+RESPONSE_DEPTH = 2
+
+# qualified tag to local name, the same few tags repeat throughout a response
+_LOCALNAMES = {}
+
+
+def _localname(element):
+    tag = element.tag
+    try:
+        return _LOCALNAMES[tag]
+    except KeyError:
+        localname = _LOCALNAMES[tag] = etree.QName(tag).localname
+        return localname
+
+
+def element_to_dict(element, list_fields=()):
+    """
+    Converts an element to plain python values without a schema.  Elements
+    with children become dicts keyed by local name, repeated children (and
+    those named in list_fields) become lists, leaves become their text (str)
+    and nil elements None.
+
+    Args:
+        element (lxml.etree._Element): The element to convert.
+        list_fields (tuple, optional): Child names that are always lists, even with one occurrence.
+
+    Returns:
+        dict, str or None: The element's value.
+    """
+    if not len(element):
+        if element.get(XSI_NIL) == "true":
+            return None
+        text = element.text
+        return text if text is not None else ""
+
+    result = {}
+    repeated = set()
+    for child in element:
+        tag = child.tag
+        if not isinstance(tag, str):
+            # comments and processing instructions
+            continue
+        name = _LOCALNAMES.get(tag) or _localname(child)
+        value = element_to_dict(child, list_fields)
+        if name in list_fields or name in repeated:
+            result.setdefault(name, []).append(value)
+        elif name in result:
+            result[name] = [result[name], value]
+            repeated.add(name)
+        else:
+            result[name] = value
+    return result
+
+
+def _raise_fault(fault):
+    values = {_localname(child): child for child in fault}
+    message = values["faultstring"].text if "faultstring" in values else None
+    code = values["faultcode"].text if "faultcode" in values else None
+    raise Fault(message=message, code=code, detail=values.get("detail"))
+
+
+def iter_records(source, record_path=("return",), list_fields=(), as_tuples=False):
+    """
+    Streams the records of a SOAP response with lxml.iterparse, yielding each
+    record as soon as it is parsed and discarding it afterwards, so memory
+    stays bounded by one record however large the response is.
+
+    Values are not converted with the schema: leaves are strings and a child
+    is only a list when it repeats within its record (or is in list_fields).
+
+    Args:
+        source: A file-like object or path with the response body.
+        record_path (tuple, optional): Local names from the operation response element to a record,
+            e.g. ('return', 'records') for getContactRecords. Defaults to ('return',).
+        list_fields (tuple, optional): Child names that are always lists.
+        as_tuples (bool, optional): Yield tuples of the record's (name, value) pairs instead of dicts.
+
+    Yields:
+        dict or tuple: One record.
+
+    Raises:
+        zeep.exceptions.Fault: When the response is a SOAP fault.
+    """
+    fault_tag = f"{{{SOAP_ENV}}}Fault"
+    # the parent path of a record, innermost first, below the operation response element
+    parent_path = list(reversed(record_path[:-1]))
+
+    # only records and faults are reported, lxml skips every other element in C
+    for _, element in etree.iterparse(
+        source,
+        events=("end",),
+        tag=(f"{{*}}{record_path[-1]}", fault_tag),
+        huge_tree=True,
+        remove_comments=True,
+        remove_pis=True,
+    ):
+        if element.tag == fault_tag:
+            _raise_fault(element)
+
+        ancestors = [_localname(ancestor) for ancestor in element.iterancestors()]
+        if len(ancestors) != RESPONSE_DEPTH + len(record_path) or (
+            ancestors[: len(parent_path)] != parent_path
+        ):
+            # an element of the same name nested in a record
+            continue
+
+        record = element_to_dict(element, list_fields)
+        if as_tuples:
+            record = tuple(record.items()) if isinstance(record, dict) else (record,)
+        yield record
+
+        # release the record and any siblings already handled
+        element.clear()
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
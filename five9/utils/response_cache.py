@@ -0,0 +1,197 @@
+import copy
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+# Methods that only read but whose answer changes without a write through the client
+UNCACHEABLE_METHODS = [
+    "getCallCountersState",
+    "getVCCConfiguration",
+    "getCampaignState",
+    "getReportResult",
+    "getReportResultCsv",
+    "getListImportResult",
+    "getCrmImportResult",
+    "getDispositionsImportResult",
+    "getStatistics",
+    "getStatisticsUpdate",
+]
+
+READ_PREFIXES = ("get", "is", "check")
+
+# Verbs written as a suffix, e.g. userSkillAdd
+WRITE_SUFFIXES = ("Add", "Modify", "Remove")
+
+# Words of a method name that don't name an object type
+IGNORED_WORDS = {"by", "csv", "ftp", "from", "general", "info", "of", "simple", "to"}
+
+_WORDS = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|$)|[A-Z]?[a-z]+|\d+")
+
+
+def _singular(word):
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("ses"):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def object_types_for_method(method_name):
+    """
+    Returns the object types a webservice method reads or writes, derived
+    from the words of its name, e.g. {'outbound', 'campaign'} for
+    modifyOutboundCampaign and {'user', 'skill'} for userSkillAdd.
+
+    Args:
+        method_name (str): The name of the webservice method.
+
+    Returns:
+        set: The lower case, singular object type words.
+    """
+    words = _WORDS.findall(method_name)
+    if method_name.endswith(WRITE_SUFFIXES):
+        words = words[:-1]
+    elif words:
+        # the leading lower case word is the verb (get, modify, create...)
+        words = words[1:]
+    return {_singular(word.lower()) for word in words} - IGNORED_WORDS
+
+
+def call_key(method_name, args, kwargs):
+    """
+    Returns a hashable key identifying a call of method_name with args and kwargs.
+    """
+    return (method_name, repr(args), repr(sorted(kwargs.items())))
+
+
+def is_cacheable(method_name):
+    return method_name.startswith("get") and method_name not in UNCACHEABLE_METHODS
+
+
+def is_write(method_name):
+    return not method_name.startswith(READ_PREFIXES)
+
+
+class ResponseCache:
+    """
+    Read-through cache for the responses of get* webservice methods, keyed by
+    the method and its arguments, with a TTL and least recently used eviction.
+
+    A successful write (create*, modify*, delete*, add*, remove*, ...) drops
+    every cached response of a method that shares an object type with it, so
+    modifyUser invalidates getUsersInfo and userSkillAdd invalidates getSkill.
+    Responses are copied in and out so callers can't alter cached values.
+
+    Args:
+        ttl (float, optional): Seconds a response stays valid. Defaults to 300.
+        maxsize (int, optional): The maximum number of cached responses. Defaults to 1024.
+        clock (callable, optional): Monotonic clock in seconds. Defaults to time.monotonic.
+    """
+
+    def __init__(self, ttl=300, maxsize=1024, clock=time.monotonic):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Returns (True, response) for a valid cached response, (False, None) otherwise.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self.clock() >= entry[0]:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            response = entry[1]
+        return True, copy.deepcopy(response)
+
+    def set(self, key, response):
+        response = copy.deepcopy(response)
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, object_types):
+        """
+        Drops the cached responses of every method reading one of object_types.
+
+        Args:
+            object_types (set): Object type words, see object_types_for_method.
+        """
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if object_types_for_method(key[0]) & object_types
+            ]
+            for key in stale:
+                del self._entries[key]
+        if stale:
+            logging.debug(f"Invalidated {len(stale)} cached responses of {object_types}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def call(self, method_name, send, args, kwargs):
+        """
+        Calls send(*args, **kwargs) for method_name through the cache.
+
+        Args:
+            method_name (str): The name of the webservice method.
+            send (callable): Sends the call to the API.
+            args (tuple): The positional arguments of the call.
+            kwargs (dict): The keyword arguments of the call.
+
+        Returns:
+            The response of the method.
+        """
+        if is_cacheable(method_name):
+            key = call_key(method_name, args, kwargs)
+            hit, response = self.get(key)
+            if hit:
+                return response
+            response = send(*args, **kwargs)
+            self.set(key, response)
+            return response
+
+        response = send(*args, **kwargs)
+        if is_write(method_name):
+            self.invalidate(object_types_for_method(method_name))
+        return response
+
+    async def call_async(self, method_name, send, args, kwargs):
+        """
+        Same as call for a coroutine send.
+        """
+        if is_cacheable(method_name):
+            key = call_key(method_name, args, kwargs)
+            hit, response = self.get(key)
+            if hit:
+                return response
+            response = await send(*args, **kwargs)
+            self.set(key, response)
+            return response
+
+        response = await send(*args, **kwargs)
+        if is_write(method_name):
+            self.invalidate(object_types_for_method(method_name))
+        return response
@@ -0,0 +1,151 @@
+import asyncio
+import copy
+import logging
+import threading
+
+from five9.utils.response_cache import READ_PREFIXES, call_key
+
+
+class SingleFlightError(Exception):
+    """Raised to a waiter when the fault of the call it waited for can't be copied."""
+
+
+def _waiter_error(method_name, error):
+    # each waiter raises its own exception, chained to the one of the call it
+    # waited for, so tracebacks of different threads don't pile up on one object
+    try:
+        return copy.copy(error)
+    except Exception:
+        return SingleFlightError(f"{method_name} failed: {error!r}")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.followers = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical reads (get*, is*, check* methods called
+    with the same arguments): while a call is in flight, threads or tasks
+    making the same call wait for it instead of sending their own request,
+    and all of them receive its response, or a copy of its fault chained to
+    the original one.
+
+    Every waiter gets its own copy of the response, so callers can't alter
+    each other's results.  Writes are always sent.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._calls) + len(self._futures)
+
+    def call(self, method_name, send, args, kwargs):
+        """
+        Calls send(*args, **kwargs) for method_name, or waits for the same
+        call already in flight on another thread.
+
+        Args:
+            method_name (str): The name of the webservice method.
+            send (callable): Sends the call to the API.
+            args (tuple): The positional arguments of the call.
+            kwargs (dict): The keyword arguments of the call.
+
+        Returns:
+            The response of the method.
+        """
+        if not method_name.startswith(READ_PREFIXES):
+            return send(*args, **kwargs)
+
+        key = call_key(method_name, args, kwargs)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+                self.coalesced += 1
+
+        if not leader:
+            logging.debug(f"Waiting for {method_name} already in flight")
+            call.done.wait()
+            if call.error is not None:
+                raise _waiter_error(method_name, call.error) from call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = send(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # no follower can join once the call is removed
+            with self._lock:
+                del self._calls[key]
+                followers = call.followers
+            if followers and call.error is None:
+                # the followers copy from a private copy, the caller owns result
+                call.result = copy.deepcopy(result)
+            call.done.set()
+        return result
+
+    async def call_async(self, method_name, send, args, kwargs):
+        """
+        Same as call for a coroutine send, the followers wait on the event loop.
+        """
+        if not method_name.startswith(READ_PREFIXES):
+            return await send(*args, **kwargs)
+
+        key = call_key(method_name, args, kwargs)
+        with self._lock:
+            entry = self._futures.get(key)
+            leader = entry is None
+            if leader:
+                entry = self._futures[key] = [
+                    asyncio.get_running_loop().create_future(),
+                    0,
+                ]
+            else:
+                entry[1] += 1
+                self.coalesced += 1
+
+        future = entry[0]
+        if not leader:
+            logging.debug(f"Waiting for {method_name} already in flight")
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                raise
+            except BaseException as e:
+                raise _waiter_error(method_name, e) from e
+            return copy.deepcopy(result)
+
+        try:
+            result = await send(*args, **kwargs)
+        except asyncio.CancelledError:
+            with self._lock:
+                del self._futures[key]
+            future.cancel()
+            raise
+        except BaseException as e:
+            with self._lock:
+                del self._futures[key]
+                followers = entry[1]
+            if followers:
+                future.set_exception(e)
+            raise
+        with self._lock:
+            del self._futures[key]
+            followers = entry[1]
+        if followers:
+            future.set_result(copy.deepcopy(result))
+        return result
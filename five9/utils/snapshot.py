@@ -0,0 +1,195 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from git import Actor
+
+
+# Content hashes of the snapshot files, kept in the .git folder so they aren't part of the snapshot
+MANIFEST_NAME = "five9_snapshot_manifest.json"
+# Present from the start of a capture until its snapshot is committed
+UNCOMMITTED_NAME = "five9_snapshot_uncommitted"
+
+
+def content_digest(content):
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class SnapshotFiles:
+    """
+    Writes the files of a domain snapshot folder only when their content
+    changed, and removes the files of objects that no longer exist.
+
+    The content hash, size and modification time of every file are kept in a
+    manifest.  A file whose size and modification time still match the
+    manifest isn't read again, others are hashed from disk, so files edited
+    by hand are still compared by content.
+
+    The files changed and removed by a capture are all that differs from the
+    previous commit, unless the previous capture stopped before committing,
+    which in_sync tells.  Call start() at the beginning of every capture.
+
+    Args:
+        root (str): The snapshot folder, domain_snapshots/<domain name>.
+        manifest_path (str, optional): Defaults to .git/five9_snapshot_manifest.json in root.
+    """
+
+    def __init__(self, root, manifest_path=None):
+        self.root = root
+        self._prefix = os.path.join(os.path.abspath(root), "")
+        self.manifest_path = manifest_path or os.path.join(root, ".git", MANIFEST_NAME)
+        self.entries = {}
+        self._dirty = False
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as manifest_file:
+                self.entries = json.load(manifest_file)
+
+        self._uncommitted_path = os.path.join(os.path.dirname(self.manifest_path), UNCOMMITTED_NAME)
+        self.in_sync = False
+        # relative paths produced by this capture, and those actually (re)written or removed
+        self.written = set()
+        self.changed = set()
+        self.removed = set()
+
+    def start(self):
+        """
+        Starts a capture: forgets the files of the previous capture and marks
+        the snapshot uncommitted until save().
+        """
+        self.in_sync = os.path.exists(self.manifest_path) and not os.path.exists(self._uncommitted_path)
+        if os.path.isdir(os.path.dirname(self.manifest_path)):
+            open(self._uncommitted_path, "w").close()
+        self.written = set()
+        self.changed = set()
+        self.removed = set()
+
+    def _relative(self, path):
+        # called for every file, os.path.relpath is slow
+        if path.startswith(self._prefix):
+            relative_path = path[len(self._prefix):]
+        else:
+            relative_path = os.path.relpath(path, self.root)
+        return relative_path.replace(os.sep, "/") if os.sep != "/" else relative_path
+
+    def _remember(self, relative_path, path, digest):
+        stat = os.stat(path)
+        self.entries[relative_path] = {
+            "sha1": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        self._dirty = True
+
+    def current_digest(self, path, relative_path=None):
+        """The content hash of the file at path, None when it doesn't exist."""
+        relative_path = relative_path or self._relative(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            if self.entries.pop(relative_path, None) is not None:
+                self._dirty = True
+            return None
+        entry = self.entries.get(relative_path)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha1"]
+        with open(path) as snapshot_file:
+            digest = content_digest(snapshot_file.read())
+        self._remember(relative_path, path, digest)
+        return digest
+
+    def write(self, path, content):
+        """
+        Writes content to path unless the file already holds it.
+
+        Returns:
+            bool: True when the file was written.
+        """
+        relative_path = self._relative(path)
+        self.written.add(relative_path)
+        digest = content_digest(content)
+        if self.current_digest(path, relative_path) == digest:
+            return False
+        with open(path, "w") as snapshot_file:
+            snapshot_file.write(content)
+        self._remember(relative_path, path, digest)
+        self.changed.add(relative_path)
+        return True
+
+    def prune(self, directory):
+        """
+        Removes the files below directory that weren't written by this
+        capture, and the folders left empty.  Only call it for a folder whose
+        objects were all captured.
+        """
+        for folder, folders, files in os.walk(directory, topdown=False):
+            for name in files:
+                path = os.path.join(folder, name)
+                relative_path = self._relative(path)
+                if relative_path not in self.written:
+                    os.remove(path)
+                    self.entries.pop(relative_path, None)
+                    self._dirty = True
+                    self.removed.add(relative_path)
+                    logging.debug(f"Removed {relative_path} from the snapshot")
+            if folder != directory and not os.listdir(folder):
+                os.rmdir(folder)
+
+    def save(self):
+        """Saves the manifest for the next capture, once the snapshot is committed."""
+        if not os.path.isdir(os.path.dirname(self.manifest_path)):
+            return
+        if self._dirty or not os.path.exists(self.manifest_path):
+            temp_path = f"{self.manifest_path}.tmp"
+            with open(temp_path, "w") as manifest_file:
+                manifest_file.write(json.dumps(self.entries, sort_keys=True))
+            os.replace(temp_path, self.manifest_path)
+            self._dirty = False
+        if os.path.exists(self._uncommitted_path):
+            os.remove(self._uncommitted_path)
+
+
+def commit_snapshot(repo, message, paths=None):
+    """
+    Commits the snapshot folder of repo.
+
+    With paths, only those files are staged (one git update-index for all of
+    them) and the commit is written from the index, so the time taken depends
+    on the number of changed files rather than the size of the snapshot.
+
+    Args:
+        repo (git.Repo): The snapshot repository.
+        message (str): The commit message.
+        paths (iterable, optional): The files, relative to the snapshot folder, written or
+            removed since the last commit. Defaults to None, staging every file (git add -A).
+
+    Returns:
+        str: The hexsha of the new commit.
+    """
+    if paths is None:
+        repo.git.add(A=True)
+        return repo.index.commit(message).hexsha
+
+    paths = sorted(paths)
+    if paths:
+        with tempfile.TemporaryFile() as path_list:
+            path_list.write(b"".join(path.encode("utf-8") + b"\0" for path in paths))
+            path_list.seek(0)
+            repo.git.update_index("--add", "--remove", "-z", "--stdin", istream=path_list)
+
+    tree = repo.git.write_tree()
+    # the same identities as repo.index.commit
+    config = repo.config_reader()
+    author = Actor.author(config)
+    committer = Actor.committer(config)
+    env = {
+        "GIT_AUTHOR_NAME": author.name,
+        "GIT_AUTHOR_EMAIL": author.email,
+        "GIT_COMMITTER_NAME": committer.name,
+        "GIT_COMMITTER_EMAIL": committer.email,
+    }
+    parents = ["-p", repo.head.commit.hexsha] if repo.head.is_valid() else []
+    commit = repo.git.commit_tree(tree, *parents, "-m", message, env=env)
+    repo.git.update_ref("HEAD", commit)
+    return commit
@@ -0,0 +1,318 @@
+"""
+Single file archives of domain snapshots.
+
+An archive holds every file of a snapshot folder (domain_snapshots/<domain
+name>) in one file, each distinct content stored once and compressed on its
+own, so a single object is read without decompressing the others:
+
+    header   b"F9SNAP1\\n"
+    blobs    the zlib compressed contents, one per sha1 of the content
+    index    zlib compressed JSON: the version, the metadata of the capture,
+             "paths" (relative path -> sha1) and "blobs" (sha1 -> [offset, length])
+    footer   index offset and length (2 unsigned 64 bit big endian) and b"F9SNAPIX"
+
+Convert a snapshot folder to an archive and back with:
+
+    python -m five9.utils.snapshot_archive pack "domain_snapshots/My Domain" my_domain.f9snap
+    python -m five9.utils.snapshot_archive unpack my_domain.f9snap "domain_snapshots/My Domain"
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import threading
+import zlib
+
+
+ARCHIVE_VERSION = 1
+ARCHIVE_EXTENSION = ".f9snap"
+HEADER = b"F9SNAP1\n"
+FOOTER_MAGIC = b"F9SNAPIX"
+_FOOTER = struct.Struct(">QQ8s")
+
+
+class SnapshotArchiveError(Exception):
+    """
+    Raised for a file that isn't a snapshot archive, a path it doesn't hold,
+    or a path that would be extracted outside of the snapshot folder.
+    """
+
+
+def _content_bytes(content):
+    return content.encode("utf-8") if isinstance(content, str) else bytes(content)
+
+
+class SnapshotArchiveWriter:
+    """
+    Writes a snapshot archive.  Files are compressed as they are added, the
+    archive only appears at path once it is closed, so a capture that fails
+    half way leaves no archive behind.
+
+        with SnapshotArchiveWriter("capture.f9snap") as archive:
+            archive.add("getSkills.json", content)
+
+    Args:
+        path (str): The archive file.
+        metadata (dict, optional): Stored in the index, e.g. the domain name and capture time.
+        compression_level (int, optional): zlib level. Defaults to 6.
+    """
+
+    def __init__(self, path, metadata=None, compression_level=6):
+        self.path = path
+        self.metadata = metadata or {}
+        self.compression_level = compression_level
+        self.paths = {}
+        self.blobs = {}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._temp_path = f"{path}.tmp"
+        self._file = open(self._temp_path, "wb")
+        # opened by read_bytes
+        self._reader = None
+        self._file.write(HEADER)
+        self._offset = len(HEADER)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add(self, relative_path, content):
+        """
+        Adds a file to the archive, replacing an earlier one at the same path.
+
+        Args:
+            relative_path (str): The path in the snapshot folder, with / separators.
+            content (str or bytes): The file content, str is stored as utf-8.
+
+        Returns:
+            str: The sha1 of the content.
+        """
+        data = _content_bytes(content)
+        digest = hashlib.sha1(data).hexdigest()
+        if digest not in self.blobs:
+            compressed = zlib.compress(data, self.compression_level)
+            self._file.write(compressed)
+            self.blobs[digest] = [self._offset, len(compressed)]
+            self._offset += len(compressed)
+        self.paths[relative_path] = digest
+        return digest
+
+    def read_bytes(self, relative_path):
+        """The content of a file added so far."""
+        offset, length = self.blobs[self.paths[relative_path]]
+        self._file.flush()
+        if self._reader is None:
+            self._reader = open(self._temp_path, "rb")
+        self._reader.seek(offset)
+        return zlib.decompress(self._reader.read(length))
+
+    def read(self, relative_path):
+        """The content of a file added so far, decoded from utf-8."""
+        return self.read_bytes(relative_path).decode("utf-8")
+
+    def _close_reader(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def close(self):
+        """Writes the index and moves the archive to its path."""
+        if self._file is None:
+            return
+        self._close_reader()
+        index = zlib.compress(
+            json.dumps(
+                {
+                    "version": ARCHIVE_VERSION,
+                    "metadata": self.metadata,
+                    "paths": self.paths,
+                    "blobs": self.blobs,
+                },
+                sort_keys=True,
+                separators=(",", ":"),
+            ).encode("utf-8")
+        )
+        self._file.write(index)
+        self._file.write(_FOOTER.pack(self._offset, len(index), FOOTER_MAGIC))
+        self._file.close()
+        self._file = None
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        """Discards the archive."""
+        if self._file is None:
+            return
+        self._close_reader()
+        self._file.close()
+        self._file = None
+        os.remove(self._temp_path)
+
+
+class SnapshotArchive:
+    """
+    Reads a snapshot archive.  Only the index is read when it is opened,
+    read() decompresses just the file asked for.  Safe to share between
+    threads.
+
+    Args:
+        path (str): The archive file.
+
+    Raises:
+        SnapshotArchiveError: When path isn't a snapshot archive.
+    """
+
+    # digest() is the sha1 of the content
+    digest_kind = "sha1"
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "rb")
+        try:
+            self._read_index()
+        except Exception:
+            self._file.close()
+            raise
+
+    def _read_index(self):
+        if self._file.read(len(HEADER)) != HEADER:
+            raise SnapshotArchiveError(f"{self.path} is not a snapshot archive")
+        self._file.seek(-_FOOTER.size, os.SEEK_END)
+        offset, length, magic = _FOOTER.unpack(self._file.read(_FOOTER.size))
+        if magic != FOOTER_MAGIC:
+            raise SnapshotArchiveError(f"{self.path} is incomplete, it has no index")
+        self._file.seek(offset)
+        index = json.loads(zlib.decompress(self._file.read(length)))
+        if index.get("version") != ARCHIVE_VERSION:
+            raise SnapshotArchiveError(f"Unsupported snapshot archive version {index.get('version')} in {self.path}")
+        self.metadata = index["metadata"]
+        self._paths = index["paths"]
+        self._blobs = index["blobs"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, relative_path):
+        return relative_path in self._paths
+
+    def __iter__(self):
+        return iter(self.paths())
+
+    def __len__(self):
+        return len(self._paths)
+
+    def close(self):
+        self._file.close()
+
+    def paths(self, prefix=""):
+        """The sorted paths of the archived files, those starting with prefix when given."""
+        return sorted(path for path in self._paths if path.startswith(prefix))
+
+    def digest(self, relative_path):
+        """The sha1 of a file's content."""
+        try:
+            return self._paths[relative_path]
+        except KeyError:
+            raise SnapshotArchiveError(f"{relative_path} is not in {self.path}") from None
+
+    def read_bytes(self, relative_path):
+        """The content of a file."""
+        offset, length = self._blobs[self.digest(relative_path)]
+        with self._lock:
+            self._file.seek(offset)
+            compressed = self._file.read(length)
+        return zlib.decompress(compressed)
+
+    def read(self, relative_path):
+        """The content of a file, decoded from utf-8."""
+        return self.read_bytes(relative_path).decode("utf-8")
+
+
+def archive_directory(directory, archive_path, metadata=None):
+    """
+    Writes the files of a snapshot folder, except its .git folder, to an archive.
+
+    Returns:
+        int: The number of files archived.
+    """
+    with SnapshotArchiveWriter(archive_path, metadata=metadata) as archive:
+        for folder, folders, files in os.walk(directory):
+            folders[:] = sorted(name for name in folders if name != ".git")
+            for name in sorted(files):
+                path = os.path.join(folder, name)
+                with open(path, "rb") as snapshot_file:
+                    archive.add(os.path.relpath(path, directory).replace(os.sep, "/"), snapshot_file.read())
+        return len(archive.paths)
+
+
+def extract_archive(archive_path, directory):
+    """
+    Writes the files of an archive to a snapshot folder, as they were captured.
+    Nothing is written when a path of the archive is absolute or leaves the
+    folder, e.g. with ../
+
+    Returns:
+        int: The number of files extracted.
+
+    Raises:
+        SnapshotArchiveError: When a path of the archive is outside of directory.
+    """
+    root = os.path.realpath(directory)
+    with SnapshotArchive(archive_path) as archive:
+        paths = {}
+        for relative_path in archive:
+            path = os.path.join(directory, relative_path.replace("/", os.sep))
+            real_path = os.path.realpath(path)
+            if real_path == root or os.path.commonpath([root, real_path]) != root:
+                raise SnapshotArchiveError(f"{relative_path} in {archive_path} is outside of {directory}")
+            paths[relative_path] = path
+
+        for relative_path, path in paths.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as snapshot_file:
+                snapshot_file.write(archive.read_bytes(relative_path))
+        return len(archive)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converts domain snapshot folders to and from archives")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack = commands.add_parser("pack", help="archive a snapshot folder")
+    pack.add_argument("directory")
+    pack.add_argument("archive")
+    unpack = commands.add_parser("unpack", help="extract an archive to a snapshot folder")
+    unpack.add_argument("archive")
+    unpack.add_argument("directory")
+    list_files = commands.add_parser("list", help="list the files of an archive")
+    list_files.add_argument("archive")
+    show = commands.add_parser("show", help="print one file of an archive")
+    show.add_argument("archive")
+    show.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        count = archive_directory(args.directory, args.archive)
+        print(f"Archived {count} files to {args.archive}")
+    elif args.command == "unpack":
+        count = extract_archive(args.archive, args.directory)
+        print(f"Extracted {count} files to {args.directory}")
+    else:
+        with SnapshotArchive(args.archive) as archive:
+            if args.command == "list":
+                for relative_path in archive:
+                    print(relative_path)
+            else:
+                print(archive.read(args.path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""
+Structured differences between two domain snapshots.
+
+    python -m five9.utils.snapshot_diff "domain_snapshots/My Domain" --old-rev HEAD~1
+    python -m five9.utils.snapshot_diff old_capture.f9snap new_capture.f9snap --json
+
+Snapshots are compared object by object: every detail file (a campaign, an
+IVR script...) is an object, and so is every named item of a method's list
+(a skill of getSkills, a user of getUsersInfo).  Files whose content digests
+match are skipped without being read, so comparing two large captures costs
+little more than the objects that changed.
+"""
+import argparse
+import collections
+import hashlib
+import json
+import re
+import sys
+
+from . import snapshot_json
+from .snapshot_loader import DETAIL_FOLDERS, open_snapshot
+
+
+ADDED = "added"
+REMOVED = "removed"
+MODIFIED = "modified"
+
+# kind: the domain_objects key ('getSkills', 'getCampaigns_campaigns_outbound'), name: the
+# object's name, None for a method response that isn't a list of named objects
+ObjectChange = collections.namedtuple("ObjectChange", ["kind", "name", "change", "fields"])
+# path: JSON path in the object, e.g. $.crmCriteria[2].rightValue, old and new are None when added or removed
+FieldChange = collections.namedtuple("FieldChange", ["path", "change", "old", "new"])
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class DomainObjectsSnapshot:
+    """
+    The domain_objects of a Five9DomainConfig, read as the files a capture
+    writes for them.
+
+    Args:
+        domain_objects (dict): Five9DomainConfig.domain_objects.
+    """
+
+    digest_kind = "sha1"
+
+    def __init__(self, domain_objects):
+        self.domain_objects = domain_objects
+        self.metadata = {}
+        self._files = {}
+        detail_keys = {f"{method}_{folder}": folder for folder, method in DETAIL_FOLDERS.items()}
+        for key in domain_objects:
+            if key in detail_keys:
+                for name in domain_objects[key]:
+                    self._files[f"{detail_keys[key]}/{name}.json"] = (key, name)
+            else:
+                self._files[f"{key}.json"] = (key, None)
+        self._contents = {}
+
+    def paths(self, prefix=""):
+        return sorted(path for path in self._files if path.startswith(prefix))
+
+    def read(self, relative_path):
+        if relative_path not in self._contents:
+            key, name = self._files[relative_path]
+            domain_object = self.domain_objects[key]
+            self._contents[relative_path] = snapshot_json.dumps(
+                domain_object if name is None else domain_object[name]
+            )
+        return self._contents[relative_path]
+
+    def digest(self, relative_path):
+        return hashlib.sha1(self.read(relative_path).encode("utf-8")).hexdigest()
+
+    def load(self, relative_path):
+        """The object of a file, without writing and parsing its JSON."""
+        key, name = self._files[relative_path]
+        return self.domain_objects[key] if name is None else self.domain_objects[key][name]
+
+    def close(self):
+        pass
+
+
+def snapshot_source(snapshot, rev=None):
+    """
+    Returns a reader (paths(), read(), digest()) for a Five9DomainConfig, a
+    snapshot folder, archive or commit (path and rev), or a reader.
+    """
+    if isinstance(snapshot, str):
+        return open_snapshot(snapshot, rev)
+    if hasattr(snapshot, "domain_objects"):
+        # loaded from a snapshot, its files are read directly
+        if getattr(snapshot, "snapshot", None) is not None:
+            return snapshot.snapshot
+        return DomainObjectsSnapshot(snapshot.domain_objects)
+    return snapshot
+
+
+def object_kind(relative_path):
+    """
+    Returns the domain_objects key of a snapshot file and the name of its
+    object, None for the files at the root of the snapshot, or (None, None)
+    for files that don't hold objects.
+    """
+    if not relative_path.endswith(".json"):
+        return None, None
+    folder, _, name = relative_path[: -len(".json")].partition("/")
+    if not name:
+        return folder, None
+    if folder in DETAIL_FOLDERS:
+        return f"{DETAIL_FOLDERS[folder]}_{folder}", name
+    return folder, name
+
+
+def object_name(domain_object):
+    """The name of an item of a method's list, None when it has none."""
+    if not isinstance(domain_object, dict):
+        return None
+    name = domain_object.get("name")
+    if name is None and isinstance(domain_object.get("generalInfo"), dict):
+        # getUsersInfo
+        name = domain_object["generalInfo"].get("userName")
+    return name if isinstance(name, str) else None
+
+
+def _named_objects(value):
+    # the items of a method's list by name, or None when they can't be told apart
+    if not isinstance(value, list):
+        return None
+    objects = {}
+    for item in value:
+        name = object_name(item)
+        if name is None or name in objects:
+            return None
+        objects[name] = item
+    return objects
+
+
+def _path(parent, key):
+    if isinstance(key, int):
+        return f"{parent}[{key}]"
+    if _IDENTIFIER.match(key):
+        return f"{parent}.{key}"
+    return f"{parent}[{json.dumps(key)}]"
+
+
+def diff_values(old, new, path="$"):
+    """
+    Returns the FieldChanges turning old into new, two JSON values: keys of
+    objects are compared by name, items of lists by position.
+    """
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in sorted(old.keys() | new.keys()):
+            if key not in new:
+                changes.append(FieldChange(_path(path, key), REMOVED, old[key], None))
+            elif key not in old:
+                changes.append(FieldChange(_path(path, key), ADDED, None, new[key]))
+            else:
+                changes.extend(diff_values(old[key], new[key], _path(path, key)))
+        return changes
+    if isinstance(old, list) and isinstance(new, list):
+        changes = []
+        for index in range(max(len(old), len(new))):
+            if index >= len(new):
+                changes.append(FieldChange(_path(path, index), REMOVED, old[index], None))
+            elif index >= len(old):
+                changes.append(FieldChange(_path(path, index), ADDED, None, new[index]))
+            else:
+                changes.extend(diff_values(old[index], new[index], _path(path, index)))
+        return changes
+    return [FieldChange(path, MODIFIED, old, new)]
+
+
+class SnapshotDiff:
+    """
+    The ObjectChanges between two snapshots, sorted by kind and name.
+
+    Attributes:
+        changes (list): The ObjectChanges.
+        unchanged (int): The number of objects found identical, the items of a method's list
+            count as one when its whole file is identical.
+        files_skipped (int): The files skipped because their digests matched.
+    """
+
+    def __init__(self, changes, unchanged, files_skipped):
+        self.changes = sorted(changes, key=lambda change: (change.kind, change.name or ""))
+        self.unchanged = unchanged
+        self.files_skipped = files_skipped
+        self._by_object = {(change.kind, change.name): change for change in self.changes}
+        self._kinds = collections.defaultdict(list)
+        for change in self.changes:
+            self._kinds[change.kind].append(change)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def get(self, kind, name=None):
+        """The ObjectChange of an object, None when it is unchanged (or in neither snapshot)."""
+        return self._by_object.get((kind, name))
+
+    def of_kind(self, kind):
+        """The ObjectChanges of one domain_objects key, e.g. 'getCampaignProfiles'."""
+        return list(self._kinds.get(kind, []))
+
+    def summary(self):
+        """kind -> {'added': n, 'removed': n, 'modified': n}"""
+        counts = {}
+        for change in self.changes:
+            counts.setdefault(change.kind, {ADDED: 0, REMOVED: 0, MODIFIED: 0})[change.change] += 1
+        return counts
+
+    def to_dict(self):
+        return {
+            "changes": [
+                {
+                    "kind": change.kind,
+                    "name": change.name,
+                    "change": change.change,
+                    "fields": [field._asdict() for field in change.fields],
+                }
+                for change in self.changes
+            ],
+            "unchanged": self.unchanged,
+        }
+
+
+def _load(snapshot, relative_path):
+    return json.loads(snapshot.read(relative_path))
+
+
+def _same_file(old, new, relative_path):
+    if getattr(old, "digest_kind", None) is not None and old.digest_kind == getattr(new, "digest_kind", None):
+        return old.digest(relative_path) == new.digest(relative_path)
+    return old.read(relative_path) == new.read(relative_path)
+
+
+def _diff_objects(kind, name, old_value, new_value, changes):
+    # returns the number of unchanged objects
+    if name is None:
+        old_objects, new_objects = _named_objects(old_value), _named_objects(new_value)
+        if old_objects is not None and new_objects is not None:
+            unchanged = 0
+            for item_name in old_objects.keys() | new_objects.keys():
+                unchanged += _diff_objects(
+                    kind, item_name, old_objects.get(item_name), new_objects.get(item_name), changes
+                )
+            return unchanged
+    if old_value is None:
+        changes.append(ObjectChange(kind, name, ADDED, []))
+    elif new_value is None:
+        changes.append(ObjectChange(kind, name, REMOVED, []))
+    elif old_value != new_value:
+        changes.append(ObjectChange(kind, name, MODIFIED, diff_values(old_value, new_value)))
+    else:
+        return 1
+    return 0
+
+
+def diff_snapshots(old, new, old_rev=None, new_rev=None):
+    """
+    Compares two snapshots of a domain, or of two domains.
+
+    Args:
+        old: A Five9DomainConfig (captured or loaded with from_snapshot), a snapshot
+            folder, archive or, with old_rev, the snapshot folder of a commit.
+        new: The same for the newer snapshot.
+        old_rev (str, optional): A commit of old's snapshot repository, e.g. 'HEAD~1'.
+        new_rev (str, optional): A commit of new's snapshot repository.
+
+    Returns:
+        SnapshotDiff: The objects added, removed and modified from old to new.
+    """
+    # readers opened here are closed here
+    opened = [isinstance(old, str), isinstance(new, str)]
+    old = snapshot_source(old, old_rev)
+    new = snapshot_source(new, new_rev)
+    try:
+        return _diff_sources(old, new)
+    finally:
+        for snapshot, close in zip((old, new), opened):
+            if close:
+                snapshot.close()
+
+
+def _diff_sources(old, new):
+    old_paths = set(old.paths())
+    new_paths = set(new.paths())
+    kinds = {}
+    for relative_path in old_paths | new_paths:
+        kind, name = object_kind(relative_path)
+        if kind is not None:
+            kinds[relative_path] = kind, name
+
+    changes = []
+    unchanged = 0
+    files_skipped = 0
+    for relative_path in sorted(kinds):
+        kind, name = kinds[relative_path]
+        if relative_path not in new_paths:
+            old_value, new_value = _load(old, relative_path), None
+        elif relative_path not in old_paths:
+            old_value, new_value = None, _load(new, relative_path)
+        elif _same_file(old, new, relative_path):
+            # not read, a method's list counts as one object
+            files_skipped += 1
+            unchanged += 1
+            continue
+        else:
+            old_value, new_value = _load(old, relative_path), _load(new, relative_path)
+        unchanged += _diff_objects(kind, name, old_value, new_value, changes)
+    return SnapshotDiff(changes, unchanged, files_skipped)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares two domain snapshots object by object")
+    parser.add_argument("old", help="snapshot folder or archive")
+    parser.add_argument("new", nargs="?", default=None, help="snapshot folder or archive, defaults to old")
+    parser.add_argument("--old-rev", default=None, help="commit of the old snapshot folder")
+    parser.add_argument("--new-rev", default=None, help="commit of the new snapshot folder")
+    parser.add_argument("--json", action="store_true", help="print the changes as JSON")
+    args = parser.parse_args()
+
+    diff = diff_snapshots(args.old, args.new or args.old, args.old_rev, args.new_rev)
+    if args.json:
+        json.dump(diff.to_dict(), sys.stdout, indent=4, default=snapshot_json.json_default)
+        print()
+        return
+    for change in diff:
+        print(f"{change.change.upper():<9} {change.kind} {change.name or ''}")
+        for field in change.fields:
+            print(f"    {field.path}: {json.dumps(field.old)} -> {json.dumps(field.new)}")
+    print(f"{len(diff)} objects changed, {diff.unchanged} unchanged")
+
+
+if __name__ == "__main__":
+    main()
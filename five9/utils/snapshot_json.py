@@ -0,0 +1,109 @@
+import base64
+import collections.abc
+import datetime
+import decimal
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# orjson writes floats in exponent notation differently from the json module
+# (1e16 for 1e+16, 0.00001 for 1e-05), such objects are dumped with json.
+# The first pattern finds candidates quickly, the second checks them.
+_EXPONENT_HINT = re.compile(rb"e(?<=[0-9]e)[-+]?[0-9]")
+_ORJSON_EXPONENT = re.compile(r'(?m)(?:^ *|": )-?(?:[0-9][0-9.]*e|0\.0000)')
+# characters json escapes with ensure_ascii and orjson doesn't
+_NOT_ASCII = re.compile(r"[^\n\x20-\x7e]")
+
+
+def json_default(obj):
+    """
+    Converts the values of a serialized Five9 object the json module can't
+    write: datetimes, dates and times to ISO 8601, decimals to their string,
+    bytes (base64Binary fields) to base64 and mappings that aren't dicts (the
+    domain_objects of a loaded snapshot) to dicts.
+    """
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (bytes, bytearray)):
+        return base64.b64encode(obj).decode("ascii")
+    if isinstance(obj, collections.abc.Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _escape(match):
+    code = ord(match.group())
+    if code > 0xFFFF:
+        code -= 0x10000
+        return "\\u{0:04x}\\u{1:04x}".format(0xD800 | (code >> 10), 0xDC00 | (code & 0x3FF))
+    return "\\u{0:04x}".format(code)
+
+
+def _reindent(output, indent):
+    # orjson only indents by 2 spaces.  Strings never hold a raw newline or tab,
+    # so the indentation is turned into a tab per level, one level a pass, then
+    # every tab into indent spaces.
+    output = output.replace("\n  ", "\n\t")
+    while "\t  " in output:
+        output = output.replace("\t  ", "\t\t")
+    return output.replace("\t", " " * indent)
+
+
+def _orjson_dumps(obj, sort_keys, indent):
+    option = orjson.OPT_PASSTHROUGH_DATETIME
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        # without indentation (much faster to scan) to check what orjson wrote
+        compact = orjson.dumps(obj, default=json_default, option=option)
+        output = orjson.dumps(obj, default=json_default, option=option | orjson.OPT_INDENT_2)
+    except TypeError:
+        # keys that aren't strings, integers over 64 bits...
+        return None
+    output = output.decode("utf-8")
+    if (b"0.0000" in compact or _EXPONENT_HINT.search(compact)) and _ORJSON_EXPONENT.search(output):
+        return None
+    if not compact.isascii() or b"\x7f" in compact:
+        output = _NOT_ASCII.sub(_escape, output)
+    if indent == 2:
+        return output
+    if b"  " in compact:
+        return _reindent(output, indent)
+    # only the indentation has consecutive spaces, 2 per level
+    return output.replace("  ", " " * indent)
+
+
+def dumps(obj, sort_keys=True, indent=4):
+    """
+    Returns obj as the JSON text of a snapshot file, byte for byte what
+    json.dumps(obj, sort_keys=sort_keys, indent=indent) writes once datetimes
+    are converted to ISO 8601, without copying obj to convert them.
+
+    orjson is used when it is installed and falls back to the json module
+    for what it writes differently, so the snapshot files (and their git
+    diffs) don't depend on it.  Not a Number and infinite floats, which
+    aren't JSON, are the exception: orjson writes them as null.
+
+    Args:
+        obj: A serialized Five9 object (zeep.helpers.serialize_object).
+        sort_keys (bool, optional): Defaults to True.
+        indent (int, optional): Defaults to 4.
+
+    Returns:
+        str: The JSON text.
+
+    Raises:
+        TypeError: When obj holds a value that can't be written to JSON.
+    """
+    if orjson is not None and isinstance(indent, int) and indent > 0:
+        output = _orjson_dumps(obj, sort_keys, indent)
+        if output is not None:
+            return output
+    return json.dumps(obj, sort_keys=sort_keys, indent=indent, default=json_default)
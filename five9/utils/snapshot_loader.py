@@ -0,0 +1,238 @@
+import hashlib
+import json
+import os
+from collections.abc import MutableMapping
+
+from git import Repo
+
+from .snapshot import MANIFEST_NAME
+from .snapshot_archive import SnapshotArchive
+
+
+# Detail subfolders of a snapshot and the method listing their objects, the
+# domain_objects of a subfolder are "<method>_<subfolder>"
+DETAIL_FOLDERS = {
+    "campaign_profile_filters": "getCampaignProfiles",
+    "campaigns_inbound": "getCampaigns",
+    "campaigns_outbound": "getCampaigns",
+    "ivrs": "getIVRScripts",
+    "skills_info": "getSkills",
+}
+
+
+class SnapshotDirectory:
+    """
+    Reads the files of a snapshot folder, domain_snapshots/<domain name>,
+    with the same methods as SnapshotArchive.
+
+    Args:
+        root (str): The snapshot folder.
+    """
+
+    # digest() is the sha1 of the content, as in archives
+    digest_kind = "sha1"
+
+    def __init__(self, root):
+        if not os.path.isdir(root):
+            raise FileNotFoundError(f"No snapshot folder at {root}")
+        self.root = root
+        self.metadata = {"domain_name": os.path.basename(os.path.normpath(root))}
+        self._manifest = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        pass
+
+    def paths(self, prefix=""):
+        """The sorted paths of the snapshot files, those starting with prefix when given."""
+        paths = []
+        for folder, folders, files in os.walk(self.root):
+            folders[:] = [name for name in folders if name != ".git"]
+            relative_folder = os.path.relpath(folder, self.root).replace(os.sep, "/")
+            relative_folder = "" if relative_folder == "." else f"{relative_folder}/"
+            paths.extend(
+                f"{relative_folder}{name}" for name in files if f"{relative_folder}{name}".startswith(prefix)
+            )
+        return sorted(paths)
+
+    def read(self, relative_path):
+        """The content of a file."""
+        with open(os.path.join(self.root, *relative_path.split("/")), encoding="utf-8") as snapshot_file:
+            return snapshot_file.read()
+
+    def digest(self, relative_path):
+        """The sha1 of a file's content, from the manifest of incremental captures when it is current."""
+        if self._manifest is None:
+            manifest_path = os.path.join(self.root, ".git", MANIFEST_NAME)
+            self._manifest = {}
+            if os.path.exists(manifest_path):
+                with open(manifest_path) as manifest_file:
+                    self._manifest = json.load(manifest_file)
+        path = os.path.join(self.root, *relative_path.split("/"))
+        entry = self._manifest.get(relative_path)
+        if entry:
+            stat = os.stat(path)
+            if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                return entry["sha1"]
+        with open(path, "rb") as snapshot_file:
+            return hashlib.sha1(snapshot_file.read()).hexdigest()
+
+
+class GitSnapshot:
+    """
+    Reads the files of a snapshot as they were committed to the snapshot
+    repository, with the same methods as SnapshotArchive.
+
+    Args:
+        root (str): The snapshot folder.
+        rev (str, optional): The commit, e.g. 'HEAD~1' or a hexsha. Defaults to 'HEAD'.
+    """
+
+    # digest() is the git blob id, files with the same id have the same content
+    digest_kind = "git"
+
+    def __init__(self, root, rev="HEAD"):
+        self.repo = Repo(root)
+        self.commit = self.repo.commit(rev)
+        self.metadata = {
+            "domain_name": os.path.basename(os.path.normpath(root)),
+            "commit": self.commit.hexsha,
+            "captured": self.commit.committed_datetime.isoformat(),
+        }
+        self._blobs = {
+            item.path: item for item in self.commit.tree.traverse() if item.type == "blob"
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.repo.close()
+
+    def paths(self, prefix=""):
+        """The sorted paths of the committed files, those starting with prefix when given."""
+        return sorted(path for path in self._blobs if path.startswith(prefix))
+
+    def read(self, relative_path):
+        """The content of a file."""
+        return self._blobs[relative_path].data_stream.read().decode("utf-8")
+
+    def digest(self, relative_path):
+        """The git blob id of a file."""
+        return self._blobs[relative_path].hexsha
+
+
+def open_snapshot(path, rev=None):
+    """
+    Returns a SnapshotArchive for an archive file, a GitSnapshot for a commit
+    (rev) of a snapshot folder, otherwise a SnapshotDirectory.
+    """
+    if rev is not None:
+        return GitSnapshot(path, rev)
+    if os.path.isfile(path):
+        return SnapshotArchive(path)
+    return SnapshotDirectory(path)
+
+
+class _Pending:
+    __slots__ = ["load"]
+
+    def __init__(self, load):
+        self.load = load
+
+
+class LazyObjects(MutableMapping):
+    """
+    A dict whose values are loaded the first time they are read, and then
+    kept.  Values set on it replace the pending ones.
+
+    Args:
+        loaders (dict): Key -> function returning the value, in the order of the keys.
+        keep_loaded (bool, optional): Keep the values once loaded, otherwise they are loaded
+            again at every read and memory doesn't grow with what is read. Defaults to True.
+    """
+
+    def __init__(self, loaders=None, keep_loaded=True):
+        self._items = {key: _Pending(load) for key, load in (loaders or {}).items()}
+        self.keep_loaded = keep_loaded
+
+    def __getitem__(self, key):
+        value = self._items[key]
+        if isinstance(value, _Pending):
+            value = value.load()
+            if self.keep_loaded:
+                self._items[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._items[key] = value
+
+    def __delitem__(self, key):
+        del self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def set_loader(self, key, load):
+        """Sets the value of key to the result of load, called when it is read."""
+        self._items[key] = _Pending(load)
+
+    def reorder(self, keys):
+        """Puts the items in the order of keys, which holds every key, without loading them."""
+        self._items = {key: self._items[key] for key in keys}
+
+    def is_loaded(self, key):
+        return key in self._items and not isinstance(self._items[key], _Pending)
+
+    def __repr__(self):
+        loaded = sum(1 for key in self._items if self.is_loaded(key))
+        return f"<LazyObjects {len(self._items)} objects, {loaded} loaded>"
+
+
+def load_domain_objects(snapshot):
+    """
+    Returns the domain_objects of a captured domain, as Five9DomainConfig
+    stores them, read from its snapshot when first used.
+
+    Args:
+        snapshot (SnapshotDirectory or SnapshotArchive): The snapshot, see open_snapshot.
+
+    Returns:
+        LazyObjects: '<method>' -> the method's response for the files at the root of the
+            snapshot, '<method>_<subfolder>' -> LazyObjects of object name -> detail for
+            the DETAIL_FOLDERS.
+    """
+
+    def loader(relative_path):
+        return lambda: json.loads(snapshot.read(relative_path))
+
+    loaders = {}
+    details = {}
+    for relative_path in snapshot.paths():
+        if not relative_path.endswith(".json"):
+            continue
+        folder, _, name = relative_path.partition("/")
+        if not name:
+            loaders[folder[: -len(".json")]] = loader(relative_path)
+        elif folder in DETAIL_FOLDERS:
+            # object names with a / were written to nested folders
+            details.setdefault(folder, {})[name[: -len(".json")]] = loader(relative_path)
+
+    domain_objects = LazyObjects(loaders)
+    for folder, folder_loaders in details.items():
+        domain_objects[f"{DETAIL_FOLDERS[folder]}_{folder}"] = LazyObjects(folder_loaders)
+    return domain_objects
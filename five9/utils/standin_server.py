@@ -0,0 +1,989 @@
+"""
+A local stand-in for the Five9 admin webservice, for offline load and
+performance testing.  Requests are parsed and responses serialized with the
+bundled WSDL; the common operations run against an in-memory domain.
+
+    python -m five9.utils.standin_server --port 8080 --users 5000 --latency 0.05
+
+    client = five9_session.Five9Client(
+        five9username="any", five9password="any", api_hostname="http://127.0.0.1:8080"
+    )
+"""
+import argparse
+import base64
+import collections
+import csv
+import datetime
+import http.server
+import io
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+
+import zeep
+from lxml import etree
+
+from five9.utils import rate_limiting, wsdl_cache
+
+SOAP_ENV = "http://schemas.xmlsoap.org/soap/envelope/"
+FIVE9_NS = "http://service.admin.ws.five9.com/"
+
+# operation type -> {window in seconds: calls allowed in the window}
+DEFAULT_RATE_LIMITS = {
+    "Query": {1: 10, 60: 300, 3600: 10000},
+    "Modify": {1: 5, 60: 200, 3600: 5000},
+    "ReportRequest": {60: 20, 3600: 500},
+    "RetrieveReport": {1: 10, 60: 300},
+    "Upload": {60: 20, 3600: 500},
+    "SingleUpload": {1: 10, 60: 300},
+}
+
+AGENT_PERMISSIONS = [
+    "ReceiveTransfer",
+    "MakeRecordings",
+    "SendMessages",
+    "CreateChatSessions",
+    "TrainingMode",
+    "CanSelectDisplayLanguage",
+    "CanViewMissedCalls",
+    "CanConfigureAutoAnswer",
+]
+
+CAMPAIGN_TYPES = ["INBOUND", "OUTBOUND", "AUTODIAL"]
+
+
+class StandInFault(Exception):
+    """
+    A SOAP fault returned by the stand-in server.
+
+    Args:
+        fault_name (str): The fault element of the WSDL, e.g. 'ObjectNotFoundFault'.
+        message (str): The faultstring.
+        **details: Extra children of the fault element, e.g. limit=10.
+    """
+
+    def __init__(self, fault_name, message, **details):
+        super().__init__(message)
+        self.fault_name = fault_name
+        self.message = message
+        self.details = details
+
+
+def _matches(pattern, value):
+    # Five9 name patterns are (java) regular expressions matched against the whole name
+    if pattern in (None, ""):
+        return True
+    try:
+        return re.fullmatch(pattern, value) is not None
+    except re.error:
+        raise StandInFault(
+            "InvalidRegexpPatternFault", f"Invalid pattern: {pattern}", pattern=pattern
+        )
+
+
+def synthetic_ivr_xml(index, variables=5, functions=2):
+    """
+    Returns an IVR script xmlDefinition with variable references and
+    compressed JavaScript functions shaped like the ones Five9 exports.
+    """
+    modules = "".join(
+        f"<setVariables><moduleName>SetVariables{index}_{number}</moduleName>"
+        f"<variableName>Custom.variable_{(index + number) % 50}</variableName>"
+        f"<variableName>Call.ANI</variableName></setVariables>"
+        for number in range(variables)
+    )
+    entries = ""
+    for number in range(functions):
+        body = f"var result = value * {number + 1};\nreturn String(result);"
+        compressed = base64.b64encode(zlib.compress(body.encode("utf-8"))).decode("ascii")
+        entries += (
+            f"<entry><key>function_{number}</key><value><name>function_{number}</name>"
+            f"<arguments><arguments><name>value</name></arguments></arguments>"
+            f"<functionBody>{compressed}</functionBody></value></entry>"
+        )
+    return (
+        f"<ivrScript><domainId>1</domainId><modules>{modules}</modules>"
+        f"<functions>{entries}</functions></ivrScript>"
+    )
+
+
+class CallCounters:
+    """
+    Fixed window call counters per operation type, as reported by
+    getCallCountersState and enforced with OperationsLimitExceededFault.
+
+    Args:
+        limits (dict): Operation type -> {window in seconds: limit}. None disables enforcement.
+        clock (callable, optional): Clock in seconds. Defaults to time.monotonic.
+    """
+
+    def __init__(self, limits, clock=time.monotonic):
+        self.limits = limits or {}
+        self.clock = clock
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def _window(self, operation_type, timeout, now):
+        started, value = self._windows.get((operation_type, timeout), (now, 0))
+        if now - started >= timeout:
+            started, value = now, 0
+        return started, value
+
+    def count(self, method_name):
+        """
+        Counts a call of method_name, raising OperationsLimitExceededFault
+        instead when one of the windows of its operation type is full.
+        """
+        operation_type = rate_limiting.operation_type_for_method(method_name)
+        windows = self.limits.get(operation_type, {})
+        with self._lock:
+            now = self.clock()
+            current = {}
+            for timeout, limit in windows.items():
+                started, value = self._window(operation_type, timeout, now)
+                if value >= limit:
+                    raise StandInFault(
+                        "OperationsLimitExceededFault",
+                        f"{operation_type} operations limit of {limit} per {timeout} seconds exceeded",
+                        limit=limit,
+                        operationType=operation_type,
+                    )
+                current[timeout] = (started, value + 1)
+            for timeout, window in current.items():
+                self._windows[(operation_type, timeout)] = window
+
+    def states(self):
+        """The counters in the shape of the getCallCountersState response."""
+        by_timeout = collections.defaultdict(list)
+        with self._lock:
+            now = self.clock()
+            for operation_type, windows in sorted(self.limits.items()):
+                for timeout, limit in windows.items():
+                    by_timeout[timeout].append(
+                        {
+                            "limit": limit,
+                            "operationType": operation_type,
+                            "value": self._window(operation_type, timeout, now)[1],
+                        }
+                    )
+        return [
+            {"callCounterStates": states, "timeout": timeout}
+            for timeout, states in sorted(by_timeout.items())
+        ]
+
+
+class StandInDomain:
+    """
+    In-memory Five9 domain.  Every method named after a webservice operation
+    implements it; keyword arguments and return values are plain dicts in
+    the shape of the WSDL types.
+
+    Args:
+        users (int, optional): Number of generated users. Defaults to 100.
+        skills (int, optional): Number of generated skills. Defaults to 10.
+        campaigns (int, optional): Number of generated campaigns. Defaults to 20.
+        campaign_profiles (int, optional): Number of generated campaign profiles. Defaults to 10.
+        ivr_scripts (int, optional): Number of generated IVR scripts. Defaults to 20.
+        report_rows (int, optional): Rows of every report result. Defaults to 100.
+        report_duration (float, optional): Seconds a report runs. Defaults to 0.5.
+        import_duration (float, optional): Seconds a list import runs. Defaults to 0.5.
+        domain_name (str, optional): Defaults to 'Stand-in Domain'.
+        domain_id (int, optional): Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        users=100,
+        skills=10,
+        campaigns=20,
+        campaign_profiles=10,
+        ivr_scripts=20,
+        report_rows=100,
+        report_duration=0.5,
+        import_duration=0.5,
+        domain_name="Stand-in Domain",
+        domain_id=1,
+    ):
+        self.domain_name = domain_name
+        self.domain_id = domain_id
+        self.report_rows = report_rows
+        self.report_duration = report_duration
+        self.import_duration = import_duration
+        self.call_counters = CallCounters(None)
+        self._lock = threading.RLock()
+
+        self.skills = {
+            f"Skill {number:03d}": {
+                "description": f"Generated skill {number}",
+                "id": 1000 + number,
+                "messageOfTheDay": "",
+                "name": f"Skill {number:03d}",
+                "routeVoiceMails": False,
+            }
+            for number in range(skills)
+        }
+        self.users = {}
+        for number in range(users):
+            user = self._generate_user(number)
+            self.users[user["generalInfo"]["userName"]] = user
+        self.campaign_profiles = {}
+        self.campaign_profile_filters = {}
+        for number in range(campaign_profiles):
+            name = f"Profile {number:03d}"
+            self.campaign_profiles[name] = {
+                "ANI": "5551230000",
+                "description": f"Generated campaign profile {number}",
+                "dialingTimeout": 30,
+                "initialCallPriority": 1,
+                "maxCharges": 0,
+                "name": name,
+                "numberOfAttempts": 1,
+            }
+            self.campaign_profile_filters[name] = self._generate_profile_filter(number)
+        self.campaigns = {}
+        for number in range(campaigns):
+            name = f"Campaign {number:03d}"
+            campaign_type = CAMPAIGN_TYPES[number % len(CAMPAIGN_TYPES)]
+            profile_names = list(self.campaign_profiles)
+            self.campaigns[name] = {
+                "description": f"Generated campaign {number}",
+                "mode": "ADVANCED" if campaign_type != "INBOUND" and profile_names else "BASIC",
+                "name": name,
+                "profileName": (
+                    profile_names[number % len(profile_names)]
+                    if campaign_type != "INBOUND" and profile_names
+                    else None
+                ),
+                "state": "RUNNING" if number % 2 else "NOT_RUNNING",
+                "trainingMode": False,
+                "type": campaign_type,
+            }
+        self.ivr_scripts = {
+            f"IVR {number:03d}": {
+                "description": f"Generated IVR script {number}",
+                "name": f"IVR {number:03d}",
+                "xmlDefinition": synthetic_ivr_xml(number),
+            }
+            for number in range(ivr_scripts)
+        }
+        self.lists = {}
+        self.reports = {}
+        self.imports = {}
+
+        self.locales = ["en-US", "en-GB", "es-US", "fr-CA"]
+        self.dialing_rules = [
+            {"applyToManualCalls": False, "name": "Business Hours", "state": "CA"}
+        ]
+        self.prompts = [
+            {"description": f"Generated prompt {number}", "name": f"Prompt {number:03d}", "type": "TTSGenerator"}
+            for number in range(5)
+        ]
+        self.dispositions = [
+            {
+                "agentMustCompleteWorksheet": False,
+                "agentMustConfirm": False,
+                "description": f"Generated disposition {name}",
+                "name": name,
+                "resetAttemptsCounter": False,
+                "sendEmailNotification": False,
+                "sendIMNotification": False,
+                "trackAsFirstCallResolution": name == "Sale",
+                "type": "FinalDisp",
+            }
+            for name in ["Sale", "No Sale", "Callback", "Do Not Call"]
+        ]
+        self.web_connectors = [
+            {"description": "Generated web connector", "name": "CRM Lookup", "url": "https://crm.example.com/lookup"}
+        ]
+        self.call_variables = [
+            {"description": f"Generated variable {number}", "group": "Custom", "name": f"variable_{number}", "type": "STRING"}
+            for number in range(10)
+        ]
+        self.call_variable_groups = [
+            {"description": "Generated variables", "name": "Custom"}
+        ]
+        self.contact_fields = [
+            {"displayAs": "Short", "mapTo": "None", "name": name, "system": True, "type": "PHONE" if name.startswith("number") else "STRING"}
+            for name in ["number1", "number2", "first_name", "last_name", "email"]
+        ]
+        self.agent_groups = [
+            {
+                "agents": [name for name, user in self.users.items() if f"Group {number}" in user["agentGroups"]],
+                "description": f"Generated agent group {number}",
+                "id": 2000 + number,
+                "name": f"Group {number}",
+            }
+            for number in range(5)
+        ]
+        self.speed_dial_numbers = [
+            {"code": "1", "description": "Supervisor", "number": "5559876543"}
+        ]
+        self.user_profiles = [
+            {"description": "Generated user profile", "locale": "en-US", "name": "Agents", "skills": list(self.skills)[:2]}
+        ]
+
+    def _generate_profile_filter(self, number):
+        criteria = 2 + number % 4
+        return {
+            "crmCriteria": [
+                {
+                    "compareOperator": "Equals" if index % 2 else "NotEqual",
+                    "leftValue": f"field_{index}",
+                    "rightValue": f"value_{number}_{index}",
+                }
+                for index in range(criteria)
+            ],
+            "grouping": {
+                "expression": " OR ".join(
+                    f"({index + 1} AND {index + 2})" if index + 1 < criteria else f"{index + 1}"
+                    for index in range(0, criteria, 2)
+                ),
+                "type": "Custom",
+            },
+            "orderByFields": [],
+        }
+
+    def _generate_user(self, number):
+        user_name = f"user{number:05d}@standin.example.com"
+        skill_names = list(self.skills)
+        return {
+            "agentGroups": [f"Group {number % 5}"],
+            "cannedReports": [],
+            "generalInfo": {
+                "active": True,
+                "canChangePassword": True,
+                "EMail": user_name,
+                "extension": str(1000 + number),
+                "federationId": f"fed{number:05d}",
+                "firstName": f"First{number}",
+                "fullName": f"First{number} Last{number}",
+                "IEXScheduled": False,
+                "id": 300000 + number,
+                "lastName": f"Last{number}",
+                "locale": "en-US",
+                "mustChangePassword": False,
+                "osLogin": "",
+                "phoneNumber": "5551234567",
+                "startDate": datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+                "userName": user_name,
+                "userProfileName": "Agents",
+            },
+            "roles": {
+                "agent": {
+                    "alwaysRecorded": False,
+                    "attachVmToEmail": False,
+                    "permissions": [
+                        {"type": permission, "value": True}
+                        for permission in AGENT_PERMISSIONS
+                    ],
+                    "sendEmailOnVm": False,
+                }
+            },
+            "skills": [
+                {
+                    "id": self.skills[skill_name]["id"],
+                    "level": 1,
+                    "skillName": skill_name,
+                    "userName": user_name,
+                }
+                for skill_name in skill_names[number % 3 : number % 3 + 2]
+            ],
+        }
+
+    def _get(self, collection, name, object_type):
+        if name not in collection:
+            raise StandInFault(
+                "ObjectNotFoundFault",
+                f"{object_type} with name '{name}' not found",
+                objectName=name,
+            )
+        return collection[name]
+
+    # configuration
+
+    def getVCCConfiguration(self):
+        return {"domainId": self.domain_id, "domainName": self.domain_name}
+
+    def getCallCountersState(self):
+        return self.call_counters.states()
+
+    # users and skills
+
+    def getUsersInfo(self, userNamePattern=None):
+        with self._lock:
+            return [
+                user
+                for name, user in self.users.items()
+                if _matches(userNamePattern, name)
+            ]
+
+    def getUsersGeneralInfo(self, userNamePattern=None):
+        return [user["generalInfo"] for user in self.getUsersInfo(userNamePattern)]
+
+    def modifyUser(self, userGeneralInfo, rolesToSet=None, rolesToRemove=None):
+        with self._lock:
+            user = self._get(self.users, userGeneralInfo["userName"], "User")
+            for key, value in userGeneralInfo.items():
+                if value is not None:
+                    user["generalInfo"][key] = value
+            for role, value in (rolesToSet or {}).items():
+                if value is not None:
+                    user["roles"][role] = value
+            for role in rolesToRemove or []:
+                user["roles"].pop(role, None)
+            return user
+
+    def getSkills(self, skillNamePattern=None):
+        with self._lock:
+            return [
+                skill
+                for name, skill in self.skills.items()
+                if _matches(skillNamePattern, name)
+            ]
+
+    def getSkill(self, skillName):
+        with self._lock:
+            return self._get(self.skills, skillName, "Skill")
+
+    def getSkillsInfo(self, skillNamePattern=None):
+        with self._lock:
+            return [
+                {
+                    "skill": skill,
+                    "users": [
+                        user_skill
+                        for user in self.users.values()
+                        for user_skill in user["skills"]
+                        if user_skill["skillName"] == skill["name"]
+                    ],
+                }
+                for skill in self.getSkills(skillNamePattern)
+            ]
+
+    def getAgentGroups(self, groupNamePattern=None):
+        return [group for group in self.agent_groups if _matches(groupNamePattern, group["name"])]
+
+    def getUserProfiles(self, userProfileNamePatern=None):
+        return [
+            profile for profile in self.user_profiles if _matches(userProfileNamePatern, profile["name"])
+        ]
+
+    # domain configuration objects
+
+    def getAvailableLocales(self):
+        return self.locales
+
+    def getDialingRules(self, namePattern=None):
+        return [rule for rule in self.dialing_rules if _matches(namePattern, rule["name"])]
+
+    def getPrompts(self):
+        return self.prompts
+
+    def getDispositions(self, dispositionNamePattern=None):
+        return [
+            disposition
+            for disposition in self.dispositions
+            if _matches(dispositionNamePattern, disposition["name"])
+        ]
+
+    def getWebConnectors(self, namePattern=None):
+        return [connector for connector in self.web_connectors if _matches(namePattern, connector["name"])]
+
+    def getCallVariableGroups(self, namePattern=None):
+        return [group for group in self.call_variable_groups if _matches(namePattern, group["name"])]
+
+    def getCallVariables(self, namePattern=None, groupName=None):
+        return [
+            variable
+            for variable in self.call_variables
+            if _matches(namePattern, variable["name"]) and groupName in (None, variable["group"])
+        ]
+
+    def getContactFields(self, namePattern=None):
+        return [field for field in self.contact_fields if _matches(namePattern, field["name"])]
+
+    def getSpeedDialNumbers(self):
+        return self.speed_dial_numbers
+
+    # campaigns and IVR scripts
+
+    def getCampaigns(self, campaignNamePattern=None, campaignType=None):
+        with self._lock:
+            return [
+                campaign
+                for name, campaign in self.campaigns.items()
+                if _matches(campaignNamePattern, name)
+                and campaignType in (None, campaign["type"])
+            ]
+
+    def _campaign_detail(self, campaignName, campaign_type):
+        with self._lock:
+            campaign = self._get(self.campaigns, campaignName, "Campaign")
+            if campaign["type"] != campaign_type:
+                raise StandInFault(
+                    "ObjectNotFoundFault",
+                    f"{campaign_type.title()} campaign with name '{campaignName}' not found",
+                    objectName=campaignName,
+                )
+            detail = dict(campaign, autoRecord=False, recordingNameAsSid=False, useFtp=False)
+        if campaign_type == "INBOUND":
+            detail.update(defaultIvrSchedule=None, maxNumOfLines=10)
+        else:
+            detail.update(
+                dialingMode="PREDICTIVE",
+                dialingPriority=3,
+                dialingRatio=100,
+                distributionAlgorithm="LongestReadyTime",
+                maxQueueTime={"days": 0, "hours": 0, "minutes": 0, "seconds": 30},
+                useTelemarketingMaxQueTimeEq1=False,
+            )
+        return detail
+
+    def getOutboundCampaign(self, campaignName):
+        return self._campaign_detail(campaignName, "OUTBOUND")
+
+    def getInboundCampaign(self, campaignName):
+        return self._campaign_detail(campaignName, "INBOUND")
+
+    def getCampaignProfiles(self, namePattern=None):
+        with self._lock:
+            return [
+                profile
+                for name, profile in self.campaign_profiles.items()
+                if _matches(namePattern, name)
+            ]
+
+    def getCampaignProfileFilter(self, profileName):
+        with self._lock:
+            return self._get(self.campaign_profile_filters, profileName, "Campaign profile")
+
+    def getCampaignState(self, campaignName, waitUntilChange=None):
+        with self._lock:
+            return self._get(self.campaigns, campaignName, "Campaign")["state"]
+
+    def startCampaign(self, campaignName):
+        with self._lock:
+            self._get(self.campaigns, campaignName, "Campaign")["state"] = "RUNNING"
+
+    def stopCampaign(self, campaignName):
+        with self._lock:
+            self._get(self.campaigns, campaignName, "Campaign")["state"] = "NOT_RUNNING"
+
+    def getIVRScripts(self, namePattern=None):
+        with self._lock:
+            return [
+                script
+                for name, script in self.ivr_scripts.items()
+                if _matches(namePattern, name)
+            ]
+
+    # reports
+
+    def runReport(self, folderName, reportName, criteria=None):
+        identifier = str(uuid.uuid4())
+        with self._lock:
+            self.reports[identifier] = {
+                "folderName": folderName,
+                "reportName": reportName,
+                "started": time.monotonic(),
+            }
+        return identifier
+
+    def _remaining(self, jobs, identifier, duration, object_type):
+        with self._lock:
+            job = self._get(jobs, identifier, object_type)
+        return max(job["started"] + duration - time.monotonic(), 0)
+
+    def isReportRunning(self, identifier, timeout=None):
+        remaining = self._remaining(
+            self.reports, identifier, self.report_duration, "Report"
+        )
+        if remaining and timeout:
+            time.sleep(min(remaining, timeout))
+            remaining = self._remaining(
+                self.reports, identifier, self.report_duration, "Report"
+            )
+        return remaining > 0
+
+    def getReportResultCsv(self, identifier):
+        if self.isReportRunning(identifier):
+            raise StandInFault("ServerFault", f"Report {identifier} is still running")
+        report = self.reports[identifier]
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(["DATE", "CAMPAIGN", "AGENT", "CALL ID", "DISPOSITION"])
+        campaigns = list(self.campaigns) or ["Campaign"]
+        users = list(self.users) or ["agent"]
+        for row in range(self.report_rows):
+            writer.writerow(
+                [
+                    "2024/01/01",
+                    campaigns[row % len(campaigns)],
+                    users[row % len(users)],
+                    f"{report['reportName']}-{row}",
+                    "Sale" if row % 3 else "No Answer",
+                ]
+            )
+        return output.getvalue()
+
+    # lists and list imports
+
+    def createList(self, listName):
+        with self._lock:
+            self.lists.setdefault(listName, {})
+
+    def deleteList(self, listName):
+        with self._lock:
+            self._get(self.lists, listName, "List")
+            del self.lists[listName]
+
+    def getListsInfo(self, listNamePattern=None):
+        with self._lock:
+            return [
+                {"name": name, "size": len(records)}
+                for name, records in self.lists.items()
+                if _matches(listNamePattern, name)
+            ]
+
+    def _import_rows(self, listName, settings, rows):
+        """Adds rows (lists of column values) to a list, returns a listImportResult."""
+        mapping = settings.get("fieldsMapping") or []
+        key_fields = [entry["fieldName"] for entry in mapping if entry.get("key")]
+        key_fields = key_fields or [entry["fieldName"] for entry in mapping]
+        result = {
+            "keyFields": key_fields,
+            "listName": listName,
+            "callNowQueued": 0,
+            "crmRecordsInserted": 0,
+            "crmRecordsUpdated": 0,
+            "listRecordsDeleted": 0,
+            "listRecordsInserted": 0,
+            "recordDispositionsReset": 0,
+            "uploadDuplicatesCount": 0,
+            "uploadErrorsCount": 0,
+            "warningsCount": {"entry": []},
+            "success": True,
+        }
+        with self._lock:
+            records = self._get(self.lists, listName, "List")
+            for row in rows:
+                try:
+                    record = {
+                        entry["fieldName"]: row[entry["columnNumber"] - 1]
+                        for entry in mapping
+                    }
+                except IndexError:
+                    result["uploadErrorsCount"] += 1
+                    continue
+                key = tuple(record[field] for field in key_fields)
+                if key in records:
+                    result["uploadDuplicatesCount"] += 1
+                    result["crmRecordsUpdated"] += 1
+                else:
+                    result["listRecordsInserted"] += 1
+                    result["crmRecordsInserted"] += 1
+                records[key] = record
+        return result
+
+    def _start_import(self, result):
+        identifier = str(uuid.uuid4())
+        result["importIdentifier"] = identifier
+        with self._lock:
+            self.imports[identifier] = {"started": time.monotonic(), "result": result}
+        return {"identifier": identifier}
+
+    def addToList(self, listName, listUpdateSettings, importData):
+        rows = [values["item"] for values in (importData or {}).get("values") or []]
+        return self._start_import(self._import_rows(listName, listUpdateSettings, rows))
+
+    def addToListCsv(self, listName, listUpdateSettings, csvData):
+        rows = list(
+            csv.reader(
+                io.StringIO(csvData),
+                delimiter=listUpdateSettings.get("separator") or ",",
+            )
+        )
+        if listUpdateSettings.get("skipHeaderLine"):
+            rows = rows[1:]
+        return self._start_import(self._import_rows(listName, listUpdateSettings, rows))
+
+    def addRecordToList(self, listName, listUpdateSettings, record):
+        return self._import_rows(listName, listUpdateSettings, [record["fields"]])
+
+    def isImportRunning(self, identifier, waitTime=None):
+        identifier = (identifier or {}).get("identifier")
+        remaining = self._remaining(
+            self.imports, identifier, self.import_duration, "Import"
+        )
+        if remaining and waitTime:
+            time.sleep(min(remaining, waitTime))
+            remaining = self._remaining(
+                self.imports, identifier, self.import_duration, "Import"
+            )
+        return remaining > 0
+
+    def getListImportResult(self, identifier):
+        if self.isImportRunning(identifier):
+            raise StandInFault(
+                "ServerFault", f"Import {identifier['identifier']} is still running"
+            )
+        return self.imports[identifier["identifier"]]["result"]
+
+
+def fault_envelope(fault):
+    """
+    Returns the SOAP envelope (bytes) of a StandInFault, shaped like the
+    faults of the Five9 webservice.
+    """
+    envelope = etree.Element(f"{{{SOAP_ENV}}}Envelope", nsmap={"env": SOAP_ENV})
+    body = etree.SubElement(envelope, f"{{{SOAP_ENV}}}Body")
+    soap_fault = etree.SubElement(body, f"{{{SOAP_ENV}}}Fault")
+    etree.SubElement(soap_fault, "faultcode").text = "env:Server"
+    etree.SubElement(soap_fault, "faultstring").text = fault.message
+    detail = etree.SubElement(soap_fault, "detail")
+    fault_element = etree.SubElement(
+        detail, f"{{{FIVE9_NS}}}{fault.fault_name}", nsmap={"ns2": FIVE9_NS}
+    )
+    details = dict(fault.details, message=fault.message)
+    for key in sorted(details):
+        etree.SubElement(fault_element, key).text = str(details[key])
+    return etree.tostring(envelope, xml_declaration=True, encoding="utf-8")
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, status, content, content_type="text/xml; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        standin = self.server.standin
+        path, _, query = self.path.partition("?")
+        if not path.endswith("/AdminWebService") or not query.startswith("wsdl"):
+            self._respond(404, b"", "text/plain")
+            return
+        self._respond(200, standin.wsdl_for(path))
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.headers.get("Authorization", "").startswith("Basic "):
+            self._respond(401, b"", "text/plain")
+            return
+        status, content = self.server.standin.handle(body)
+        self._respond(status, content)
+
+    def log_message(self, format, *args):
+        logging.debug(f"stand-in server: {format % args}")
+
+
+class StandInServer:
+    """
+    HTTP server speaking the Five9 admin webservice for a StandInDomain.
+    Any basic auth credentials are accepted.
+
+    Args:
+        domain (StandInDomain, optional): The domain to serve. Defaults to a generated one.
+        host (str, optional): Defaults to '127.0.0.1'.
+        port (int, optional): Defaults to 0 (a free port).
+        latency (float, optional): Seconds added to every call. Defaults to 0.
+        latency_jitter (float, optional): Up to this many random seconds added on top. Defaults to 0.
+        operation_latency (dict, optional): Latency per operation name, instead of latency.
+        fault_rate (float, optional): Fraction of the calls answered with a ServerFault. Defaults to 0.
+        faults (dict, optional): Operation name -> fault message, these operations always fault.
+        rate_limits (dict, optional): Operation type -> {window seconds: limit}, enforced with
+            OperationsLimitExceededFault. Defaults to DEFAULT_RATE_LIMITS, None disables them.
+        seed (int, optional): Seed for the jitter and the random faults.
+        wsdl_cache_dir (str, optional): Directory for the parsed schema of the bundled WSDL.
+            Defaults to wsdl_cache.DEFAULT_CACHE_DIR.
+    """
+
+    def __init__(
+        self,
+        domain=None,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        latency_jitter=0.0,
+        operation_latency=None,
+        fault_rate=0.0,
+        faults=None,
+        rate_limits=DEFAULT_RATE_LIMITS,
+        seed=None,
+        wsdl_cache_dir=None,
+    ):
+        self.domain = domain or StandInDomain()
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.operation_latency = operation_latency or {}
+        self.fault_rate = fault_rate
+        self.faults = faults or {}
+        self.random = random.Random(seed)
+        self.calls = collections.Counter()
+        self.domain.call_counters = CallCounters(rate_limits)
+
+        self.document = wsdl_cache.load_wsdl_document(
+            wsdl_cache.BUNDLED_WSDL_PATH, wsdl_cache.Five9Transport(), cache_dir=wsdl_cache_dir
+        )
+        service = next(iter(self.document.services.values()))
+        self.binding = next(iter(service.ports.values())).binding
+        with open(wsdl_cache.BUNDLED_WSDL_PATH, "rb") as wsdl_file:
+            self._wsdl = wsdl_file.read()
+
+        self._httpd = http.server.ThreadingHTTPServer((host, port), _RequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self
+        self._thread = None
+
+    @property
+    def api_hostname(self):
+        """The value to pass to Five9Client as api_hostname."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def url(self):
+        return f"{self.api_hostname}/wsadmin/{wsdl_cache.BUNDLED_WSDL_VERSION}/AdminWebService"
+
+    def wsdl_for(self, path):
+        # the client posts to the address in the WSDL, so it must be this server
+        return re.sub(
+            rb'(<soap:address location=")[^"]*(")',
+            rb"\g<1>" + f"{self.api_hostname}{path}".encode("utf-8") + rb"\g<2>",
+            self._wsdl,
+        )
+
+    def start(self):
+        """Serves in a background thread, returns the server."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logging.info(f"Five9 stand-in server listening on {self.api_hostname}")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type=None, exc_value=None, traceback=None):
+        self.stop()
+
+    def serve_forever(self):
+        logging.info(f"Five9 stand-in server listening on {self.api_hostname}")
+        self._httpd.serve_forever()
+
+    def _parameters(self, operation, request):
+        # parse the wrapper element itself, deserialize() unwraps single values
+        values = operation.input.body.parse(request, self.document.types)
+        names = [name for name, _ in operation.input.body.type.elements]
+        return zeep.helpers.serialize_object(
+            {name: values[name] for name in names}, dict
+        )
+
+    def handle(self, body):
+        """
+        Answers one SOAP request.
+
+        Args:
+            body (bytes): The request envelope.
+
+        Returns:
+            tuple: The HTTP status and the response envelope.
+        """
+        try:
+            envelope = etree.fromstring(body)
+            request = envelope.find(f"{{{SOAP_ENV}}}Body")[0]
+            operation_name = etree.QName(request).localname
+            operation = self.binding.get(operation_name)
+        except (etree.XMLSyntaxError, IndexError, TypeError, ValueError) as e:
+            return 500, fault_envelope(StandInFault("ServerFault", f"Bad request: {e}"))
+
+        self.calls[operation_name] += 1
+        latency = self.operation_latency.get(operation_name, self.latency)
+        if self.latency_jitter:
+            latency += self.random.uniform(0, self.latency_jitter)
+        if latency:
+            time.sleep(latency)
+
+        try:
+            if operation_name in self.faults:
+                raise StandInFault("ServerFault", self.faults[operation_name])
+            if self.fault_rate and self.random.random() < self.fault_rate:
+                raise StandInFault("ServerFault", "Simulated server fault")
+            if operation_name not in rate_limiting.UNTHROTTLED_METHODS:
+                self.domain.call_counters.count(operation_name)
+
+            implementation = getattr(self.domain, operation_name, None)
+            if implementation is None:
+                raise StandInFault(
+                    "ServerFault", f"{operation_name} is not implemented by the stand-in server"
+                )
+            result = implementation(**self._parameters(operation, request))
+
+            output_names = [name for name, _ in operation.output.body.type.elements]
+            if output_names:
+                # 'return' for most operations, e.g. 'prompts' for getPrompts
+                response = operation.output.serialize(**{output_names[0]: result})
+            else:
+                response = operation.output.serialize()
+        except StandInFault as fault:
+            return 500, fault_envelope(fault)
+        except Exception as e:
+            # like the real service, bad arguments come back as a fault
+            logging.debug(f"stand-in server: {operation_name} failed", exc_info=True)
+            return 500, fault_envelope(
+                StandInFault("ServerFault", f"{operation_name} failed: {type(e).__name__}: {e}")
+            )
+
+        return 200, etree.tostring(
+            response.content, xml_declaration=True, encoding="utf-8"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the Five9 admin webservice"
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--campaigns", type=int, default=20)
+    parser.add_argument("--ivrscripts", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every call")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many random seconds added to every call")
+    parser.add_argument("--faultrate", type=float, default=0.0, help="fraction of calls answered with a fault")
+    parser.add_argument("--noratelimits", dest="rate_limits", action="store_false", help="don't enforce call limits")
+    args = parser.parse_args()
+
+    logging.basicConfig(level="INFO", format="%(asctime)s - %(levelname)s - %(message)s")
+    server = StandInServer(
+        domain=StandInDomain(
+            users=args.users, campaigns=args.campaigns, ivr_scripts=args.ivrscripts
+        ),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        latency_jitter=args.jitter,
+        fault_rate=args.faultrate,
+        rate_limits=DEFAULT_RATE_LIMITS if args.rate_limits else None,
+    )
+    print(f"Use api_hostname='{server.api_hostname}'")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
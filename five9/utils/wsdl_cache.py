@@ -0,0 +1,239 @@
+import copy
+import hashlib
+import io
+import logging
+import os
+import pickle
+import sys
+import tempfile
+
+import requests
+import zeep
+from lxml import etree
+from zeep.settings import Settings
+from zeep.wsdl import Document
+
+
+STATIC_RESOURCES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "static_resources"
+)
+
+BUNDLED_WSDL_PATH = os.path.join(STATIC_RESOURCES_PATH, "config_webservices_v13.wsdl")
+BUNDLED_WSDL_VERSION = "v13"
+
+# Remote schema imports that are served from static_resources instead
+LOCAL_DOCUMENTS = {
+    "https://raw.githubusercontent.com/apache/cxf/main/core/src/main/resources/schemas/wsdl/swaref.xsd": os.path.join(
+        STATIC_RESOURCES_PATH, "swaref.xsd"
+    ),
+}
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "FIVE9_WSDL_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".five9", "wsdl_cache"),
+)
+
+WSDL_SOURCES = ["remote", "bundled", "cache"]
+
+# zeep creates its xsd types at parse time, these modules are not importable
+DYNAMIC_TYPE_MODULES = ("zeep.xsd.dynamic_types", "zeep.objects")
+
+# parsed documents already loaded in this process, keyed by cache digest
+_DOCUMENT_CACHE = {}
+
+
+class Five9Transport(zeep.Transport):
+    """
+    zeep Transport that resolves the known remote schema imports of the Five9
+    WSDL to the copies in static_resources so a WSDL can be parsed offline.
+    """
+
+    def load(self, url):
+        return super().load(LOCAL_DOCUMENTS.get(url, url))
+
+
+class _ParsedSchemaPickler(pickle.Pickler):
+    """
+    Pickler for a parsed zeep Document.  zeep builds its xsd and value classes
+    dynamically and keeps lxml QNames/elements and a thread local in the
+    settings, none of which pickle on their own.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type):
+            if obj.__module__ in DYNAMIC_TYPE_MODULES:
+                attributes = {
+                    key: value
+                    for key, value in vars(obj).items()
+                    if key in ("__module__", "_xsd_name", "_xsd_type")
+                }
+                return (_rebuild_type, (obj.__name__, obj.__bases__, attributes))
+            return NotImplemented
+
+        if isinstance(obj, etree.QName):
+            return (etree.QName, (obj.text,))
+
+        if isinstance(obj, etree._Element):
+            return (etree.fromstring, (etree.tostring(obj),))
+
+        if isinstance(obj, Settings):
+            state = {key: value for key, value in vars(obj).items() if key != "_tls"}
+            return (_rebuild_settings, (state,))
+
+        # the transport is re-attached by the caller when the document is loaded
+        if isinstance(obj, (zeep.Transport, requests.Session)):
+            return (type(None), ())
+
+        return NotImplemented
+
+
+def _rebuild_type(name, bases, attributes):
+    return type(name, bases, attributes)
+
+
+def _rebuild_settings(state):
+    settings = Settings()
+    for key, value in state.items():
+        setattr(settings, key, value)
+    return settings
+
+
+def cached_wsdl_path(api_hostname, sessiontype, api_version, cache_dir=None):
+    """
+    Returns the on-disk location of the cached copy of a remote WSDL.
+
+    Args:
+        api_hostname (str): The Five9 API hostname the WSDL was obtained from.
+        sessiontype (str): The webservice path of the session, e.g. 'wsadmin'.
+        api_version (str): The API version of the WSDL, e.g. 'v13'.
+        cache_dir (str, optional): Root cache directory. Defaults to DEFAULT_CACHE_DIR.
+
+    Returns:
+        str: The path of the cached WSDL file.
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    # a port in the hostname isn't a valid directory name everywhere
+    return os.path.join(
+        cache_dir, "wsdl", api_hostname.replace(":", "_"), sessiontype, f"{api_version}.wsdl"
+    )
+
+
+def _write_atomic(target_path, content):
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(target_path))
+    try:
+        with os.fdopen(file_descriptor, "wb") as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, target_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def fetch_wsdl(url, session, target_path):
+    """
+    Downloads a WSDL and stores it at target_path.  The file is replaced
+    atomically so concurrent processes never read a partial WSDL.
+
+    Args:
+        url (str): The WSDL url.
+        session (requests.Session): Session used for the download (carries the auth).
+        target_path (str): Where to store the WSDL.
+
+    Returns:
+        str: The target_path.
+    """
+    logging.info(f"Downloading WSDL to cache: {target_path}")
+    response = session.get(url)
+    response.raise_for_status()
+    _write_atomic(target_path, response.content)
+    return target_path
+
+
+def load_wsdl_document(wsdl_path, transport, settings=None, cache_dir=None):
+    """
+    Returns a parsed zeep Document for a local WSDL file.  The parsed schema
+    is pickled under cache_dir, keyed by the WSDL content and the zeep and
+    python versions, so later processes skip parsing the WSDL entirely.
+
+    Only load parsed schema caches from a directory you control; the cache
+    is a pickle.
+
+    Every call returns its own copy of the document's services and ports,
+    sharing the parsed types and bindings, so each client can point its
+    ports at its own address with set_service_address.
+
+    Args:
+        wsdl_path (str): Path of the WSDL file.
+        transport (zeep.Transport): Transport to attach to the document.
+        settings (zeep.Settings, optional): Settings for a freshly parsed document.
+        cache_dir (str, optional): Root cache directory. Defaults to DEFAULT_CACHE_DIR.
+
+    Returns:
+        zeep.wsdl.Document: The parsed WSDL document.
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+
+    with open(wsdl_path, "rb") as wsdl_file:
+        digest = hashlib.sha256(wsdl_file.read())
+    digest.update(f"zeep-{zeep.__version__}-py{sys.version_info[:2]}".encode("utf-8"))
+    digest = digest.hexdigest()
+
+    document = _DOCUMENT_CACHE.get(digest)
+    if document is not None:
+        return _client_document(document, transport)
+
+    pickle_path = os.path.join(cache_dir, "parsed", f"{digest}.pickle")
+
+    if os.path.exists(pickle_path):
+        try:
+            with open(pickle_path, "rb") as pickle_file:
+                document = pickle.load(pickle_file)
+            logging.debug(f"Loaded parsed WSDL from {pickle_path}")
+        except Exception as e:
+            logging.warning(f"Discarding unreadable parsed WSDL cache {pickle_path}: {e}")
+            document = None
+
+    if document is None:
+        document = Document(wsdl_path, transport, settings=settings or Settings())
+        try:
+            buffer = io.BytesIO()
+            _ParsedSchemaPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(document)
+            _write_atomic(pickle_path, buffer.getvalue())
+            logging.debug(f"Stored parsed WSDL in {pickle_path}")
+        except (OSError, pickle.PicklingError, TypeError, RecursionError) as e:
+            logging.warning(f"Unable to cache parsed WSDL: {e}")
+
+    _DOCUMENT_CACHE[digest] = document
+    return _client_document(document, transport)
+
+
+def _client_document(document, transport):
+    # the services and ports hold the address, everything else is shared
+    client_document = copy.copy(document)
+    client_document.transport = transport
+    client_document.services = type(document.services)()
+    for service_name, service in document.services.items():
+        client_service = copy.copy(service)
+        client_service.ports = type(service.ports)()
+        for port_name, port in service.ports.items():
+            client_port = copy.copy(port)
+            client_port.binding_options = dict(port.binding_options)
+            client_service.ports[port_name] = client_port
+        client_document.services[service_name] = client_service
+    return client_document
+
+
+def set_service_address(document, address):
+    """
+    Points every port of the document's services at address.  Used when the
+    WSDL was not loaded from the host the client is meant to talk to.
+
+    Args:
+        document (zeep.wsdl.Document): The parsed WSDL document.
+        address (str): The SOAP endpoint url.
+    """
+    for service in document.services.values():
+        for port in service.ports.values():
+            port.binding_options["address"] = address
@@ -36,6 +36,7 @@ setup(
     name='five9',
     version='1.1.0',
     packages=find_packages(),
+    package_data={"five9.static_resources": ["*.wsdl", "*.xsd"]},
     description='A Five9 Configuration Webserivce API wrapper',
     long_description=open('README.md').read(),
     install_requires=requirements,